@@ -0,0 +1,185 @@
+"""
+Benchmark of the Airline hot paths on synthetic workloads.
+
+For each number of packages, a fresh airline is filled with synthetic clients, packages and a dense fee schedule, and
+add_client, add_package, add_transportation_fee, get_transportation_fee, get_total_transportation_report and
+get_transportation_report_range (over 30-day intervals) are timed. Each workload is then rebuilt under tracemalloc to
+record its peak memory. The results can be written as JSON and compared with a previous run to catch scaling
+regressions. With --metrics, the airlines are instrumented with AirlineMetrics, which shows the overhead of the
+instrumentation and the median and 99th percentile latency of each operation.
+
+Usage:
+    python -m benchmarks.bench_airline [--packages 10000 100000 1000000] [--clients 100000] [--fees 10000]
+        [--backend memory sqlite] [--metrics] [--output results.json] [--baseline previous.json --tolerance 0.25]
+"""
+import argparse
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from itertools import starmap
+
+from benchmarks.workloads import generate_records, generate_fees, generate_dates
+from classes import Airline, AirlineMetrics, SQLiteAirline
+
+BACKENDS = {
+    "memory": lambda: Airline("Benchmark Airline"),
+    "sqlite": lambda: SQLiteAirline("Benchmark Airline"),
+}
+
+
+def run_workload(backend, records, fees, queries, ranges, metrics=None):
+    """
+    Run the workload on a new airline and time each operation.
+
+    Parameters:
+        backend (str): The name of the backend.
+        records (list): The (origin, destination, client name, date) package records.
+        fees (list): The (date, fee) pairs of the fee schedule.
+        queries (list): The dates to look fees and reports up for.
+        ranges (list): The (start, end) date intervals to get range reports for.
+        metrics (AirlineMetrics): Optional metrics to instrument the airline with.
+
+    Returns:
+        dict: A dictionary mapping each operation to its (calls, seconds) pair.
+    """
+    airline = BACKENDS[backend]()
+    if metrics is not None:
+        metrics.instrument(airline)
+    timings = {}
+
+    def timed(operation, function, arguments):
+        # Call the function with each tuple of arguments, dropping the results so they don't add to the peak memory
+        started = time.perf_counter()
+        deque(starmap(function, arguments), maxlen=0)
+        timings[operation] = (len(arguments), time.perf_counter() - started)
+
+    client_names = [(name,) for name in dict.fromkeys(record[2] for record in records)]
+    timed("add_client", airline.add_client, client_names)
+    clients = {name: airline.get_client(name) for name, in client_names}
+    timed("add_package", airline.add_package, [(origin, destination, clients[name], date)
+                                               for origin, destination, name, date in records])
+    timed("add_transportation_fee", airline.add_transportation_fee, fees)
+    timed("get_transportation_fee", airline.get_transportation_fee, [(date,) for date in queries])
+    timed("get_total_transportation_report", airline.get_total_transportation_report, [(date,) for date in queries])
+    timed("get_transportation_report_range", airline.get_transportation_report_range, ranges)
+    if hasattr(airline, "close"):
+        airline.close()
+    return timings
+
+
+def measure_peak_memory(backend, records, fees, queries, ranges):
+    """
+    Run the workload under tracemalloc and return its peak memory.
+
+    Parameters:
+        backend (str): The name of the backend.
+        records (list): The (origin, destination, client name, date) package records.
+        fees (list): The (date, fee) pairs of the fee schedule.
+        queries (list): The dates to look fees and reports up for.
+        ranges (list): The (start, end) date intervals to get range reports for.
+
+    Returns:
+        int: The peak number of bytes allocated while running the workload.
+    """
+    gc.collect()
+    tracemalloc.start()
+    run_workload(backend, records, fees, queries, ranges)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def compare(results, baseline, tolerance):
+    """
+    Compare the results with a previous run.
+
+    Parameters:
+        results (list): The results of this run.
+        baseline (list): The results of the previous run.
+        tolerance (float): The fraction of throughput that may be lost before an operation counts as a regression.
+
+    Returns:
+        list: The descriptions of the regressions.
+    """
+    previous = {(result["backend"], result["packages"], result["operation"]): result for result in baseline}
+    regressions = []
+    for result in results:
+        key = (result["backend"], result["packages"], result["operation"])
+        if key not in previous:
+            continue
+        if result["ops_per_second"] < previous[key]["ops_per_second"] * (1 - tolerance):
+            regressions.append(f"{key}: {previous[key]['ops_per_second']:.0f} -> {result['ops_per_second']:.0f} ops/s")
+    return regressions
+
+
+def main():
+    """
+    Run the benchmark and print, write and compare its results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packages", type=int, nargs="+", default=[10_000, 100_000], help="numbers of packages")
+    parser.add_argument("--clients", type=int, default=100_000, help="number of distinct clients")
+    parser.add_argument("--dates", type=int, default=3000, help="number of distinct package dates")
+    parser.add_argument("--fees", type=int, default=10_000, help="number of fee changes")
+    parser.add_argument("--queries", type=int, default=1000, help="number of fee and report lookups")
+    parser.add_argument("--backend", nargs="+", choices=sorted(BACKENDS), default=["memory"], help="backends")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    parser.add_argument("--metrics", action="store_true", help="instrument the airlines with AirlineMetrics")
+    parser.add_argument("--output", help="path of the JSON file to write the results to")
+    parser.add_argument("--baseline", help="path of a previous JSON results file to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed throughput loss against the baseline")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    fees = generate_fees(args.fees)
+    dates = generate_dates(args.dates + 30)
+    queries = [rng.choice(dates[:args.dates]) for _ in range(args.queries)]
+    # Range reports cover 30 days, as for monthly billing
+    starts = [rng.randrange(args.dates) for _ in range(args.queries)]
+    ranges = [(dates[start], dates[start + 29]) for start in starts]
+    results = []
+    for packages in args.packages:
+        records = generate_records(packages, dates=args.dates, clients=args.clients)
+        for backend in args.backend:
+            metrics = AirlineMetrics() if args.metrics else None
+            timings = run_workload(backend, records, fees, queries, ranges, metrics)
+            peak = None if args.no_memory else measure_peak_memory(backend, records, fees, queries, ranges)
+            for operation, (calls, seconds) in timings.items():
+                result = {
+                    "backend": backend,
+                    "packages": packages,
+                    "operation": operation,
+                    "calls": calls,
+                    "seconds": seconds,
+                    "ops_per_second": calls / seconds if seconds else float("inf"),
+                    "peak_memory_bytes": peak,
+                }
+                results.append(result)
+                print(f"{backend:>6} {packages:>10} {operation:<34} {calls:>10} calls {seconds:>9.3f}s "
+                      f"{result['ops_per_second']:>12.0f} ops/s")
+            if peak is not None:
+                print(f"{backend:>6} {packages:>10} peak memory: {peak / 2 ** 20:.1f} MiB")
+            if metrics is not None:
+                for operation, stats in metrics.to_dict().items():
+                    print(f"{backend:>6} {packages:>10} {operation:<34} p50 {stats['p50_seconds'] * 1e6:>9.1f}us "
+                          f"p99 {stats['p99_seconds'] * 1e6:>9.1f}us")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "results": results}, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark of bulk transportation fee lookups.
+
+Re-prices synthetic package dates against a dense fee schedule, comparing one get_transportation_fee call per package,
+timed on a sample and extrapolated, with the bulk FeeSchedule.get_fees_by_ordinal lookup over the date ordinals and
+Airline.get_transportation_fees over the DD/MM/YYYY dates.
+
+Usage:
+    python -m benchmarks.bench_fee_lookup [--packages 10000000] [--fees 10000] [--sample 100000]
+"""
+import argparse
+import random
+import time
+from array import array
+from datetime import date, timedelta
+
+from benchmarks.workloads import generate_fees
+from classes import Airline
+from utils import get_numpy, ordinal_to_date
+
+
+def main():
+    """
+    Run the benchmark and print the time of each way of re-pricing the packages.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packages", type=int, default=10_000_000, help="number of package dates to re-price")
+    parser.add_argument("--fees", type=int, default=10_000, help="number of fee changes")
+    parser.add_argument("--sample", type=int, default=100_000, help="number of single lookups to time")
+    args = parser.parse_args()
+
+    airline = Airline("Benchmark Airline")
+    for fee_date, fee in generate_fees(args.fees):
+        airline.add_transportation_fee(fee_date, fee)
+    end = date.today() - timedelta(days=1)
+    start = end - timedelta(days=args.fees * 2)
+    rng = random.Random(0)
+    days = array("i", (rng.randint(start.toordinal(), end.toordinal()) for _ in range(args.packages)))
+    dates = [ordinal_to_date(day) for day in days]
+    print(f"NumPy: {'yes' if get_numpy() is not None else 'no'}")
+
+    started = time.perf_counter()
+    for fee_date in dates[:args.sample]:
+        airline.get_transportation_fee(fee_date)
+    seconds = (time.perf_counter() - started) * args.packages / min(args.sample, args.packages)
+    print(f"{'get_transportation_fee (extrapolated)':<40} {seconds:>8.3f}s")
+
+    started = time.perf_counter()
+    airline.transportation_fee.get_fees_by_ordinal(days)
+    print(f"{'FeeSchedule.get_fees_by_ordinal':<40} {time.perf_counter() - started:>8.3f}s")
+
+    started = time.perf_counter()
+    airline.get_transportation_fees(dates)
+    print(f"{'Airline.get_transportation_fees':<40} {time.perf_counter() - started:>8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Memory benchmark of the Client and Package classes.
+
+Compares the bytes used per package by dict-backed classes holding their own copy of every string, as the classes
+were before they had __slots__ and interned strings, with the current Client and Package classes.
+
+Usage:
+    python -m benchmarks.bench_memory [--packages 1000000]
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.workloads import generate_records
+from classes import Client, Package
+
+
+class LegacyClient:
+    """
+    A dict-backed client, as Client was before it had __slots__.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+
+class LegacyPackage:
+    """
+    A dict-backed package holding its own copy of every string, as Package was before it had __slots__.
+    """
+
+    def __init__(self, origin, destination, client, date):
+        self.origin = origin
+        self.destination = destination
+        self.client = client
+        self.date = date
+
+
+def measure(records, client_cls, package_cls):
+    """
+    Measure the memory used by the packages built from the records.
+
+    Parameters:
+        records (list): The package records.
+        client_cls (type): The client class.
+        package_cls (type): The package class.
+
+    Returns:
+        int: The number of bytes allocated for the packages, their clients and their strings.
+    """
+    gc.collect()
+    tracemalloc.start()
+    clients = {}
+    packages = []
+    # Copy the strings so every package starts with its own objects, as if they came straight from a parser
+    for origin, destination, client_name, package_date in records:
+        client = clients.get(client_name)
+        if client is None:
+            client = clients[client_name] = client_cls(client_name)
+        packages.append(package_cls("".join(origin), "".join(destination), client, "".join(package_date)))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del packages, clients
+    return size
+
+
+def main():
+    """
+    Run the memory benchmark and print the bytes used per package before and after.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packages", type=int, default=1_000_000, help="number of packages to build")
+    args = parser.parse_args()
+
+    records = generate_records(args.packages)
+    before = measure(records, LegacyClient, LegacyPackage)
+    after = measure(records, Client, Package)
+    print(f"packages: {args.packages}")
+    print(f"before (dict-backed, per-package strings): {before / args.packages:.1f} bytes/package")
+    print(f"after (__slots__, interned strings): {after / args.packages:.1f} bytes/package")
+    print(f"saved: {100 * (1 - after / before):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
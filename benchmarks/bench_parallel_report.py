@@ -0,0 +1,56 @@
+"""
+Scaling benchmark of the ParallelReportEngine.
+
+Computes the report of every day of several years over synthetic package dates with an increasing number of worker
+processes and prints the speedup over a single process. The first report of each engine also starts its worker
+processes, so it is timed apart from the following ones, which reuse them.
+
+Usage:
+    python -m benchmarks.bench_parallel_report [--packages 10000000] [--years 5] [--workers 1 2 4 8]
+"""
+import argparse
+import random
+import time
+from array import array
+from datetime import date, timedelta
+
+from benchmarks.workloads import generate_fees
+from classes import FeeSchedule, ParallelReportEngine
+from utils import DATE_FORMAT, DATE_MIN
+
+
+def main():
+    """
+    Run the scaling benchmark and print the time and speedup of each number of workers.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packages", type=int, default=10_000_000, help="number of packages")
+    parser.add_argument("--years", type=int, default=5, help="number of years to report on")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8], help="numbers of worker processes")
+    args = parser.parse_args()
+
+    end = date.today()
+    start = end - timedelta(days=365 * args.years)
+    rng = random.Random(0)
+    days = array("i", (rng.randint(start.toordinal(), end.toordinal()) for _ in range(args.packages)))
+    schedule = FeeSchedule({DATE_MIN: 10})
+    for fee_date, fee in generate_fees(365):
+        schedule[fee_date] = fee
+
+    baseline = None
+    for workers in args.workers:
+        with ParallelReportEngine(days, schedule, workers=workers, min_partition_size=1) as engine:
+            timings = []
+            for _ in range(3):
+                started = time.perf_counter()
+                report = engine.get_transportation_report_range(start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT))
+                timings.append(time.perf_counter() - started)
+        # Compare the reports that reuse the worker processes
+        seconds = min(timings[1:])
+        baseline = baseline or seconds
+        print(f"workers: {workers:>3}  first: {timings[0]:>8.3f}s  next: {seconds:>8.3f}s  "
+              f"speedup: {baseline / seconds:>5.2f}x  packages: {report['packages']}  revenue: {report['revenue']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark of the binary airline snapshot against the JSON fixtures format.
+
+Writes the same synthetic packages as a fixtures-style JSON file and as an AirlineSnapshot, then compares their sizes
+and the time to load them: the JSON file as populate_system used to (json.load, then add_client and add_package for
+each package), the JSON file with the streaming Airline.load_packages, and the snapshot, both just opened with mmap and
+fully loaded into an Airline.
+
+Usage:
+    python -m benchmarks.bench_snapshot [--packages 1000000]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.workloads import generate_records
+from classes import Airline, AirlineSnapshot
+
+
+def timed(label, function):
+    """
+    Time a function and print the elapsed seconds.
+
+    Parameters:
+        label (str): The label to print.
+        function (callable): The function to time.
+
+    Returns:
+        object: The result of the function.
+    """
+    started = time.perf_counter()
+    result = function()
+    print(f"{label:<40} {time.perf_counter() - started:>9.3f}s")
+    return result
+
+
+def populate_from_json(path):
+    """
+    Load a fixtures-style JSON file the way populate_system used to, all at once.
+
+    Parameters:
+        path (str): The path of the JSON file.
+
+    Returns:
+        Airline: The populated airline.
+    """
+    airline = Airline("Benchmark Airline")
+    with open(path, "r", encoding="utf-8") as f:
+        packages_data = json.load(f)[0]["demo_packages"]
+    for package_data in packages_data:
+        client = airline.add_client(package_data["client_str"])
+        airline.add_package(package_data["origin"], package_data["destination"], client, package_data.get("date"))
+    return airline
+
+
+def main():
+    """
+    Run the snapshot benchmark and print the file sizes and load times.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--packages", type=int, default=1_000_000, help="number of packages")
+    args = parser.parse_args()
+
+    records = generate_records(args.packages)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "packages.json")
+        snapshot_path = os.path.join(directory, "airline.snapshot")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump([{"demo_packages": [{"origin": origin, "destination": destination, "client_str": client,
+                                           "date": date} for origin, destination, client, date in records]}], f)
+        airline = populate_from_json(json_path)
+        AirlineSnapshot.write(airline, snapshot_path)
+        del airline
+        print(f"packages: {args.packages}")
+        print(f"JSON size: {os.path.getsize(json_path) / 2 ** 20:.1f} MiB, "
+              f"snapshot size: {os.path.getsize(snapshot_path) / 2 ** 20:.1f} MiB")
+
+        timed("JSON json.load + add_package", lambda: populate_from_json(json_path))
+        timed("JSON streaming load_packages", lambda: Airline("Benchmark Airline").load_packages(
+            json_path, key="demo_packages"))
+        snapshot = timed("snapshot open (mmap)", lambda: AirlineSnapshot(snapshot_path))
+        timed("snapshot daily counts from mmap", snapshot.get_daily_counts)
+        timed("snapshot to_package_store", snapshot.to_package_store)
+        timed("snapshot to_airline", snapshot.to_airline)
+        snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
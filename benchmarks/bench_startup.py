@@ -0,0 +1,66 @@
+"""
+Benchmark of the import time of the command line and the classes and utils packages.
+
+Imports each module in a fresh interpreter run with -X importtime, several times, and prints the median cumulative
+import time of the module and the slowest imports it pulls in. Exits with an error when the median import time of a
+module is over the budget, so a change that makes the short-lived batch invocations start slower is caught.
+
+Usage:
+    python -m benchmarks.bench_startup [--modules main classes utils] [--runs 5] [--budget-ms 75] [--top 10]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def import_times(module):
+    """
+    Import a module in a fresh interpreter and get the import time of every module it imports.
+
+    Parameters:
+        module (str): The name of the module to import.
+
+    Returns:
+        list: The (module, self microseconds, cumulative microseconds) tuples of every imported module, in the order
+            their imports finished.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True,
+                            text=True, check=True)
+    times = []
+    # Lines look like "import time:       self [us] |  cumulative | imported package", after a header line
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_time, cumulative, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(self_time), int(cumulative)))
+    return times
+
+
+def main():
+    """
+    Run the benchmark, print the import time of each module, and exit with an error if one is over the budget.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="*", default=["main", "classes", "utils"], help="modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters per module")
+    parser.add_argument("--budget-ms", type=float, default=75.0, help="maximum median import time of a module")
+    parser.add_argument("--top", type=int, default=10, help="number of slowest imports to print per module")
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.runs)]
+        # The module itself is the last import to finish
+        milliseconds = statistics.median(times[-1][2] for times in runs) / 1000
+        print(f"{module:<40} {milliseconds:>8.1f}ms")
+        for name, self_time, _ in sorted(runs[-1], key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"    {name:<36} {self_time / 1000:>8.1f}ms self")
+        if milliseconds > args.budget_ms:
+            over_budget.append(module)
+    if over_budget:
+        sys.exit(f"Over the {args.budget_ms:.0f}ms import budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
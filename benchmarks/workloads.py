@@ -0,0 +1,63 @@
+"""
+Synthetic workloads shared by the benchmarks.
+"""
+import random
+from datetime import date, timedelta
+
+from utils import DATE_FORMAT
+
+
+def generate_dates(dates, first_date=date(2015, 1, 1)):
+    """
+    Generate consecutive dates.
+
+    Parameters:
+        dates (int): The number of dates.
+        first_date (date): The first date.
+
+    Returns:
+        list: The DD/MM/YYYY dates.
+    """
+    return [(first_date + timedelta(days=day)).strftime(DATE_FORMAT) for day in range(dates)]
+
+
+def generate_records(packages, cities=300, dates=3000, clients=5000, seed=0):
+    """
+    Generate package records whose strings are new objects for every record, as when they are parsed from a file.
+
+    Parameters:
+        packages (int): The number of records.
+        cities (int): The number of distinct cities.
+        dates (int): The number of distinct dates.
+        clients (int): The number of distinct clients.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        list: The (origin, destination, client name, date) records.
+    """
+    rng = random.Random(seed)
+    date_strings = generate_dates(dates)
+    records = []
+    for _ in range(packages):
+        origin, destination = rng.sample(range(cities), 2)
+        records.append((f"City {origin:04d}", f"City {destination:04d}", f"Client {rng.randrange(clients):06d}",
+                        "".join(rng.choice(date_strings))))
+    return records
+
+
+def generate_fees(fees, seed=0):
+    """
+    Generate a dense fee schedule, with a fee change on each of the latest days up to yesterday.
+
+    Parameters:
+        fees (int): The number of fee changes.
+        seed (int): The seed of the random generator.
+
+    Returns:
+        list: The (date, fee) pairs, in random order.
+    """
+    rng = random.Random(seed)
+    last_date = date.today() - timedelta(days=1)
+    fee_dates = [(last_date - timedelta(days=day)).strftime(DATE_FORMAT) for day in range(fees)]
+    rng.shuffle(fee_dates)
+    return [(fee_date, rng.randrange(1, 100)) for fee_date in fee_dates]
@@ -1,3 +1,49 @@
-from .airline import Airline
-from .client import Client
-from .package import Package
+import importlib
+
+# The classes exported by the package, mapped to the submodule defining them. Submodules are imported on first
+# access (PEP 562), so importing Airline doesn't also import sqlite3, mmap, multiprocessing or cProfile.
+_EXPORTS = {
+    "Airline": "airline",
+    "Client": "client",
+    "Package": "package",
+    "FeeSchedule": "fee_schedule",
+    "FeeScheduleView": "fee_schedule",
+    "PackageStore": "package_store",
+    "PersistentAirline": "persistent_airline",
+    "SQLiteAirline": "sqlite_airline",
+    "ConcurrentAirline": "concurrent_airline",
+    "ParallelReportEngine": "parallel_report",
+    "AirlineSnapshot": "airline_snapshot",
+    "AirlineMetrics": "metrics",
+    "PartitionedAirline": "partitioned_airline",
+    "HyperLogLog": "sketches",
+    "SpaceSaving": "sketches",
+    "PackageSketches": "sketches",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """
+    The method to import the submodule defining an exported class the first time the class is accessed.
+
+    Parameters:
+        name (str): The name of the attribute.
+
+    Returns:
+        type: The exported class, which is cached in the package globals.
+
+    Raises:
+        AttributeError: If the package doesn't export the name.
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
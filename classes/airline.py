@@ -1,7 +1,15 @@
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
 from classes.client import Client
+from classes.fee_schedule import FeeSchedule, FeeScheduleView
 from classes.package import Package
 from utils import date_min_validation, date_format_validation, date_range_validation, DATE_MIN, \
-    AIRLINE_NAME_VALIDATION_MSG, int_fee_validation, CLIENT_NOT_EXIST_VALIDATION_MSG
+    AIRLINE_NAME_VALIDATION_MSG, int_fee_validation, CLIENT_NOT_EXIST_VALIDATION_MSG, date_interval_range_validation, \
+    date_to_ordinal, ordinal_to_date, iter_json_records, TRANSPORTATION_REPORT_FORMAT, \
+    DATE_MIN_ORDINAL, REPORT_CACHE_SIZE, \
+    SKETCHES_DISABLED_VALIDATION_MSG, JSON_RECORD_VALIDATION_MSG
 
 
 class Airline:
@@ -11,16 +19,30 @@ class Airline:
     Attributes:
         name (str): The name of the airline.
         clients (list): A list of clients of the airline.
+        clients_by_name (dict): A dictionary mapping client names to the clients of the airline.
         packages (list): A list of packages handled by the airline.
-        transportation_fee (dict): A dictionary mapping dates to transportation fees.
+        packages_by_date (dict): A dictionary mapping date ordinals to the packages handled on that date.
+        package_count_by_date (dict): A dictionary mapping date ordinals to the number of packages handled on that
+            date.
+        package_count_by_client (dict): A dictionary mapping client names to the number of packages of that client on
+            each date ordinal.
+        package_count_by_route (dict): A dictionary mapping (origin, destination) pairs to the number of packages on
+            that route on each date ordinal.
+        transportation_fee (FeeScheduleView): A read-only view of the schedule mapping dates to transportation fees.
+        report_cache_size (int): The maximum number of daily reports kept in the report cache.
+        sketches (PackageSketches): The approximate distinct client and busiest route sketches updated with each
+            package, or None if they are not enabled.
     """
 
-    def __init__(self, name):
+    def __init__(self, name, report_cache_size=REPORT_CACHE_SIZE, sketches=None):
         """
         The constructor for the Airline class.
 
         Parameters:
             name (str): The name of the airline.
+            report_cache_size (int): The maximum number of daily reports kept in the report cache; 0 disables it.
+            sketches (PackageSketches): The sketches to update with each package, which enable the approximate
+                distinct client and busiest route reports; None disables them.
         """
         # Validate that the airline name is at least 3 characters long
         if len(name) < 3:
@@ -29,10 +51,37 @@ class Airline:
         # Initialize empty lists for the clients and packages
         self.clients = []
         self.packages = []
-        # Initialize the transportation fee dictionary with a default fee
-        self.transportation_fee = {
+        # Initialize the client registry so that clients are looked up by name without scanning the list
+        self.clients_by_name = {}
+        # Initialize the per-date indexes so that daily reports don't need to scan every package
+        self.packages_by_date = {}
+        self.package_count_by_date = {}
+        # Initialize the per-client and per-route indexes, which count packages per date
+        self.package_count_by_client = {}
+        self.package_count_by_route = {}
+        # Initialize the transportation fee schedule with a default fee, which only add_transportation_fee changes
+        self._transportation_fee = FeeSchedule({
             DATE_MIN: 10,
-        }
+        })
+        # The prefix-sum index for range reports is built lazily and dropped whenever packages or fees change
+        self._report_index = None
+        # Daily reports are cached by date ordinal, least recently used first, until a package or fee change affects
+        # them
+        self.report_cache_size = report_cache_size
+        self._report_cache = OrderedDict()
+        # The optional sketches answer distinct client and busiest route questions in bounded memory
+        self.sketches = sketches
+
+    @property
+    def transportation_fee(self):
+        """
+        The method to get a read-only view of the transportation fee schedule, so fees are only added through
+        add_transportation_fee, which keeps the cached reports up to date.
+
+        Returns:
+            FeeScheduleView: The view of the schedule.
+        """
+        return FeeScheduleView(self._transportation_fee)
 
     def __str__(self):
         """
@@ -67,13 +116,12 @@ class Airline:
         Raises:
             ValueError: If no client with the given name exists.
         """
-        # Iterate over the clients
-        for client in self.clients:
-            # If the client's name matches the given name, return the client
-            if client.name == name:
-                return client
+        # Look up the client in the registry
+        client = self.clients_by_name.get(name)
         # If no client with the given name was found, raise a ValueError
-        raise ValueError(CLIENT_NOT_EXIST_VALIDATION_MSG)
+        if client is None:
+            raise ValueError(CLIENT_NOT_EXIST_VALIDATION_MSG)
+        return client
 
     def add_client(self, name):
         """
@@ -86,15 +134,31 @@ class Airline:
             Client: The added client.
         """
         # Try to get the client with the given name
-        try:
-            client = self.get_client(name)
-        # If no client with the given name exists, create a new client and add it to the clients list
-        except ValueError as e:
-            client = Client(name)
-            self.clients.append(client)
+        client = self.clients_by_name.get(name)
+        # If no client with the given name exists, create a new client and add it to the registry and the clients list
+        if client is None:
+            client = self._register_client(Client(name))
         # Return the client
         return client
 
+    def _register_client(self, client):
+        """
+        The method to store an already validated client in the registry and the clients list, unless a client with
+        the same name is already stored.
+
+        Parameters:
+            client (Client): The client to store.
+
+        Returns:
+            Client: The stored client with the name of the given client.
+        """
+        registered = self.clients_by_name.get(client.name)
+        if registered is not None:
+            return registered
+        self.clients_by_name[client.name] = client
+        self.clients.append(client)
+        return client
+
     def add_package(self, origin, destination, client, date):
         """
         The method to add a package.
@@ -110,10 +174,167 @@ class Airline:
         """
         # Create a new package and add it to the packages list
         package = Package(origin, destination, client, date)
-        self.packages.append(package)
+        self._index_package(package)
         # Return the package
         return package
 
+    def add_packages(self, rows):
+        """
+        The method to add a batch of packages.
+
+        The whole batch is validated first, and only the valid packages are added; every invalid row is reported
+        instead of stopping at the first one.
+
+        Parameters:
+            rows (iterable): The (origin, destination, client, date) rows of the packages, where the client is a Client
+                or the name of an existing client and the date is a DD/MM/YYYY string, an ordinal, or None for today.
+
+        Returns:
+            dict: The added packages and the list of (row number, error message) pairs of the rows that failed
+                validation, numbered from 1.
+        """
+        errors = []
+        packages = Package.from_rows(rows, self.clients_by_name, errors)
+        for package in packages:
+            self._index_package(package)
+        return {
+            "packages": packages,
+            "errors": errors,
+        }
+
+    def _index_package(self, package):
+        """
+        The method to store an already validated package in the packages list and the per-date indexes.
+
+        Parameters:
+            package (Package): The package to store.
+        """
+        self.packages.append(package)
+        # Add the package to its date bucket, then count it
+        day = package.day
+        self.packages_by_date.setdefault(day, []).append(package)
+        self._count_package(package)
+        self._report_index = None
+        self._report_cache.pop(day, None)
+
+    def _count_package(self, package):
+        """
+        The method to count a package in the per-date, per-client and per-route counters and the sketches.
+
+        Parameters:
+            package (Package): The package to count.
+        """
+        # Increment the date counter, then the date counters of the package client and route
+        day = package.day
+        self.package_count_by_date[day] = self.package_count_by_date.get(day, 0) + 1
+        counts = self.package_count_by_client.setdefault(package.client.name, {})
+        counts[day] = counts.get(day, 0) + 1
+        counts = self.package_count_by_route.setdefault((package.origin, package.destination), {})
+        counts[day] = counts.get(day, 0) + 1
+        if self.sketches is not None:
+            self.sketches.add(package)
+
+    def load_packages(self, path, key=None, batch_size=10000):
+        """
+        The method to bulk load packages from a JSON array or newline-delimited JSON file.
+
+        The file is streamed, so memory use stays flat whatever its size. Each record must have the "origin",
+        "destination" and "client_str" fields, and may have a "date" field. Records are validated a batch at a time and
+        the valid ones of each batch are then stored; invalid records, including the lines of a newline-delimited file
+        that aren't valid JSON, are reported instead of stopping the load.
+
+        Parameters:
+            path (str): The path of the file to load.
+            key (str): An optional key under which the records are nested, as in the fixtures file.
+            batch_size (int): The number of records to validate and store at a time.
+
+        Returns:
+            dict: The load statistics, with the number of packages loaded, the list of (record number, error message)
+                pairs for the records that failed validation, the elapsed seconds and the packages loaded per second.
+        """
+        started = time.perf_counter()
+        loaded = 0
+        errors = []
+        batch = []
+        # Stream the records and load them in batches
+        with open(path, "r", encoding="utf-8") as f:
+            for record in iter_json_records(f, key):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    loaded += self._load_package_batch(batch, loaded + len(errors), errors)
+                    batch = []
+        if batch:
+            loaded += self._load_package_batch(batch, loaded + len(errors), errors)
+        # Return the load statistics
+        seconds = time.perf_counter() - started
+        return {
+            "packages": loaded,
+            "errors": errors,
+            "seconds": seconds,
+            "packages_per_second": loaded / seconds if seconds else 0.0,
+        }
+
+    def _load_package_batch(self, batch, offset, errors):
+        """
+        The method to validate a batch of package records and store the valid ones.
+
+        Parameters:
+            batch (list): The package records.
+            offset (int): The number of records read before the batch.
+            errors (list): The list where the (record number, error message) pairs of invalid records are appended.
+
+        Returns:
+            int: The number of packages stored.
+        """
+        # Read the fields of each record, creating the new clients without registering them yet
+        rows = []
+        new_clients = {}
+        first_error = len(errors)
+        for number, record in enumerate(batch, offset + 1):
+            # A line that isn't valid JSON is read as its decoding error
+            if isinstance(record, ValueError):
+                errors.append((number, f"{JSON_RECORD_VALIDATION_MSG}: {record}"))
+                rows.append(None)
+                continue
+            try:
+                name = record["client_str"]
+                client = self.clients_by_name.get(name) or new_clients.get(name)
+                if client is None:
+                    client = new_clients[name] = Client(name)
+                rows.append((record["origin"], record["destination"], client, record.get("date")))
+            except KeyError as e:
+                errors.append((number, f"Missing field {e}"))
+                rows.append(None)
+            except (TypeError, AttributeError, ValueError) as e:
+                errors.append((number, str(e)))
+                rows.append(None)
+        # Validate the whole batch, keeping the errors of the batch in record order
+        packages = Package.from_rows(rows, self.clients_by_name, errors, offset)
+        errors[first_error:] = sorted(errors[first_error:])
+        # Then register the clients of the valid packages and store the packages
+        for package in packages:
+            package.client = self._register_client(package.client)
+            self._index_package(package)
+        return len(packages)
+
+    def get_packages(self, date):
+        """
+        The method to get the packages handled on a given date.
+
+        Parameters:
+            date (str): The date for which to get the packages.
+
+        Returns:
+            list: The packages handled on the given date.
+        """
+        # A date that can't be parsed has no packages
+        try:
+            ordinal = date_to_ordinal(date)
+        except ValueError:
+            return []
+        # Return a copy of the date bucket so callers can't alter the index
+        return list(self.packages_by_date.get(ordinal, []))
+
     def add_transportation_fee(self, date, fee):
         """
         The method to add a transportation fee.
@@ -124,10 +345,17 @@ class Airline:
         """
         # Validate the date and the fee
         date_format_validation(date)
-        date_min_validation(date)
+        ordinal = date_min_validation(date)
         int_fee_validation(fee)
-        # Add the fee to the transportation fee dictionary
-        self.transportation_fee[date] = int(fee)
+        # Add the fee to the transportation fee schedule
+        self._transportation_fee.set_fee_by_ordinal(ordinal, int(fee))
+        self._report_index = None
+        # Drop the cached reports of the dates the fee is in effect on, up to the next fee change
+        if self._report_cache:
+            next_change = self._transportation_fee.get_next_change_ordinal(ordinal)
+            for cached_ordinal in list(self._report_cache):
+                if cached_ordinal >= ordinal and (next_change is None or cached_ordinal < next_change):
+                    del self._report_cache[cached_ordinal]
 
     def get_transportation_fee(self, date):
         """
@@ -141,9 +369,27 @@ class Airline:
         """
         # Validate the date
         date_format_validation(date)
-        date_range_validation(date)
+        ordinal = date_range_validation(date)
         # Return the fee for the latest date that is not later than the given date
-        return self.transportation_fee[max([key for key in self.transportation_fee if key <= date])]
+        return self._transportation_fee.get_fee_by_ordinal(ordinal)
+
+    def get_transportation_fees(self, dates):
+        """
+        The method to get the transportation fee for each of many dates at once, as when re-pricing packages.
+
+        The dates are read in a single pass, and each distinct date is validated and looked up only once.
+
+        Parameters:
+            dates (iterable): The dates for which to get the fees.
+
+        Returns:
+            array: The fees for the given dates, in the same order, as an array of 64-bit integers.
+
+        Raises:
+            ValueError: If a date is not in DD/MM/YYYY format or is out of range.
+        """
+        # Return the fee for the latest date that is not later than each given date, validating each distinct date once
+        return self._transportation_fee.get_fees(dates, date_range_validation)
 
     def get_total_transportation_report(self, date):
         """
@@ -155,13 +401,230 @@ class Airline:
         Returns:
             str: The report for the given date.
         """
-        # Initialize the total number of transported packages
-        total = 0
-        # Iterate over the packages
-        for packages in self.packages:
-            # If the package's date matches the given date, increment the total
-            total += packages.date == date if 1 else 0
+        # Validate the date, which is then looked up by its ordinal
+        date_format_validation(date)
+        ordinal = date_range_validation(date)
+        # Return the cached report of the date, if any
+        report = self._report_cache.get(ordinal)
+        if report is not None:
+            self._report_cache.move_to_end(ordinal)
+            return report
+        # Get the total number of transported packages from the per-date counter
+        total = self.package_count_by_date.get(ordinal, 0)
         # Get the transportation fee for the given date
-        transportation_fee = self.get_transportation_fee(date)
+        transportation_fee = self._transportation_fee.get_fee_by_ordinal(ordinal)
+        # Build the report and cache it, evicting the least recently used report if the cache is full
+        report = TRANSPORTATION_REPORT_FORMAT.format(date=ordinal_to_date(ordinal), fee=transportation_fee,
+                                                     total=total, charged=total * transportation_fee)
+        if self.report_cache_size:
+            self._report_cache[ordinal] = report
+            if len(self._report_cache) > self.report_cache_size:
+                self._report_cache.popitem(last=False)
+        # Return the report
+        return report
+
+    def _get_report_index(self):
+        """
+        The method to get the prefix-sum index used by range reports, building it if needed.
+
+        Returns:
+            tuple: The index, as built by _build_report_index.
+        """
+        if self._report_index is None:
+            self._report_index = self._build_report_index(self.package_count_by_date, self._transportation_fee)
+        return self._report_index
+
+    @staticmethod
+    def _build_report_index(package_count_by_date, transportation_fee):
+        """
+        The method to build the prefix-sum index used by range reports.
+
+        Parameters:
+            package_count_by_date (dict): A dictionary mapping date ordinals to their number of packages.
+            transportation_fee (FeeSchedule): The fee schedule to charge the packages with.
+
+        Returns:
+            tuple: The sorted ordinals of the dates with packages, a dictionary mapping those ordinals to their package
+                count, the prefix sums of the package counts and of the fees charged over the sorted ordinals, and the
+                fee schedule used.
+        """
+        # Keep the package count of every reportable date
+        counts = {ordinal: count for ordinal, count in package_count_by_date.items() if ordinal >= DATE_MIN_ORDINAL}
+        # Accumulate the package counts and the fees charged in chronological order
+        ordinals = sorted(counts)
+        prefix_counts = [0]
+        prefix_revenue = [0]
+        for ordinal in ordinals:
+            count = counts[ordinal]
+            prefix_counts.append(prefix_counts[-1] + count)
+            prefix_revenue.append(prefix_revenue[-1] + count * transportation_fee.get_fee_by_ordinal(ordinal))
+        return ordinals, counts, prefix_counts, prefix_revenue, transportation_fee
+
+    def get_transportation_report_range(self, start, end):
+        """
+        The method to get the transportation report for every date between two dates, both included.
+
+        Parameters:
+            start (str): The first date of the report.
+            end (str): The last date of the report.
+
+        Returns:
+            dict: The report, with the total number of packages transported and the total fee charged in the interval,
+                and a "days" list holding the date, fee, number of packages and fee charged for each date.
+        """
+        # Validate the dates and the interval
+        start_ordinal, end_ordinal = date_interval_range_validation(start, end)
+        # Get the totals of the interval from the prefix sums
+        ordinals, counts, prefix_counts, prefix_revenue, schedule = self._get_report_index()
+        low = bisect_left(ordinals, start_ordinal)
+        high = bisect_right(ordinals, end_ordinal)
+        # Build the breakdown of each date in the interval
+        days = []
+        for ordinal in range(start_ordinal, end_ordinal + 1):
+            total = counts.get(ordinal, 0)
+            transportation_fee = schedule.get_fee_by_ordinal(ordinal)
+            days.append({
+                "date": ordinal_to_date(ordinal),
+                "fee": transportation_fee,
+                "packages": total,
+                "revenue": total * transportation_fee,
+            })
         # Return the report
-        return f"[DATE: {date} | FEE: {transportation_fee}]\nTotal packages transported: {total}\nTotal transportation fee charged: {total * transportation_fee}"
+        return {
+            "start": start,
+            "end": end,
+            "packages": prefix_counts[high] - prefix_counts[low],
+            "revenue": prefix_revenue[high] - prefix_revenue[low],
+            "days": days,
+        }
+
+    def _get_aggregate_report(self, counts_by_date, start, end):
+        """
+        The method to total the packages and fees charged of a per-date count index over a date interval.
+
+        Parameters:
+            counts_by_date (dict): A dictionary mapping date ordinals to a number of packages.
+            start (str): The first date of the interval.
+            end (str): The last date of the interval.
+
+        Returns:
+            dict: The report, with the interval, the total number of packages and the total fee charged.
+        """
+        # Validate the dates and the interval
+        start_ordinal, end_ordinal = date_interval_range_validation(start, end)
+        # Total the packages of the dates in the interval, charging each date with its fee
+        schedule = self._transportation_fee
+        total = revenue = 0
+        for ordinal, count in list(counts_by_date.items()):
+            if start_ordinal <= ordinal <= end_ordinal:
+                total += count
+                revenue += count * schedule.get_fee_by_ordinal(ordinal)
+        return {
+            "start": start,
+            "end": end,
+            "packages": total,
+            "revenue": revenue,
+        }
+
+    def get_client_report(self, name, start, end):
+        """
+        The method to get the packages and fees charged of a client between two dates, both included.
+
+        Only the dates the client has packages on are visited.
+
+        Parameters:
+            name (str): The name of the client.
+            start (str): The first date of the report.
+            end (str): The last date of the report.
+
+        Returns:
+            dict: The report, with the client, the interval, the total number of packages and the total fee charged.
+
+        Raises:
+            ValueError: If no client with the given name exists.
+        """
+        client = self.get_client(name)
+        report = self._get_aggregate_report(self.package_count_by_client.get(client.name, {}), start, end)
+        return {"client": client.name, **report}
+
+    def get_route_report(self, origin, destination, start, end):
+        """
+        The method to get the packages and fees charged on a route between two dates, both included.
+
+        Only the dates with packages on the route are visited.
+
+        Parameters:
+            origin (str): The origin of the route.
+            destination (str): The destination of the route.
+            start (str): The first date of the report.
+            end (str): The last date of the report.
+
+        Returns:
+            dict: The report, with the route, the interval, the total number of packages and the total fee charged.
+        """
+        report = self._get_aggregate_report(self.package_count_by_route.get((origin, destination), {}), start, end)
+        return {"origin": origin, "destination": destination, **report}
+
+    def _get_sketches(self):
+        """
+        The method to get the sketches of the airline, which the approximate reports need.
+
+        Returns:
+            PackageSketches: The sketches of the airline.
+
+        Raises:
+            ValueError: If the sketches are not enabled.
+        """
+        if self.sketches is None:
+            raise ValueError(SKETCHES_DISABLED_VALIDATION_MSG)
+        return self.sketches
+
+    def get_distinct_clients_estimate(self, start, end):
+        """
+        The method to estimate the number of distinct clients with packages between two dates, both included.
+
+        The estimate is merged from the HyperLogLog sketches of the dates, so it doesn't scan the packages. Its relative
+        standard error is 1.04 / sqrt(2 ** precision) of the sketches, 3.3% with the default precision.
+
+        Parameters:
+            start (str): The first date of the report.
+            end (str): The last date of the report.
+
+        Returns:
+            dict: The report, with the interval, the estimated number of distinct clients and its relative standard
+                error.
+
+        Raises:
+            ValueError: If the sketches are not enabled or the dates are invalid.
+        """
+        sketches = self._get_sketches()
+        # Validate the dates and the interval
+        start_ordinal, end_ordinal = date_interval_range_validation(start, end)
+        return {
+            "start": start,
+            "end": end,
+            "clients": sketches.get_distinct_clients(start_ordinal, end_ordinal),
+            "error": sketches.client_error,
+        }
+
+    def get_top_routes(self, limit=10):
+        """
+        The method to get the busiest routes, with their approximate number of packages.
+
+        The routes are counted by a SpaceSaving sketch of a fixed number of counters. Each count overestimates the
+        exact one by at most its error, which is never more than the number of packages divided by the number of
+        counters, and every route with more packages than that is guaranteed to be reported.
+
+        Parameters:
+            limit (int): The maximum number of routes to get.
+
+        Returns:
+            list: The busiest routes, busiest first, each with its origin, destination, approximate number of packages
+                and maximum overestimation.
+
+        Raises:
+            ValueError: If the sketches are not enabled.
+        """
+        sketches = self._get_sketches()
+        return [{"origin": origin, "destination": destination, "packages": count, "error": error}
+                for (origin, destination), count, error in sketches.routes.get_top(limit)]
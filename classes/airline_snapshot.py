@@ -0,0 +1,416 @@
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+
+from classes.airline import Airline
+from classes.client import Client
+from classes.package import Package
+from classes.package_store import PackageStore
+from utils import ordinal_to_date, package_days_validation, SNAPSHOT_FORMAT_VALIDATION_MSG, \
+    SNAPSHOT_VERSION_VALIDATION_MSG
+
+
+class _StringTable:
+    """
+    The _StringTable class dictionary-encodes strings, giving each distinct string the id of its first appearance.
+
+    Attributes:
+        strings (list): The distinct strings, indexed by id.
+    """
+
+    __slots__ = ("strings", "_ids")
+
+    def __init__(self):
+        self.strings = []
+        self._ids = {}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def encode(self, value):
+        """
+        The method to get the id of a string, adding the string to the table if it is new.
+
+        Parameters:
+            value (str): The string.
+
+        Returns:
+            int: The id of the string.
+        """
+        string_id = self._ids.get(value)
+        if string_id is None:
+            string_id = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+
+class AirlineSnapshot:
+    """
+    The AirlineSnapshot class reads and writes airlines in a compact binary format that is opened with mmap.
+
+    All the strings are stored once in a string table: the airline name, then the client names, then the cities. The
+    packages and fees are stored as little-endian integer columns: ids into the client and city tables, and date
+    ordinals. The file starts with a header holding the magic number, the version, the number of clients, cities,
+    packages, and fees, a sequence number kept for the writer, and flags, followed by length-prefixed columns aligned
+    to 8 bytes:
+
+        string offsets (q), string bytes, package origin city ids (i), package destination city ids (i),
+        package client ids (i), package date ordinals (i), fee date ordinals (i), fees (q)
+
+    Opening a snapshot only maps the file: the columns are memoryviews over the mapping, so nothing is copied into
+    memory until an airline, a package store, or packages are built from them. A snapshot written with compression,
+    as for cold archives, stores each column zlib-compressed instead; it is smaller on disk, but its columns are
+    decompressed into memory when it is opened. Snapshots are plain data, so opening one never runs code from the
+    file.
+
+    Attributes:
+        path (str): The path of the snapshot file.
+        name (str): The name of the airline.
+        sequence (int): The sequence number stored by the writer, such as the write-ahead log generation of a
+            PersistentAirline.
+        columns (dict): The columns of the snapshot, as memoryviews over the file mapping, or over the decompressed
+            columns of a compressed snapshot.
+        compressed (bool): Whether the columns are stored zlib-compressed.
+    """
+
+    MAGIC = b"KSAS"
+    VERSION = 3
+    HEADER = struct.Struct("<4sIQQQQQQ")
+    LENGTH = struct.Struct("<Q")
+    COMPRESSED = 1
+    COLUMNS = (
+        ("string_offsets", "q"),
+        ("string_bytes", "B"),
+        ("origins", "i"),
+        ("destinations", "i"),
+        ("client_ids", "i"),
+        ("days", "i"),
+        ("fee_days", "i"),
+        ("fees", "q"),
+    )
+
+    def __init__(self, path):
+        """
+        The constructor for the AirlineSnapshot class, which maps a snapshot file.
+
+        Parameters:
+            path (str): The path of the snapshot file.
+
+        Raises:
+            ValueError: If the file is not a snapshot, is truncated, or was written by an unsupported version.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = None
+        self.columns = {}
+        # Release the file and whatever was mapped of it if it can't be read
+        self._strings = None
+        try:
+            self._map_columns()
+            self.name = self.get_string(0)
+        except BaseException:
+            self.close()
+            raise
+
+    def _map_columns(self):
+        """
+        The method to map the file, read its header, and map each column without copying it, or decompress it if the
+        snapshot is compressed.
+
+        Raises:
+            ValueError: If the file is not a snapshot, is truncated, or was written by an unsupported version.
+        """
+        # An empty file can't be mapped, so it is rejected like any other file too short for the header
+        if os.fstat(self._file.fileno()).st_size < self.HEADER.size:
+            raise ValueError(SNAPSHOT_FORMAT_VALIDATION_MSG)
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._mmap)
+        # Read the header
+        magic, version, self._client_count, self._city_count, package_count, fee_count, self.sequence, flags = \
+            self.HEADER.unpack_from(self._mmap)
+        if magic != self.MAGIC:
+            raise ValueError(SNAPSHOT_FORMAT_VALIDATION_MSG)
+        if version != self.VERSION:
+            raise ValueError(SNAPSHOT_VERSION_VALIDATION_MSG)
+        self.compressed = bool(flags & self.COMPRESSED)
+        # The number of items each column must hold according to the header
+        counts = {"string_offsets": self._client_count + self._city_count + 2, "origins": package_count,
+                  "destinations": package_count, "client_ids": package_count, "days": package_count,
+                  "fee_days": fee_count, "fees": fee_count}
+        position = self.HEADER.size
+        with memoryview(self._mmap) as view:
+            for column, typecode in self.COLUMNS:
+                # Check that the length and the block it prefixes fit in the file before mapping the block
+                if position + self.LENGTH.size > size:
+                    raise ValueError(SNAPSHOT_FORMAT_VALIDATION_MSG)
+                (length,) = self.LENGTH.unpack_from(self._mmap, position)
+                position += self.LENGTH.size
+                if length > size - position:
+                    raise ValueError(SNAPSHOT_FORMAT_VALIDATION_MSG)
+                data = view[position:position + length]
+                if self.compressed:
+                    with data:
+                        try:
+                            data = memoryview(zlib.decompress(data))
+                        except zlib.error:
+                            raise ValueError(SNAPSHOT_FORMAT_VALIDATION_MSG)
+                # Check that the column holds whole items, as many as the header gives
+                itemsize = struct.calcsize(typecode)
+                if len(data) % itemsize or counts.get(column, len(data) // itemsize) != len(data) // itemsize:
+                    data.release()
+                    raise ValueError(SNAPSHOT_FORMAT_VALIDATION_MSG)
+                if sys.byteorder != "little" and typecode != "B":
+                    data = array(typecode, data.tobytes())
+                    data.byteswap()
+                    data = memoryview(data)
+                self.columns[column] = data.cast(typecode)
+                data.release()
+                position += length + (-length % 8)
+        # The string offsets must end with the size of the string bytes
+        if self.columns["string_offsets"][-1] != len(self.columns["string_bytes"]):
+            raise ValueError(SNAPSHOT_FORMAT_VALIDATION_MSG)
+
+    def __enter__(self):
+        """
+        The method to use the snapshot as a context manager.
+
+        Returns:
+            AirlineSnapshot: The snapshot itself.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        The method to leave the context manager, closing the memory map and the file.
+
+        Parameters:
+            exc_type (type): The type of the exception raised in the context, or None.
+            exc_value (BaseException): The exception raised in the context, or None.
+            traceback (traceback): The traceback of the exception, or None.
+        """
+        self.close()
+
+    def __len__(self):
+        """
+        The method to get the number of packages in the snapshot.
+
+        Returns:
+            int: The number of packages.
+        """
+        return len(self.columns["days"])
+
+    def close(self):
+        """
+        The method to release the columns and unmap the file.
+        """
+        for column in self.columns.values():
+            column.release()
+        self.columns = {}
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    @classmethod
+    def write(cls, airline, path, sequence=0, compress=False):
+        """
+        The method to write an airline to a snapshot file.
+
+        Parameters:
+            airline (Airline): The airline to write.
+            path (str): The path of the snapshot file.
+            sequence (int): A sequence number to store with the snapshot.
+            compress (bool): Whether to store the columns zlib-compressed.
+        """
+        schedule = airline.transportation_fee
+        cls.write_packages(path, airline.name, airline.packages, airline.clients,
+                           zip(schedule.ordinals, schedule.fees), sequence, compress)
+
+    @classmethod
+    def write_packages(cls, path, name, packages, clients=(), fees=(), sequence=0, compress=False):
+        """
+        The method to write packages, and optionally clients and fees, to a snapshot file.
+
+        The clients of the packages are stored along with the given ones, whether they are registered with an airline
+        or not. The snapshot is written to a temporary file that is flushed to disk and then replaces any previous
+        one, so a crash while writing it leaves the previous snapshot untouched.
+
+        Parameters:
+            path (str): The path of the snapshot file.
+            name (str): The name of the airline.
+            packages (iterable): The packages to write.
+            clients (iterable): The clients to write, even if they have no packages.
+            fees (iterable): The (date ordinal, fee) pairs of the fee schedule.
+            sequence (int): A sequence number to store with the snapshot.
+            compress (bool): Whether to store the columns zlib-compressed, which trades the mapping of the file for a
+                smaller file.
+        """
+        # Dictionary-encode the client names and the cities in tables of their own
+        client_table = _StringTable()
+        city_table = _StringTable()
+        for client in clients:
+            client_table.encode(client.name)
+        columns = {column: array(typecode) for column, typecode in cls.COLUMNS}
+        for package in packages:
+            columns["origins"].append(city_table.encode(package.origin))
+            columns["destinations"].append(city_table.encode(package.destination))
+            columns["client_ids"].append(client_table.encode(package.client.name))
+            columns["days"].append(package.day)
+        for day, fee in fees:
+            columns["fee_days"].append(day)
+            columns["fees"].append(fee)
+        # Store the strings as their concatenated UTF-8 bytes and the offset where each one starts and ends
+        offset = 0
+        columns["string_offsets"].append(0)
+        for value in [name] + client_table.strings + city_table.strings:
+            data = value.encode("utf-8")
+            columns["string_bytes"].frombytes(data)
+            offset += len(data)
+            columns["string_offsets"].append(offset)
+        # Write the header and the length-prefixed columns to a temporary file, then replace the snapshot with it
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(client_table), len(city_table),
+                                    len(columns["days"]), len(columns["fees"]), sequence,
+                                    cls.COMPRESSED if compress else 0))
+            for column, _ in cls.COLUMNS:
+                data = columns[column]
+                if sys.byteorder != "little":
+                    data.byteswap()
+                data = data.tobytes()
+                if compress:
+                    data = zlib.compress(data)
+                f.write(cls.LENGTH.pack(len(data)))
+                f.write(data)
+                f.write(b"\0" * (-len(data) % 8))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary_path, path)
+
+    def get_string(self, string_id):
+        """
+        The method to decode a string of the string table.
+
+        Parameters:
+            string_id (int): The id of the string.
+
+        Returns:
+            str: The string.
+        """
+        offsets = self.columns["string_offsets"]
+        return bytes(self.columns["string_bytes"][offsets[string_id]:offsets[string_id + 1]]).decode("utf-8")
+
+    @property
+    def strings(self):
+        """
+        The method to get the string table, decoding it the first time.
+
+        Returns:
+            list: The strings, indexed by string id.
+        """
+        if self._strings is None:
+            self._strings = [self.get_string(string_id) for string_id in range(len(self.columns["string_offsets"]) - 1)]
+        return self._strings
+
+    @property
+    def client_names(self):
+        """
+        The method to get the client table.
+
+        Returns:
+            list: The client names, indexed by client id.
+        """
+        return self.strings[1:1 + self._client_count]
+
+    @property
+    def cities(self):
+        """
+        The method to get the city table.
+
+        Returns:
+            list: The cities, indexed by city id.
+        """
+        return self.strings[1 + self._client_count:1 + self._client_count + self._city_count]
+
+    def get_daily_counts(self):
+        """
+        The method to count the packages of each date, straight from the mapped date column.
+
+        Returns:
+            dict: A dictionary mapping the ordinal of each date with packages to its number of packages.
+        """
+        counts = {}
+        for day in self.columns["days"]:
+            counts[day] = counts.get(day, 0) + 1
+        return dict(sorted(counts.items()))
+
+    def to_airline(self, airline_cls=Airline, **kwargs):
+        """
+        The method to load the snapshot into a new airline.
+
+        Parameters:
+            airline_cls (type): The class of the airline to build.
+            kwargs: The other arguments of the airline constructor.
+
+        Returns:
+            Airline: The airline holding the clients, packages, and fees of the snapshot.
+        """
+        airline = airline_cls(self.name, **kwargs)
+        cities = self.cities
+        clients = [airline.add_client(name) for name in self.client_names]
+        for origin, destination, client, day in zip(self.columns["origins"], self.columns["destinations"],
+                                                     self.columns["client_ids"], self.columns["days"]):
+            airline.add_package(cities[origin], cities[destination], clients[client], day)
+        for day, fee in zip(self.columns["fee_days"], self.columns["fees"]):
+            airline.add_transportation_fee(ordinal_to_date(day), fee)
+        return airline
+
+    def to_package_store(self):
+        """
+        The method to load the packages of the snapshot into a columnar store.
+
+        Returns:
+            PackageStore: The store holding the packages of the snapshot.
+        """
+        return PackageStore.from_columns(self.cities, [Client(name) for name in self.client_names],
+                                         self.columns["origins"], self.columns["destinations"],
+                                         self.columns["client_ids"], self.columns["days"])
+
+    def iter_packages(self, clients_by_name=None):
+        """
+        The method to iterate over the packages of the snapshot, only checking the range of their dates.
+
+        Parameters:
+            clients_by_name (dict): A dictionary mapping client names to the clients the packages should share; new
+                clients are built for the other names.
+
+        Returns:
+            iterator: An iterator over the packages, in the order they were written.
+
+        Raises:
+            ValueError: If a date ordinal of the snapshot is out of range.
+        """
+        days = package_days_validation(self.columns["days"])
+        clients_by_name = clients_by_name or {}
+        cities = [sys.intern(city) for city in self.cities]
+        clients = [clients_by_name.get(name) or Client(name) for name in self.client_names]
+        new = Package.__new__
+        for origin, destination, client, day in zip(self.columns["origins"], self.columns["destinations"],
+                                                     self.columns["client_ids"], days):
+            package = new(Package)
+            package.origin = cities[origin]
+            package.destination = cities[destination]
+            package.client = clients[client]
+            package.day = day
+            yield package
+
+    def iter_fees(self):
+        """
+        The method to iterate over the fee schedule of the snapshot.
+
+        Returns:
+            iterator: An iterator over the (date ordinal, fee) pairs, in chronological order.
+        """
+        return zip(self.columns["fee_days"], self.columns["fees"])
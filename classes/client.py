@@ -9,6 +9,9 @@ class Client:
         name (str): The name of the client.
     """
 
+    # Clients have no per-instance dictionary
+    __slots__ = ("name",)
+
     def __init__(self, name):
         """
         The constructor for the Client class.
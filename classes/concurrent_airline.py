@@ -0,0 +1,104 @@
+import threading
+
+from classes.airline import Airline
+from utils import date_format_validation, date_min_validation, int_fee_validation
+
+
+class ConcurrentAirline(Airline):
+    """
+    The ConcurrentAirline class represents an airline that can be fed and reported on from several threads at once.
+
+    Writers serialize on sharded locks: clients on a lock chosen by their name, so two threads adding the same client
+    get the same Client, and packages on a lock chosen by their date, so counts are never lost. Readers take no locks.
+    The fee schedule is copied on write and swapped in whole, and range reports build their index from a copy of the
+    per-date counts tagged with a version number that every write bumps, so a report never sees a write half done and
+    a stale index is rebuilt.
+
+    Attributes:
+        shards (int): The number of client locks and of package locks.
+    """
+
+    def __init__(self, name, shards=64):
+        """
+        The constructor for the ConcurrentAirline class.
+
+        Parameters:
+            name (str): The name of the airline.
+            shards (int): The number of client locks and of package locks.
+        """
+        # A reader could cache a report computed just before a write invalidated it, so the report cache is disabled
+        super().__init__(name, report_cache_size=0)
+        self.shards = shards
+        self._client_locks = [threading.Lock() for _ in range(shards)]
+        self._date_locks = [threading.Lock() for _ in range(shards)]
+        self._fee_lock = threading.Lock()
+        self._version_lock = threading.Lock()
+        self._version = 0
+        self._versioned_report_index = (-1, None)
+
+    def _bump_version(self):
+        """
+        The method to mark every report index built before a write as stale.
+        """
+        with self._version_lock:
+            self._version += 1
+
+    def _register_client(self, client):
+        """
+        The method to store an already validated client under the lock of its name's shard, unless a client with the
+        same name is already stored.
+
+        Parameters:
+            client (Client): The client to store.
+
+        Returns:
+            Client: The stored client with the name of the given client.
+        """
+        with self._client_locks[hash(client.name) % self.shards]:
+            return super()._register_client(client)
+
+    def _index_package(self, package):
+        """
+        The method to store an already validated package under the lock of its date's shard, then mark the report
+        index as stale.
+
+        Parameters:
+            package (Package): The package to store.
+        """
+        with self._date_locks[hash(package.day) % self.shards]:
+            super()._index_package(package)
+        self._bump_version()
+
+    def add_transportation_fee(self, date, fee):
+        """
+        The method to add a transportation fee by swapping in an updated copy of the fee schedule.
+
+        Parameters:
+            date (str): The date when the fee is added.
+            fee (int): The fee to be added.
+        """
+        # Validate the date and the fee
+        date_format_validation(date)
+        ordinal = date_min_validation(date)
+        int_fee_validation(fee)
+        # Replace the schedule so readers keep using a complete one
+        with self._fee_lock:
+            schedule = self._transportation_fee.copy()
+            schedule.set_fee_by_ordinal(ordinal, int(fee))
+            self._transportation_fee = schedule
+        self._bump_version()
+
+    def _get_report_index(self):
+        """
+        The method to get the prefix-sum index used by range reports, building it from a snapshot if it is stale.
+
+        Returns:
+            tuple: The index, as built by _build_report_index.
+        """
+        version, index = self._versioned_report_index
+        current_version = self._version
+        if version != current_version:
+            # Copy the counts and take the schedule before building, as writers may change them meanwhile
+            index = self._build_report_index(self.package_count_by_date.copy(), self._transportation_fee)
+            self._versioned_report_index = (current_version, index)
+        return index
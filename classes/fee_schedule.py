@@ -0,0 +1,447 @@
+from array import array
+from bisect import bisect_left, bisect_right
+
+from utils import date_to_ordinal, get_numpy, ordinal_to_date
+
+
+class _FeesByDate(dict):
+    """
+    A dictionary mapping dates to their fees, which looks each new date up the first time it is used.
+    """
+
+    __slots__ = ("lookup",)
+
+    def __init__(self, lookup):
+        super().__init__()
+        self.lookup = lookup
+
+    def __missing__(self, date):
+        fee = self[date] = self.lookup(date)
+        return fee
+
+
+class FeeSchedule:
+    """
+    The FeeSchedule class represents the transportation fees of an airline, keyed by the date they take effect.
+
+    The effective dates are kept as sorted ordinals in a list parallel to the fees, so the fee in effect on a date is
+    found with a binary search and the dates compare chronologically instead of as DD/MM/YYYY strings.
+
+    Attributes:
+        ordinals (list): The sorted ordinals of the dates when each fee takes effect.
+        fees (list): The fees, in the same order as the ordinals.
+    """
+
+    def __init__(self, fees=None):
+        """
+        The constructor for the FeeSchedule class.
+
+        Parameters:
+            fees (dict): An optional dictionary mapping dates to fees to start the schedule with.
+        """
+        # Initialize the parallel lists of ordinals and fees
+        self.ordinals = []
+        self.fees = []
+        # The NumPy copies of the lists used by bulk lookups are built lazily and dropped whenever a fee changes
+        self._arrays = None
+        # Add the initial fees, if any
+        for date, fee in (fees or {}).items():
+            self[date] = fee
+
+    def __setitem__(self, date, fee):
+        """
+        The method to set the fee that takes effect on a given date.
+
+        Parameters:
+            date (str): The date when the fee takes effect.
+            fee (int): The fee.
+        """
+        self.set_fee_by_ordinal(date_to_ordinal(date), fee)
+
+    def set_fee_by_ordinal(self, ordinal, fee):
+        """
+        The method to set the fee that takes effect on the date with a given ordinal.
+
+        Parameters:
+            ordinal (int): The ordinal of the date when the fee takes effect.
+            fee (int): The fee.
+        """
+        # Find the position of the date in the sorted ordinals
+        index = bisect_left(self.ordinals, ordinal)
+        self._arrays = None
+        # Replace the fee if the date already has one, otherwise insert it keeping the order
+        if index < len(self.ordinals) and self.ordinals[index] == ordinal:
+            self.fees[index] = fee
+        else:
+            self.ordinals.insert(index, ordinal)
+            self.fees.insert(index, fee)
+
+    def __getitem__(self, date):
+        """
+        The method to get the fee that takes effect exactly on a given date.
+
+        Parameters:
+            date (str): The date when the fee takes effect.
+
+        Returns:
+            int: The fee that takes effect on the given date.
+
+        Raises:
+            KeyError: If no fee takes effect on the given date.
+        """
+        # Find the position of the date in the sorted ordinals
+        ordinal = date_to_ordinal(date)
+        index = bisect_left(self.ordinals, ordinal)
+        if index < len(self.ordinals) and self.ordinals[index] == ordinal:
+            return self.fees[index]
+        raise KeyError(date)
+
+    def __contains__(self, date):
+        """
+        The method to check whether a fee takes effect exactly on a given date.
+
+        Parameters:
+            date (str): The date to check.
+
+        Returns:
+            bool: True if a fee takes effect on the given date, False otherwise.
+        """
+        try:
+            self[date]
+        except (KeyError, ValueError):
+            return False
+        return True
+
+    def __iter__(self):
+        """
+        The method to iterate over the dates when each fee takes effect, in chronological order.
+
+        Returns:
+            iterator: An iterator over the dates.
+        """
+        return (ordinal_to_date(ordinal) for ordinal in self.ordinals)
+
+    def __len__(self):
+        """
+        The method to get the number of fee changes in the schedule.
+
+        Returns:
+            int: The number of fee changes.
+        """
+        return len(self.ordinals)
+
+    def copy(self):
+        """
+        The method to get a copy of the schedule.
+
+        Returns:
+            FeeSchedule: A new schedule with the same fees.
+        """
+        schedule = FeeSchedule()
+        schedule.ordinals = list(self.ordinals)
+        schedule.fees = list(self.fees)
+        return schedule
+
+    def items(self):
+        """
+        The method to get the (date, fee) pairs of the schedule, in chronological order.
+
+        Returns:
+            list: The (date, fee) pairs.
+        """
+        return [(ordinal_to_date(ordinal), fee) for ordinal, fee in zip(self.ordinals, self.fees)]
+
+    def get_fee_by_ordinal(self, ordinal):
+        """
+        The method to get the fee in effect on the date with a given ordinal.
+
+        Parameters:
+            ordinal (int): The ordinal of the date.
+
+        Returns:
+            int: The fee in effect on the given date.
+
+        Raises:
+            KeyError: If no fee is in effect on the given date.
+        """
+        # Find the latest fee change that is not later than the given date
+        index = bisect_right(self.ordinals, ordinal) - 1
+        if index < 0:
+            raise KeyError(ordinal)
+        return self.fees[index]
+
+    def get_next_change_ordinal(self, ordinal):
+        """
+        The method to get the ordinal of the first fee change after the date with a given ordinal.
+
+        Parameters:
+            ordinal (int): The ordinal of the date.
+
+        Returns:
+            int: The ordinal of the next fee change, or None if there is none.
+        """
+        index = bisect_right(self.ordinals, ordinal)
+        return self.ordinals[index] if index < len(self.ordinals) else None
+
+    def get_fee(self, date):
+        """
+        The method to get the fee in effect on a given date.
+
+        Parameters:
+            date (str): The date.
+
+        Returns:
+            int: The fee in effect on the given date.
+
+        Raises:
+            KeyError: If no fee is in effect on the given date.
+        """
+        return self.get_fee_by_ordinal(date_to_ordinal(date))
+
+    def get_fees_by_ordinal(self, ordinals):
+        """
+        The method to get the fee in effect on each of many dates at once, given by their ordinals.
+
+        With NumPy, the fee of each day between the earliest and the latest date is looked up once with a vectorized
+        binary search, and the fees of all the dates are then gathered from that table in a single pass; otherwise
+        each distinct date is looked up once.
+
+        Parameters:
+            ordinals (iterable): The ordinals of the dates, as a list, an array, or a NumPy array.
+
+        Returns:
+            array: The fees in effect on the given dates, in the same order, as an array of 64-bit integers.
+
+        Raises:
+            KeyError: If no fee is in effect on one of the given dates.
+        """
+        numpy = get_numpy()
+        if numpy is not None:
+            if self._arrays is None:
+                self._arrays = (numpy.array(self.ordinals, dtype=numpy.int64),
+                                numpy.array(self.fees, dtype=numpy.int64))
+            schedule_ordinals, schedule_fees = self._arrays
+            ordinals = numpy.asarray(ordinals if hasattr(ordinals, "__len__") else list(ordinals), dtype=numpy.int64)
+            fees = array("q")
+            if not len(ordinals):
+                return fees
+            first = int(ordinals.min())
+            if not len(schedule_ordinals) or first < schedule_ordinals[0]:
+                raise KeyError(first)
+            # Find the latest fee change that is not later than each day of the span, then gather each date's fee;
+            # binary searching every date directly is many times slower, as its lookups jump around the schedule
+            span = int(ordinals.max()) - first + 1
+            if span <= len(ordinals):
+                days = numpy.arange(first, first + span, dtype=numpy.int64)
+                table = schedule_fees[numpy.searchsorted(schedule_ordinals, days, side="right") - 1]
+                fees.frombytes(memoryview(table[ordinals - first]).cast("B"))
+            else:
+                indexes = numpy.searchsorted(schedule_ordinals, ordinals, side="right") - 1
+                fees.frombytes(memoryview(schedule_fees[indexes]).cast("B"))
+            return fees
+        # Look each distinct date up once, then map every date to the fee of its ordinal
+        fees_by_ordinal = {ordinal: self.get_fee_by_ordinal(ordinal) for ordinal in set(ordinals)}
+        return array("q", map(fees_by_ordinal.__getitem__, ordinals))
+
+    def get_fees(self, dates, validate=date_to_ordinal):
+        """
+        The method to get the fee in effect on each of many dates at once.
+
+        The dates are read in a single pass: each distinct date is parsed and looked up the first time it is seen, and
+        every other date costs a single dictionary lookup.
+
+        Parameters:
+            dates (iterable): The dates.
+            validate (callable): The function that parses and validates a date into its ordinal.
+
+        Returns:
+            array: The fees in effect on the given dates, in the same order, as an array of 64-bit integers.
+
+        Raises:
+            KeyError: If no fee is in effect on one of the given dates.
+            ValueError: If a date is not valid.
+        """
+        fees_by_date = _FeesByDate(lambda date: self.get_fee_by_ordinal(validate(date)))
+        return array("q", list(map(fees_by_date.__getitem__, dates)))
+
+
+class FeeScheduleView:
+    """
+    The FeeScheduleView class represents a read-only view of a fee schedule, which reflects its changes but can't
+    make any.
+
+    An airline exposes its schedule through a view, so fees are only ever added with its add_transportation_fee
+    method, which also drops the cached reports the fee affects.
+
+    Attributes:
+        ordinals (list): A copy of the sorted ordinals of the dates when each fee takes effect.
+        fees (list): A copy of the fees, in the same order as the ordinals.
+    """
+
+    __slots__ = ("_schedule",)
+
+    def __init__(self, schedule):
+        """
+        The constructor for the FeeScheduleView class.
+
+        Parameters:
+            schedule (FeeSchedule): The schedule to view.
+        """
+        self._schedule = schedule
+
+    @property
+    def ordinals(self):
+        """
+        The method to get a copy of the sorted ordinals of the dates when each fee takes effect.
+
+        Returns:
+            list: The ordinals.
+        """
+        return list(self._schedule.ordinals)
+
+    @property
+    def fees(self):
+        """
+        The method to get a copy of the fees, in the same order as the ordinals.
+
+        Returns:
+            list: The fees.
+        """
+        return list(self._schedule.fees)
+
+    def __getitem__(self, date):
+        """
+        The method to get the fee that takes effect exactly on a given date.
+
+        Parameters:
+            date (str): The date when the fee takes effect.
+
+        Returns:
+            int: The fee that takes effect on the given date.
+
+        Raises:
+            KeyError: If no fee takes effect on the given date.
+        """
+        return self._schedule[date]
+
+    def __contains__(self, date):
+        """
+        The method to check whether a fee takes effect exactly on a given date.
+
+        Parameters:
+            date (str): The date to check.
+
+        Returns:
+            bool: True if a fee takes effect on the given date, False otherwise.
+        """
+        return date in self._schedule
+
+    def __iter__(self):
+        """
+        The method to iterate over the dates when each fee takes effect, in chronological order.
+
+        Returns:
+            iterator: An iterator over the dates.
+        """
+        return iter(self._schedule)
+
+    def __len__(self):
+        """
+        The method to get the number of fee changes in the schedule.
+
+        Returns:
+            int: The number of fee changes.
+        """
+        return len(self._schedule)
+
+    def copy(self):
+        """
+        The method to get a writable copy of the schedule, whose changes don't affect the viewed one.
+
+        Returns:
+            FeeSchedule: A new schedule with the same fees.
+        """
+        return self._schedule.copy()
+
+    def items(self):
+        """
+        The method to get the (date, fee) pairs of the schedule, in chronological order.
+
+        Returns:
+            list: The (date, fee) pairs.
+        """
+        return self._schedule.items()
+
+    def get_fee_by_ordinal(self, ordinal):
+        """
+        The method to get the fee in effect on the date with a given ordinal.
+
+        Parameters:
+            ordinal (int): The ordinal of the date.
+
+        Returns:
+            int: The fee in effect on the given date.
+
+        Raises:
+            KeyError: If no fee is in effect on the given date.
+        """
+        return self._schedule.get_fee_by_ordinal(ordinal)
+
+    def get_next_change_ordinal(self, ordinal):
+        """
+        The method to get the ordinal of the first fee change after the date with a given ordinal.
+
+        Parameters:
+            ordinal (int): The ordinal of the date.
+
+        Returns:
+            int: The ordinal of the next fee change, or None if there is none.
+        """
+        return self._schedule.get_next_change_ordinal(ordinal)
+
+    def get_fee(self, date):
+        """
+        The method to get the fee in effect on a given date.
+
+        Parameters:
+            date (str): The date.
+
+        Returns:
+            int: The fee in effect on the given date.
+
+        Raises:
+            KeyError: If no fee is in effect on the given date.
+        """
+        return self._schedule.get_fee(date)
+
+    def get_fees_by_ordinal(self, ordinals):
+        """
+        The method to get the fee in effect on each of many dates at once, given by their ordinals.
+
+        Parameters:
+            ordinals (iterable): The ordinals of the dates, as a list, an array, or a NumPy array.
+
+        Returns:
+            array: The fees in effect on the given dates, in the same order, as an array of 64-bit integers.
+
+        Raises:
+            KeyError: If no fee is in effect on one of the given dates.
+        """
+        return self._schedule.get_fees_by_ordinal(ordinals)
+
+    def get_fees(self, dates, validate=date_to_ordinal):
+        """
+        The method to get the fee in effect on each of many dates at once.
+
+        Parameters:
+            dates (iterable): The dates.
+            validate (callable): The function that parses and validates a date into its ordinal.
+
+        Returns:
+            array: The fees in effect on the given dates, in the same order, as an array of 64-bit integers.
+
+        Raises:
+            KeyError: If no fee is in effect on one of the given dates.
+            ValueError: If a date is not valid.
+        """
+        return self._schedule.get_fees(dates, validate)
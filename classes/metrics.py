@@ -0,0 +1,275 @@
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+
+class _OperationStats:
+    """
+    The _OperationStats class holds the number of calls, errors, and the latency histogram of one operation.
+
+    Attributes:
+        count (int): The number of calls.
+        errors (int): The number of calls that raised an exception.
+        seconds (float): The total time spent in the calls.
+        max_seconds (float): The time spent in the slowest call.
+        buckets (list): The number of calls whose time falls in each bucket, the last one being unbounded.
+    """
+
+    __slots__ = ("count", "errors", "seconds", "max_seconds", "buckets")
+
+    def __init__(self, size):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * size
+
+
+class AirlineMetrics:
+    """
+    The AirlineMetrics class records the number of calls, errors, and latency histogram of the operations of airlines.
+
+    Airlines are instrumented by wrapping the operations of the instance, so an airline that is not instrumented runs
+    its methods unchanged, without any overhead. Subclasses can plug in another backend by overriding observe.
+
+    Attributes:
+        buckets (tuple): The sorted upper bounds, in seconds, of the latency histogram buckets.
+        operations (dict): A dictionary mapping operation names to their recorded stats.
+    """
+
+    # The airline methods instrumented by default, which are skipped if an airline doesn't have them
+    OPERATIONS = ("add_client", "get_client", "add_package", "add_packages", "load_packages", "add_transportation_fee",
+                  "get_transportation_fee", "get_transportation_fees", "get_total_transportation_report",
+                  "get_transportation_report_range", "get_client_report", "get_route_report",
+                  "get_distinct_clients_estimate", "get_top_routes")
+    # The latency histogram buckets, from a microsecond to five seconds
+    BUCKETS = (0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025,
+               0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+    def __init__(self, buckets=BUCKETS):
+        """
+        The constructor for the AirlineMetrics class.
+
+        Parameters:
+            buckets (tuple): The upper bounds, in seconds, of the latency histogram buckets.
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.operations = {}
+        # Observations may come from many threads, as with ConcurrentAirline
+        self._lock = threading.Lock()
+
+    def instrument(self, airline, operations=OPERATIONS):
+        """
+        The method to record the calls of the operations of an airline.
+
+        Parameters:
+            airline (Airline): The airline to instrument.
+            operations (tuple): The names of the methods to instrument.
+
+        Returns:
+            Airline: The instrumented airline.
+        """
+        for operation in operations:
+            method = getattr(airline, operation, None)
+            # Skip the methods the airline doesn't have or that are already instrumented
+            if method is None or operation in vars(airline):
+                continue
+            setattr(airline, operation, self._wrap(operation, method))
+        return airline
+
+    def uninstrument(self, airline):
+        """
+        The method to stop recording the calls of the operations of an airline.
+
+        Parameters:
+            airline (Airline): The instrumented airline.
+
+        Returns:
+            Airline: The airline, running its methods unchanged again.
+        """
+        for operation, method in list(vars(airline).items()):
+            if getattr(method, "__metrics__", None) is self:
+                delattr(airline, operation)
+        return airline
+
+    def _wrap(self, operation, method):
+        """
+        The method to wrap a method so that the time of each call is recorded.
+
+        Parameters:
+            operation (str): The name of the operation.
+            method (callable): The bound method to wrap.
+
+        Returns:
+            callable: The wrapped method.
+        """
+        observe = self.observe
+        perf_counter = time.perf_counter
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            started = perf_counter()
+            error = True
+            try:
+                result = method(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                observe(operation, perf_counter() - started, error)
+
+        wrapper.__metrics__ = self
+        return wrapper
+
+    def observe(self, operation, seconds, error=False):
+        """
+        The method to record a call of an operation.
+
+        Parameters:
+            operation (str): The name of the operation.
+            seconds (float): The time spent in the call.
+            error (bool): Whether the call raised an exception.
+        """
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = self.operations[operation] = _OperationStats(len(self.buckets) + 1)
+            stats.count += 1
+            stats.errors += error
+            stats.seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            stats.buckets[index] += 1
+
+    def reset(self):
+        """
+        The method to forget every recorded call.
+        """
+        with self._lock:
+            self.operations = {}
+
+    def get_quantile(self, operation, quantile):
+        """
+        The method to estimate a latency quantile of an operation from its histogram.
+
+        The estimate is the upper bound of the bucket holding the quantile, so it is never lower than the real value;
+        quantiles falling in the unbounded bucket are estimated by the slowest call.
+
+        Parameters:
+            operation (str): The name of the operation.
+            quantile (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated quantile, in seconds, or None if the operation was never called.
+        """
+        stats = self.operations.get(operation)
+        if stats is None or not stats.count:
+            return None
+        # Find the first bucket whose cumulative count reaches the rank of the quantile
+        rank = quantile * stats.count
+        cumulative = 0
+        for bound, count in zip(self.buckets, stats.buckets):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, stats.max_seconds)
+        return stats.max_seconds
+
+    def to_dict(self):
+        """
+        The method to get the recorded metrics as a JSON-serializable dictionary.
+
+        Returns:
+            dict: A dictionary mapping each operation to its number of calls and errors, total, mean, maximum, median
+                and 99th percentile seconds, and cumulative bucket counts keyed by their upper bound.
+        """
+        metrics = {}
+        with self._lock:
+            operations = sorted(self.operations.items())
+        for operation, stats in operations:
+            bounds = [str(bound) for bound in self.buckets] + ["+Inf"]
+            cumulative = [sum(stats.buckets[:index + 1]) for index in range(len(stats.buckets))]
+            metrics[operation] = {
+                "count": stats.count,
+                "errors": stats.errors,
+                "seconds": stats.seconds,
+                "mean_seconds": stats.seconds / stats.count if stats.count else 0.0,
+                "max_seconds": stats.max_seconds,
+                "p50_seconds": self.get_quantile(operation, 0.5),
+                "p99_seconds": self.get_quantile(operation, 0.99),
+                "buckets": dict(zip(bounds, cumulative)),
+            }
+        return metrics
+
+    def to_prometheus(self):
+        """
+        The method to get the recorded metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The latency histogram and error counter of every operation.
+        """
+        lines = ["# HELP airline_operation_seconds Time spent in airline operations.",
+                 "# TYPE airline_operation_seconds histogram"]
+        errors = ["# HELP airline_operation_errors_total Airline operations that raised an exception.",
+                  "# TYPE airline_operation_errors_total counter"]
+        with self._lock:
+            operations = sorted(self.operations.items())
+        for operation, stats in operations:
+            label = f'operation="{operation}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), stats.buckets):
+                cumulative += count
+                lines.append(f'airline_operation_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+            lines.append(f"airline_operation_seconds_sum{{{label}}} {stats.seconds!r}")
+            lines.append(f"airline_operation_seconds_count{{{label}}} {stats.count}")
+            errors.append(f"airline_operation_errors_total{{{label}}} {stats.errors}")
+        return "\n".join(lines + errors) + "\n"
+
+    @staticmethod
+    @contextmanager
+    def capture(limit=20, sort="cumulative"):
+        """
+        The method to profile the code run inside a with block, function by function and allocation by allocation.
+
+        Profiling slows the code down many times over, so it is meant to find where a regression comes from once the
+        metrics show one, not to be left on.
+
+        Parameters:
+            limit (int): The number of functions and allocation sites reported.
+            sort (str): The pstats key the functions are sorted by.
+
+        Yields:
+            dict: A dictionary filled when the block exits with the "profile" text of the slowest functions, the
+                "allocations" grown the most during the block, as "file:line: size=..." texts, and the "peak_memory"
+                traced during the block, in bytes.
+        """
+        # The profilers are only imported when a capture is asked for, as they slow the import of the module down
+        import cProfile
+        import io
+        import pstats
+        import tracemalloc
+
+        capture = {}
+        # Trace the allocations, unless the caller is already tracing them
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield capture
+        finally:
+            profiler.disable()
+            after = tracemalloc.take_snapshot()
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            if not tracing:
+                tracemalloc.stop()
+            # Report the slowest functions and the allocation sites that grew the most
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(limit)
+            capture["profile"] = stream.getvalue()
+            capture["allocations"] = [str(stat) for stat in after.compare_to(before, "lineno")[:limit]]
+            capture["peak_memory"] = peak_memory
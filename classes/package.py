@@ -1,8 +1,9 @@
-from datetime import datetime
+import sys
 
 from classes.client import Client
 from utils import PACKAGE_ORIGIN_VALIDATION_MSG, PACKAGE_DESTINATION_VALIDATION_MSG, \
-    PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG, PACKAGE_CLIENT_VALIDATION_MSG, DATE_FORMAT
+    PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG, PACKAGE_CLIENT_VALIDATION_MSG, CLIENT_NOT_EXIST_VALIDATION_MSG, \
+    ordinal_to_date, package_date_validation
 
 
 class Package:
@@ -13,9 +14,13 @@ class Package:
         origin (str): The origin of the package.
         destination (str): The destination of the package.
         client (Client): The client who owns the package.
-        date (str): The date when the package is added.
+        day (int): The ordinal of the date when the package is added.
+        date (str): The date when the package is added, in DD/MM/YYYY format.
     """
 
+    # Packages are created by the million, so they have no per-instance dictionary
+    __slots__ = ("origin", "destination", "client", "day")
+
     def __init__(self, origin, destination, client, date=None):
         """
                 The constructor for the Package class.
@@ -24,21 +29,129 @@ class Package:
                     origin (str): The origin of the package.
                     destination (str): The destination of the package.
                     client (Client): The client who owns the package.
-                    date (str): The date when the package is added.
+                    date (str): The date when the package is added, or its ordinal; today if not given.
+
+                Raises:
+                    ValueError: If the origin, destination, client, or date is invalid.
                 """
-        # Assign the origin, destination, client, and date to the package
+        # Validate and assign the origin, destination, client, and date to the package
+        Package.validate(origin, destination, client)
+        # Intern the cities, which repeat across packages, so every package shares the same strings
+        self.origin = sys.intern(origin)
+        self.destination = sys.intern(destination)
+        self.client = client
+        # Keep the date as its ordinal, which is only formatted back to DD/MM/YYYY for display
+        self.day = package_date_validation(date)
+
+    @property
+    def date(self):
+        """
+        The method to get the date when the package is added.
+
+        Returns:
+            str: The date, in DD/MM/YYYY format.
+        """
+        return ordinal_to_date(self.day)
+
+    @staticmethod
+    def validate(origin, destination, client):
+        """
+        The method to validate the origin, destination, and client of a package.
+
+        Parameters:
+            origin (str): The origin of the package.
+            destination (str): The destination of the package.
+            client (Client): The client who owns the package.
+
+        Raises:
+            ValueError: If any of them is not valid.
+        """
+        Package.validate_route(origin, destination)
+        if not isinstance(client, Client):
+            raise ValueError(PACKAGE_CLIENT_VALIDATION_MSG)
+
+    @staticmethod
+    def validate_route(origin, destination):
+        """
+        The method to validate the origin and destination of a package.
+
+        Parameters:
+            origin (str): The origin of the package.
+            destination (str): The destination of the package.
+
+        Raises:
+            ValueError: If either of them is not valid.
+        """
         if len(origin) < 3:
             raise ValueError(PACKAGE_ORIGIN_VALIDATION_MSG)
         if len(destination) < 3:
             raise ValueError(PACKAGE_DESTINATION_VALIDATION_MSG)
         if origin == destination:
             raise ValueError(PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG)
-        if not isinstance(client, Client):
-            raise ValueError(PACKAGE_CLIENT_VALIDATION_MSG)
-        self.origin = origin
-        self.destination = destination
-        self.client = client
-        self.date = date if date else datetime.now().strftime(DATE_FORMAT)
+
+    @classmethod
+    def from_rows(cls, rows, clients_by_name, errors, offset=0):
+        """
+        The method to validate a batch of package rows and build the packages of the valid ones.
+
+        The batch is validated as a whole: each distinct date is parsed only once, today's date is computed once, and
+        clients given by name are resolved with a single lookup each. Invalid rows are reported instead of stopping
+        the batch.
+
+        Parameters:
+            rows (iterable): The (origin, destination, client, date) rows, where the client is a Client or the name of
+                a client in clients_by_name and the date is a DD/MM/YYYY string, an ordinal, or empty for today. Rows
+                that are None were already rejected and are skipped.
+            clients_by_name (dict): A dictionary mapping client names to the clients rows may refer to by name.
+            errors (list): The list where the (row number, error message) pairs of invalid rows are appended.
+            offset (int): The number of rows before the batch, so that rows are numbered from offset + 1.
+
+        Returns:
+            list: The packages of the valid rows, in order.
+        """
+        packages = []
+        append = packages.append
+        new = cls.__new__
+        validate_route = cls.validate_route
+        intern = sys.intern
+        # The ordinal of each valid date, or the error message of each invalid one
+        days = {}
+        for number, row in enumerate(rows, offset + 1):
+            if row is None:
+                continue
+            try:
+                origin, destination, client, date = row
+                validate_route(origin, destination)
+                # Resolve clients given by name
+                if isinstance(client, str):
+                    client = clients_by_name.get(client)
+                    if client is None:
+                        raise ValueError(CLIENT_NOT_EXIST_VALIDATION_MSG)
+                elif not isinstance(client, Client):
+                    raise ValueError(PACKAGE_CLIENT_VALIDATION_MSG)
+                # Parse each distinct date once, and today's date only if needed
+                day = days.get(date)
+                if day is None:
+                    try:
+                        day = package_date_validation(date)
+                    except ValueError as e:
+                        day = str(e)
+                    # Ordinals are not cached, as True and 1 would share an entry
+                    if not isinstance(date, int):
+                        days[date] = day
+                if isinstance(day, str):
+                    raise ValueError(day)
+            except (TypeError, ValueError) as e:
+                errors.append((number, str(e)))
+                continue
+            # Build the package without validating it again
+            package = new(cls)
+            package.origin = intern(origin)
+            package.destination = intern(destination)
+            package.client = client
+            package.day = day
+            append(package)
+        return packages
 
     def __str__(self):
         """
@@ -0,0 +1,257 @@
+from array import array
+from collections import Counter
+
+from classes.package import Package
+from utils import date_format_validation, date_range_validation, date_to_ordinal, ordinal_to_date, \
+    package_date_validation, package_days_validation, TRANSPORTATION_REPORT_FORMAT
+
+
+class PackageStore:
+    """
+    The PackageStore class represents a columnar store of packages.
+
+    Instead of one Package object per package, the store keeps four integer columns: the ids of the origin and
+    destination in a table of interned city names, the id of the client in a table of clients, and the ordinal of the
+    date. Package objects are only built on demand, and aggregates run over the columns.
+
+    Attributes:
+        cities (list): The interned city names, indexed by city id.
+        clients (list): The clients, indexed by client id.
+        origins (array): The origin city id of each package.
+        destinations (array): The destination city id of each package.
+        client_ids (array): The client id of each package.
+        days (array): The date ordinal of each package.
+    """
+
+    def __init__(self):
+        """
+        The constructor for the PackageStore class.
+        """
+        # Initialize the string tables and the lookups used to intern their values
+        self.cities = []
+        self.clients = []
+        self._city_ids = {}
+        self._client_ids = {}
+        # Initialize the empty columns
+        self.origins = array("i")
+        self.destinations = array("i")
+        self.client_ids = array("i")
+        self.days = array("i")
+        # The number of packages of each date ordinal, counted on the first report and then kept up to date by add
+        self._day_counts = None
+
+    @classmethod
+    def from_packages(cls, packages):
+        """
+        The method to build a columnar store from Package objects.
+
+        Parameters:
+            packages (iterable): The packages.
+
+        Returns:
+            PackageStore: The store holding the packages.
+        """
+        store = cls()
+        for package in packages:
+            store.add(package.origin, package.destination, package.client, package.day)
+        return store
+
+    @classmethod
+    def from_columns(cls, cities, clients, origins, destinations, client_ids, days):
+        """
+        The method to build a columnar store from already encoded columns.
+
+        Parameters:
+            cities (list): The city names, indexed by city id.
+            clients (list): The clients, indexed by client id.
+            origins (iterable): The origin city id of each package.
+            destinations (iterable): The destination city id of each package.
+            client_ids (iterable): The client id of each package.
+            days (iterable): The date ordinal of each package.
+
+        Returns:
+            PackageStore: The store holding the columns.
+
+        Raises:
+            ValueError: If a date ordinal is out of range.
+        """
+        # Validate the dates before building anything
+        days = package_days_validation(days)
+        store = cls()
+        store.cities = list(cities)
+        store.clients = list(clients)
+        store._city_ids = {city: city_id for city_id, city in enumerate(store.cities)}
+        store._client_ids = {client.name: client_id for client_id, client in enumerate(store.clients)}
+        store.origins = array("i", origins)
+        store.destinations = array("i", destinations)
+        store.client_ids = array("i", client_ids)
+        store.days = days
+        return store
+
+    def __len__(self):
+        """
+        The method to get the number of packages in the store.
+
+        Returns:
+            int: The number of packages.
+        """
+        return len(self.days)
+
+    def __getitem__(self, index):
+        """
+        The method to get a Package view of a package in the store.
+
+        Parameters:
+            index (int): The position of the package.
+
+        Returns:
+            Package: A new Package with the values of the stored package.
+        """
+        return Package(self.cities[self.origins[index]], self.cities[self.destinations[index]],
+                       self.clients[self.client_ids[index]], self.days[index])
+
+    def __iter__(self):
+        """
+        The method to iterate over Package views of the packages in the store.
+
+        Returns:
+            iterator: An iterator over the packages.
+        """
+        return (self[index] for index in range(len(self)))
+
+    def _intern_city(self, city):
+        """
+        The method to get the id of a city, adding the city to the city table if it is new.
+
+        Parameters:
+            city (str): The name of the city.
+
+        Returns:
+            int: The id of the city.
+        """
+        city_id = self._city_ids.get(city)
+        if city_id is None:
+            city_id = self._city_ids[city] = len(self.cities)
+            self.cities.append(city)
+        return city_id
+
+    def _intern_client(self, client):
+        """
+        The method to get the id of a client, adding the client to the client table if it is new.
+
+        Parameters:
+            client (Client): The client.
+
+        Returns:
+            int: The id of the client.
+        """
+        client_id = self._client_ids.get(client.name)
+        if client_id is None:
+            client_id = self._client_ids[client.name] = len(self.clients)
+            self.clients.append(client)
+        return client_id
+
+    def add(self, origin, destination, client, date=None):
+        """
+        The method to add a package to the store.
+
+        Parameters:
+            origin (str): The origin of the package.
+            destination (str): The destination of the package.
+            client (Client): The client who owns the package.
+            date (str): The date when the package is added, or its ordinal; today if not given.
+
+        Returns:
+            int: The position of the added package.
+
+        Raises:
+            ValueError: If the package or its date is not valid.
+        """
+        # Validate the package and its date before touching the columns, so they always stay aligned
+        Package.validate(origin, destination, client)
+        day = package_date_validation(date)
+        # Append the package to the columns
+        self.origins.append(self._intern_city(origin))
+        self.destinations.append(self._intern_city(destination))
+        self.client_ids.append(self._intern_client(client))
+        self.days.append(day)
+        if self._day_counts is not None:
+            self._day_counts[day] += 1
+        return len(self.days) - 1
+
+    def count_date(self, date):
+        """
+        The method to count the packages handled on a given date.
+
+        Parameters:
+            date (str): The date.
+
+        Returns:
+            int: The number of packages handled on the given date.
+        """
+        return self._count_day(date_to_ordinal(date))
+
+    def _count_day(self, ordinal):
+        """
+        The method to count the packages of the date with a given ordinal, in constant time once the dates are counted.
+
+        Parameters:
+            ordinal (int): The ordinal of the date.
+
+        Returns:
+            int: The number of packages handled on the date.
+        """
+        return self._get_day_counts()[ordinal]
+
+    def _get_day_counts(self):
+        """
+        The method to get the number of packages of each date ordinal, counting the date column once.
+
+        Returns:
+            Counter: A counter mapping date ordinals to their number of packages.
+        """
+        if self._day_counts is None:
+            self._day_counts = Counter(self.days)
+        return self._day_counts
+
+    def get_daily_counts(self):
+        """
+        The method to count the packages handled on each date.
+
+        Returns:
+            dict: A dictionary mapping the ordinal of each date with packages to its number of packages.
+        """
+        return dict(sorted(self._get_day_counts().items()))
+
+    def get_total_transportation_report(self, date, transportation_fee):
+        """
+        The method to get the total transportation report for a given date.
+
+        Parameters:
+            date (str): The date for which to get the report.
+            transportation_fee (FeeSchedule): The fee schedule to charge the packages with.
+
+        Returns:
+            str: The report for the given date.
+
+        Raises:
+            ValueError: If the date is not valid or out of range.
+        """
+        # Validate the date as the Airline report does
+        date_format_validation(date)
+        ordinal = date_range_validation(date)
+        total = self._count_day(ordinal)
+        fee = transportation_fee.get_fee_by_ordinal(ordinal)
+        return TRANSPORTATION_REPORT_FORMAT.format(date=ordinal_to_date(ordinal), fee=fee, total=total,
+                                                   charged=total * fee)
+
+    @property
+    def nbytes(self):
+        """
+        The method to get the number of bytes used by the columns of the store.
+
+        Returns:
+            int: The number of bytes used by the columns.
+        """
+        return sum(column.itemsize * len(column) for column in
+                   (self.origins, self.destinations, self.client_ids, self.days))
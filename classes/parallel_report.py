@@ -0,0 +1,202 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import date_interval_range_validation, ordinal_to_date
+
+
+def _count_days(data, counts_data, start_ordinal, end_ordinal):
+    """
+    Count the packages of each date of an interval in a partition of the date ordinals.
+
+    This runs in the worker processes, so it only gets the raw bytes of its partition.
+
+    Parameters:
+        data (bytes): The date ordinals of the partition, as the bytes of an array("i").
+        counts_data (bytes): The number of packages of each date ordinal of the partition, as the bytes of an
+            array("q"), or None if each ordinal stands for one package.
+        start_ordinal (int): The ordinal of the first date of the interval.
+        end_ordinal (int): The ordinal of the last date of the interval.
+
+    Returns:
+        list: The number of packages of each date of the interval, in order.
+    """
+    length = end_ordinal - start_ordinal + 1
+    days = array("i")
+    days.frombytes(data)
+    weights = None
+    if counts_data is not None:
+        weights = array("q")
+        weights.frombytes(counts_data)
+    counts = [0] * length
+    for index, day in enumerate(days):
+        if start_ordinal <= day <= end_ordinal:
+            counts[day - start_ordinal] += 1 if weights is None else weights[index]
+    return counts
+
+
+class ParallelReportEngine:
+    """
+    The ParallelReportEngine class computes transportation reports over long date intervals on several processes.
+
+    The date ordinals are kept in one compact array that is split into one partition per worker, either with one
+    ordinal per package, as in a columnar store, or with one ordinal per date along with its number of packages, as in
+    the per-date counter of an airline. Each worker gets only the bytes of its partition and returns the package count
+    of every date of the interval; the counts are then summed and charged with the fee schedule.
+
+    The worker processes are started on the first report that needs them and reused by the following ones, until the
+    engine is closed.
+
+    Attributes:
+        days (array): The date ordinals.
+        counts (array): The number of packages of each date ordinal, or None if each ordinal stands for one package.
+        transportation_fee (FeeSchedule): The fee schedule to charge the packages with.
+        workers (int): The number of worker processes.
+        min_partition_size (int): The minimum number of ordinals per partition; below it fewer workers are used.
+    """
+
+    def __init__(self, days, transportation_fee, workers=None, min_partition_size=100000, counts=None):
+        """
+        The constructor for the ParallelReportEngine class.
+
+        Parameters:
+            days (array): The date ordinals, as an array("i").
+            transportation_fee (FeeSchedule): The fee schedule to charge the packages with.
+            workers (int): The number of worker processes, the number of CPUs if not given.
+            min_partition_size (int): The minimum number of ordinals per partition.
+            counts (array): The number of packages of each date ordinal, as an array("q"), or None if each ordinal
+                stands for one package.
+        """
+        self.days = days
+        self.counts = counts
+        self.transportation_fee = transportation_fee
+        self.workers = workers or os.cpu_count() or 1
+        self.min_partition_size = min_partition_size
+        self._executor = None
+
+    def __enter__(self):
+        """
+        The method to use the engine as a context manager.
+
+        Returns:
+            ParallelReportEngine: The engine itself.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        The method to leave the context manager, stopping the worker processes.
+
+        Parameters:
+            exc_type (type): The type of the exception raised in the context, or None.
+            exc_value (BaseException): The exception raised in the context, or None.
+            traceback (traceback): The traceback of the exception, or None.
+        """
+        self.close()
+
+    def close(self):
+        """
+        The method to stop the worker processes, which are started again if another report needs them.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @classmethod
+    def from_airline(cls, airline, **kwargs):
+        """
+        The method to build an engine over the packages and fee schedule of an airline.
+
+        Parameters:
+            airline (Airline): The airline.
+            kwargs: The other arguments of the constructor.
+
+        Returns:
+            ParallelReportEngine: The engine.
+        """
+        # Take the per-date counter as it is, one ordinal per date with its number of packages
+        counts_by_date = dict(airline.package_count_by_date)
+        return cls(array("i", counts_by_date), airline.transportation_fee, counts=array("q", counts_by_date.values()),
+                   **kwargs)
+
+    @classmethod
+    def from_package_store(cls, store, transportation_fee, **kwargs):
+        """
+        The method to build an engine over the packages of a columnar store.
+
+        Parameters:
+            store (PackageStore): The store.
+            transportation_fee (FeeSchedule): The fee schedule to charge the packages with.
+            kwargs: The other arguments of the constructor.
+
+        Returns:
+            ParallelReportEngine: The engine.
+        """
+        return cls(store.days, transportation_fee, **kwargs)
+
+    def get_daily_counts(self, start_ordinal, end_ordinal):
+        """
+        The method to count the packages of each date of an interval.
+
+        Parameters:
+            start_ordinal (int): The ordinal of the first date of the interval.
+            end_ordinal (int): The ordinal of the last date of the interval.
+
+        Returns:
+            list: The number of packages of each date of the interval, in order.
+        """
+        # Split the ordinals into one partition per worker, without going under the minimum partition size
+        partitions = max(1, min(self.workers, len(self.days) // max(1, self.min_partition_size)))
+        size = -(-len(self.days) // partitions) if self.days else 0
+        chunks = [self.days[index:index + size].tobytes() for index in range(0, len(self.days), size or 1)]
+        if self.counts is None:
+            counts_chunks = [None] * len(chunks)
+        else:
+            counts_chunks = [self.counts[index:index + size].tobytes()
+                             for index in range(0, len(self.counts), size or 1)]
+        if len(chunks) <= 1:
+            return _count_days(chunks[0] if chunks else b"", counts_chunks[0] if chunks else None, start_ordinal,
+                               end_ordinal)
+        # Count each partition on a worker process of the shared pool and sum the counts of each date
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        results = self._executor.map(_count_days, chunks, counts_chunks, [start_ordinal] * len(chunks),
+                                     [end_ordinal] * len(chunks))
+        counts = next(results)
+        for partial_counts in results:
+            counts = [count + partial_count for count, partial_count in zip(counts, partial_counts)]
+        return counts
+
+    def get_transportation_report_range(self, start, end):
+        """
+        The method to get the transportation report for every date between two dates, both included.
+
+        Parameters:
+            start (str): The first date of the report.
+            end (str): The last date of the report.
+
+        Returns:
+            dict: The report, in the same format as Airline.get_transportation_report_range.
+        """
+        # Validate the dates and the interval
+        start_ordinal, end_ordinal = date_interval_range_validation(start, end)
+        # Count the packages in parallel and charge them with the fee in effect each date
+        days = []
+        total = revenue = 0
+        for ordinal, count in enumerate(self.get_daily_counts(start_ordinal, end_ordinal), start_ordinal):
+            transportation_fee = self.transportation_fee.get_fee_by_ordinal(ordinal)
+            days.append({
+                "date": ordinal_to_date(ordinal),
+                "fee": transportation_fee,
+                "packages": count,
+                "revenue": count * transportation_fee,
+            })
+            total += count
+            revenue += count * transportation_fee
+        return {
+            "start": start,
+            "end": end,
+            "packages": total,
+            "revenue": revenue,
+            "days": days,
+        }
@@ -0,0 +1,387 @@
+import gzip
+import json
+import os
+import re
+import zlib
+from collections import OrderedDict
+from datetime import date as date_cls
+from functools import lru_cache
+
+from classes.airline import Airline
+from classes.airline_snapshot import AirlineSnapshot
+from classes.client import Client
+from utils import DATE_CACHE_SIZE, date_to_ordinal, today_ordinal
+
+
+class PartitionedAirline(Airline):
+    """
+    The PartitionedAirline class represents an airline whose packages are partitioned by month, keeping only the
+    recent months in memory.
+
+    The partitions of cold months are archived as immutable, zlib-compressed AirlineSnapshot files and dropped from
+    memory. The per-date, per-client and per-route package counts stay in memory, so every report keeps working
+    without loading them; the packages of an archived month are only loaded when they are asked for, and a few loaded
+    partitions are cached. Adding a package to an archived month brings its partition back into memory until it is
+    archived again; its file is kept until then, so the archived packages stay on disk.
+
+    Each partition file has a small gzip-compressed JSON summary next to it holding the counts of the partition, so
+    reopening an airline restores the counts from the summaries without reading the partitions. The summary is removed
+    before its partition is rewritten and written again after it, so a missing summary, which is rebuilt from its
+    partition, is the only state a crash can leave. With sketches, the partitions are still read when the airline is
+    reopened, as the sketches need every package.
+
+    Attributes:
+        directory (str): The directory holding the archived partitions.
+        hot_months (int): The number of most recent months compact keeps in memory.
+        cached_partitions (int): The number of loaded archived partitions kept in the cache.
+        archived (dict): A dictionary mapping the month of each archived partition to its number of packages.
+        packages (list): The packages of the partitions held in memory.
+    """
+
+    PARTITION_FILE = "packages-{year:04d}-{month:02d}.bin"
+    SUMMARY_FILE = "packages-{year:04d}-{month:02d}.summary.json.gz"
+    PARTITION_FILE_PATTERN = re.compile(r"packages-(\d{4})-(\d{2})\.bin")
+
+    def __init__(self, name, directory, hot_months=3, cached_partitions=2, **kwargs):
+        """
+        The constructor for the PartitionedAirline class.
+
+        The counts of the partitions already archived in the directory are restored, so an airline can be reopened
+        over the archive of a previous one.
+
+        Parameters:
+            name (str): The name of the airline.
+            directory (str): The directory holding the archived partitions; it is created if needed.
+            hot_months (int): The number of most recent months compact keeps in memory.
+            cached_partitions (int): The number of loaded archived partitions kept in the cache.
+            kwargs: The other arguments of the Airline constructor.
+        """
+        super().__init__(name, **kwargs)
+        self.directory = directory
+        self.hot_months = hot_months
+        self.cached_partitions = cached_partitions
+        self.archived = {}
+        # The loaded archived partitions, as dictionaries mapping date ordinals to packages, least recently used first
+        self._partition_cache = OrderedDict()
+        os.makedirs(directory, exist_ok=True)
+        self._restore_archive()
+
+    @staticmethod
+    @lru_cache(maxsize=DATE_CACHE_SIZE)
+    def get_month(ordinal):
+        """
+        The method to get the month of a date, as a number that grows by one every month.
+
+        Parameters:
+            ordinal (int): The ordinal of the date.
+
+        Returns:
+            int: The month of the date, counted as year * 12 + month - 1.
+        """
+        day = date_cls.fromordinal(ordinal)
+        return day.year * 12 + day.month - 1
+
+    @staticmethod
+    def _get_month_ordinals(month):
+        """
+        The method to get the ordinals of the first day of a month and of the first day of the next month.
+
+        Parameters:
+            month (int): The month, as returned by get_month.
+
+        Returns:
+            tuple: The ordinals of the first day of the month and of the next month.
+        """
+        year, month_index = divmod(month, 12)
+        next_year, next_month_index = divmod(month + 1, 12)
+        return (date_cls(year, month_index + 1, 1).toordinal(),
+                date_cls(next_year, next_month_index + 1, 1).toordinal())
+
+    def _path(self, month, file_format=PARTITION_FILE):
+        """
+        The method to get the path of a file of an archived partition.
+
+        Parameters:
+            month (int): The month of the partition.
+            file_format (str): The format of the file name, PARTITION_FILE or SUMMARY_FILE.
+
+        Returns:
+            str: The path of the file.
+        """
+        year, month_index = divmod(month, 12)
+        return os.path.join(self.directory, file_format.format(year=year, month=month_index + 1))
+
+    def _index_package(self, package):
+        """
+        The method to store an already validated package, bringing the partition of its month back into memory
+        first if it is archived.
+
+        Parameters:
+            package (Package): The package to store.
+        """
+        month = self.get_month(package.day)
+        if month in self.archived:
+            self._unarchive(month)
+        super()._index_package(package)
+
+    def get_packages(self, date):
+        """
+        The method to get the packages handled on a given date, loading its partition if it is archived.
+
+        Parameters:
+            date (str): The date for which to get the packages.
+
+        Returns:
+            list: The packages handled on the given date.
+        """
+        # A date that can't be parsed has no packages
+        try:
+            ordinal = date_to_ordinal(date)
+        except ValueError:
+            return []
+        month = self.get_month(ordinal)
+        if month in self.archived:
+            return list(self._load_partition(month).get(ordinal, []))
+        return super().get_packages(date)
+
+    def iter_packages(self):
+        """
+        The method to iterate over every package, loading the archived partitions one at a time.
+
+        Returns:
+            iterator: An iterator over the packages of the archived months, month by month, then over the packages
+                held in memory.
+        """
+        for month in sorted(self.archived):
+            for packages in self._read_partition(month).values():
+                yield from packages
+        yield from self.packages
+
+    def compact(self, today=None):
+        """
+        The method to archive every partition older than the most recent hot_months months.
+
+        Parameters:
+            today (int): The ordinal of the date the hot months count back from; today if not given.
+
+        Returns:
+            int: The number of packages archived.
+        """
+        current_month = self.get_month(today if today is not None else today_ordinal())
+        cold_months = {month for month in map(self.get_month, self.packages_by_date)
+                       if month <= current_month - self.hot_months}
+        archived = sum(self._write_partition(month) for month in sorted(cold_months))
+        self._drop_packages(cold_months)
+        return archived
+
+    def archive(self, month):
+        """
+        The method to archive the partition of a month held in memory and drop its packages from memory.
+
+        Parameters:
+            month (int): The month, as returned by get_month.
+
+        Returns:
+            int: The number of packages archived.
+        """
+        archived = self._write_partition(month)
+        self._drop_packages({month})
+        return archived
+
+    def _drop_packages(self, months):
+        """
+        The method to drop the packages of archived months from the list of packages held in memory, in a single pass.
+
+        Parameters:
+            months (set): The archived months.
+        """
+        get_month = self.get_month
+        self.packages = [package for package in self.packages if get_month(package.day) not in months]
+
+    def _write_partition(self, month):
+        """
+        The method to write the partition of a month held in memory to its file and drop it from the date buckets.
+
+        The partition is written compressed and atomically over any previous file of the month, so a crash while
+        writing it leaves the packages in memory and the archive untouched, and its summary is written after it.
+
+        Parameters:
+            month (int): The month of the partition.
+
+        Returns:
+            int: The number of packages written.
+        """
+        # Collect the packages of the month from the date buckets
+        first, last = self._get_month_ordinals(month)
+        packages = []
+        for ordinal in range(first, last):
+            packages.extend(self.packages_by_date.get(ordinal, ()))
+        if not packages:
+            return 0
+        # Remove the summary of any previous file first, so that it never describes a partition it doesn't match
+        try:
+            os.remove(self._path(month, self.SUMMARY_FILE))
+        except FileNotFoundError:
+            pass
+        AirlineSnapshot.write_packages(self._path(month), self.name, packages, compress=True)
+        self._write_summary(month, packages)
+        # Then drop the date buckets, keeping the counts
+        for ordinal in range(first, last):
+            self.packages_by_date.pop(ordinal, None)
+        self.archived[month] = len(packages)
+        return len(packages)
+
+    def _write_summary(self, month, packages):
+        """
+        The method to write the summary of a partition, with its per-date, per-client and per-route counts.
+
+        The summary is written gzip-compressed to a temporary file that then replaces any previous one.
+
+        Parameters:
+            month (int): The month of the partition.
+            packages (list): The packages of the partition.
+        """
+        # Count the packages of each date, and of each date of each client and route, clients in order of appearance
+        dates = {}
+        clients = {}
+        routes = {}
+        for package in packages:
+            day = package.day
+            dates[day] = dates.get(day, 0) + 1
+            counts = clients.setdefault(package.client.name, {})
+            counts[day] = counts.get(day, 0) + 1
+            counts = routes.setdefault((package.origin, package.destination), {})
+            counts[day] = counts.get(day, 0) + 1
+        summary = {
+            "packages": len(packages),
+            "dates": list(dates.items()),
+            "clients": [[name, list(counts.items())] for name, counts in clients.items()],
+            "routes": [[origin, destination, list(counts.items())] for (origin, destination), counts in routes.items()],
+        }
+        data = gzip.compress(json.dumps(summary, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        path = self._path(month, self.SUMMARY_FILE)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(path + ".tmp", path)
+
+    def _read_summary(self, month):
+        """
+        The method to read the summary of a partition.
+
+        Parameters:
+            month (int): The month of the partition.
+
+        Returns:
+            dict: The summary, or None if the partition has no readable summary.
+        """
+        try:
+            with open(self._path(month, self.SUMMARY_FILE), "rb") as f:
+                return json.loads(gzip.decompress(f.read()))
+        except (OSError, EOFError, zlib.error, ValueError):
+            return None
+
+    def _read_partition(self, month):
+        """
+        The method to read the packages of an archived partition.
+
+        Parameters:
+            month (int): The month of the partition.
+
+        Returns:
+            dict: A dictionary mapping date ordinals to the packages of the partition handled on that date.
+
+        Raises:
+            ValueError: If the file is not a snapshot or was written by an unsupported version.
+        """
+        # Share the registered clients, falling back to new ones for clients that were never registered
+        packages_by_date = {}
+        with AirlineSnapshot(self._path(month)) as snapshot:
+            for package in snapshot.iter_packages(self.clients_by_name):
+                packages_by_date.setdefault(package.day, []).append(package)
+        return packages_by_date
+
+    def _load_partition(self, month):
+        """
+        The method to get the packages of an archived partition through the partition cache.
+
+        Parameters:
+            month (int): The month of the partition.
+
+        Returns:
+            dict: A dictionary mapping date ordinals to the packages of the partition handled on that date.
+        """
+        partition = self._partition_cache.get(month)
+        if partition is not None:
+            self._partition_cache.move_to_end(month)
+            return partition
+        partition = self._read_partition(month)
+        if self.cached_partitions:
+            self._partition_cache[month] = partition
+            if len(self._partition_cache) > self.cached_partitions:
+                self._partition_cache.popitem(last=False)
+        return partition
+
+    def _unarchive(self, month):
+        """
+        The method to bring the partition of an archived month back into memory.
+
+        Its file is kept, so that the archived packages stay on disk until the partition is archived again and the
+        file is rewritten with them and the packages added since.
+
+        Parameters:
+            month (int): The month of the partition.
+        """
+        partition = self._partition_cache.pop(month, None) or self._read_partition(month)
+        for ordinal, packages in partition.items():
+            self.packages_by_date.setdefault(ordinal, []).extend(packages)
+            self.packages.extend(packages)
+        del self.archived[month]
+
+    def _restore_archive(self):
+        """
+        The method to restore the counts and clients of the partitions already archived in the directory.
+
+        The counts are read from the partition summaries; a partition without a summary, or every partition if the
+        airline has sketches, is read in full, and a missing summary is written again.
+        """
+        for file_name in sorted(os.listdir(self.directory)):
+            match = self.PARTITION_FILE_PATTERN.fullmatch(file_name)
+            if match is None:
+                continue
+            month = int(match.group(1)) * 12 + int(match.group(2)) - 1
+            summary = self._read_summary(month) if self.sketches is None else None
+            if summary is not None:
+                self._restore_summary(summary)
+                self.archived[month] = summary["packages"]
+                continue
+            packages = [package for packages in self._read_partition(month).values() for package in packages]
+            for package in packages:
+                if package.client.name not in self.clients_by_name:
+                    self._register_client(package.client)
+                # Count the package without holding on to it
+                self._count_package(package)
+            if not os.path.exists(self._path(month, self.SUMMARY_FILE)):
+                self._write_summary(month, packages)
+            self.archived[month] = len(packages)
+
+    def _restore_summary(self, summary):
+        """
+        The method to add the counts of a partition summary to the counters, registering its clients.
+
+        Parameters:
+            summary (dict): The summary, as written by _write_summary.
+        """
+        for day, count in summary["dates"]:
+            self.package_count_by_date[day] = self.package_count_by_date.get(day, 0) + count
+        for name, day_counts in summary["clients"]:
+            if name not in self.clients_by_name:
+                self._register_client(Client(name))
+            counts = self.package_count_by_client.setdefault(name, {})
+            for day, count in day_counts:
+                counts[day] = counts.get(day, 0) + count
+        for origin, destination, day_counts in summary["routes"]:
+            counts = self.package_count_by_route.setdefault((origin, destination), {})
+            for day, count in day_counts:
+                counts[day] = counts.get(day, 0) + count
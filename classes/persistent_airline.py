@@ -0,0 +1,248 @@
+import json
+import os
+
+from classes.airline import Airline
+from classes.airline_snapshot import AirlineSnapshot
+from classes.client import Client
+
+
+class PersistentAirline(Airline):
+    """
+    The PersistentAirline class represents an airline whose state is kept on disk.
+
+    Every new client, package, and transportation fee is appended to a write-ahead log before the method that added it
+    returns. Once the log holds enough records, the whole state is written to an AirlineSnapshot and a new log is
+    started, so reopening the airline loads the snapshot and replays only the records added after it. Each log starts
+    with its generation, which the snapshot written before it also stores.
+
+    Attributes:
+        directory (str): The directory holding the snapshot and the write-ahead log.
+        snapshot_every (int): The number of log records after which a snapshot is written.
+        sync (bool): Whether every log record is flushed to disk with fsync.
+        wal_records (int): The number of records in the write-ahead log.
+        generation (int): The generation of the write-ahead log, which is the number of snapshots written.
+    """
+
+    SNAPSHOT_FILE = "snapshot.bin"
+    WAL_FILE = "wal.log"
+
+    def __init__(self, name, directory, snapshot_every=100000, sync=False, sketches=None):
+        """
+        The constructor for the PersistentAirline class.
+
+        Parameters:
+            name (str): The name of the airline.
+            directory (str): The directory holding the snapshot and the write-ahead log; it is created if needed.
+            snapshot_every (int): The number of log records after which a snapshot is written.
+            sync (bool): Whether every log record is flushed to disk with fsync.
+            sketches (PackageSketches): The sketches to update with each package, including the packages restored
+                from the snapshot and the log; None disables them.
+        """
+        super().__init__(name, sketches=sketches)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.sync = sync
+        self.wal_records = 0
+        self.generation = 0
+        # Restore the state without logging it again, then open the log for appending
+        self._wal = None
+        os.makedirs(directory, exist_ok=True)
+        self._load_snapshot()
+        self._replay_wal()
+
+    def __enter__(self):
+        """
+        The method to use the airline as a context manager.
+
+        Returns:
+            PersistentAirline: The airline itself.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        The method to leave the context manager, flushing and closing the write-ahead log.
+
+        Parameters:
+            exc_type (type): The type of the exception raised in the context, or None.
+            exc_value (BaseException): The exception raised in the context, or None.
+            traceback (traceback): The traceback of the exception, or None.
+        """
+        self.close()
+
+    def _path(self, file_name):
+        """
+        The method to get the path of a file of the airline directory.
+
+        Parameters:
+            file_name (str): The name of the file.
+
+        Returns:
+            str: The path of the file.
+        """
+        return os.path.join(self.directory, file_name)
+
+    def _register_client(self, client):
+        """
+        The method to store an already validated client and log it, unless a client with the same name is already
+        stored.
+
+        Parameters:
+            client (Client): The client to store.
+
+        Returns:
+            Client: The stored client with the name of the given client.
+        """
+        # Only a newly stored client is logged, since replaying a duplicate would be a no-op
+        registered = super()._register_client(client)
+        if registered is client:
+            self._log(["client", client.name])
+        return registered
+
+    def _index_package(self, package):
+        """
+        The method to store an already validated package and log it.
+
+        Parameters:
+            package (Package): The package to store.
+        """
+        super()._index_package(package)
+        self._log(["package", package.origin, package.destination, package.client.name, package.date])
+
+    def add_transportation_fee(self, date, fee):
+        """
+        The method to add a transportation fee and log it.
+
+        Parameters:
+            date (str): The date when the fee is added.
+            fee (int): The fee to be added.
+        """
+        super().add_transportation_fee(date, fee)
+        self._log(["fee", date, int(fee)])
+
+    def _log(self, record):
+        """
+        The method to append a record to the write-ahead log, writing a snapshot when the log is full.
+
+        Parameters:
+            record (list): The record to append.
+        """
+        # Records are not logged while the state is being restored
+        if self._wal is None:
+            return
+        self._wal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._wal.flush()
+        if self.sync:
+            os.fsync(self._wal.fileno())
+        self.wal_records += 1
+        if self.wal_records >= self.snapshot_every:
+            self.snapshot()
+
+    def _replay_wal(self):
+        """
+        The method to apply the records of the write-ahead log and open it for appending.
+
+        The first record of the log holds its generation. A log older than the snapshot was already written to it, so
+        its records are skipped. The log is truncated after its last complete record, so that new records never
+        follow a torn one.
+        """
+        path = self._path(self.WAL_FILE)
+        valid = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    # A torn last record was never acknowledged, so it is dropped
+                    try:
+                        record = json.loads(line) if line.endswith(b"\n") else None
+                    except ValueError:
+                        record = None
+                    if not record:
+                        break
+                    if not valid:
+                        # Skip a log that the snapshot already holds
+                        if record[0] != "generation" or record[1] < self.generation:
+                            break
+                        self.generation = record[1]
+                    else:
+                        self._apply(record)
+                        self.wal_records += 1
+                    valid += len(line)
+        # Drop the torn tail, or the whole log if it was skipped, and start an empty log with its generation
+        wal = open(path, "a", encoding="utf-8")
+        wal.truncate(valid)
+        if not valid:
+            self._write_generation(wal)
+        self._wal = wal
+
+    def _write_generation(self, wal):
+        """
+        The method to write the generation of an empty write-ahead log as its first record, flushed to disk.
+
+        Parameters:
+            wal (file): The write-ahead log, opened for appending.
+        """
+        wal.write(json.dumps(["generation", self.generation]) + "\n")
+        wal.flush()
+        os.fsync(wal.fileno())
+
+    def _apply(self, record):
+        """
+        The method to apply a record of the write-ahead log.
+
+        Parameters:
+            record (list): The record to apply.
+        """
+        kind = record[0]
+        if kind == "client":
+            self.add_client(record[1])
+        elif kind == "package":
+            _, origin, destination, client_name, date = record
+            self.add_package(origin, destination, self.add_client(client_name), date)
+        elif kind == "fee":
+            self.add_transportation_fee(record[1], record[2])
+
+    def snapshot(self):
+        """
+        The method to write the whole state to the snapshot and start a new write-ahead log.
+
+        The snapshot is written atomically and records the generation of the log that follows it, so if a crash
+        leaves the previous log in place, reopening the airline skips the records the snapshot already holds.
+        """
+        # Replace the snapshot, then empty the log and start it again with the next generation
+        self.generation += 1
+        AirlineSnapshot.write(self, self._path(self.SNAPSHOT_FILE), sequence=self.generation)
+        if self._wal is not None:
+            self._wal.truncate(0)
+            self._write_generation(self._wal)
+        else:
+            with open(self._path(self.WAL_FILE), "w", encoding="utf-8") as wal:
+                self._write_generation(wal)
+        self.wal_records = 0
+
+    def _load_snapshot(self):
+        """
+        The method to restore the state from the snapshot, if there is one.
+
+        Raises:
+            ValueError: If the file is not a snapshot or was written by an unsupported version.
+        """
+        path = self._path(self.SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return
+        with AirlineSnapshot(path) as snapshot:
+            # Restore the clients, then the packages sharing them, then the fees
+            for name in snapshot.client_names:
+                self._register_client(Client(name))
+            for package in snapshot.iter_packages(self.clients_by_name):
+                self._index_package(package)
+            for day, fee in snapshot.iter_fees():
+                self._transportation_fee.set_fee_by_ordinal(day, fee)
+            self.generation = snapshot.sequence
+
+    def close(self):
+        """
+        The method to close the write-ahead log.
+        """
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
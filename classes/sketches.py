@@ -0,0 +1,254 @@
+import hashlib
+import math
+from functools import lru_cache
+
+from utils import SKETCH_CAPACITY_VALIDATION_MSG, SKETCH_MERGE_VALIDATION_MSG, SKETCH_PRECISION_VALIDATION_MSG
+
+
+@lru_cache(maxsize=65536)
+def _hash64(value):
+    """
+    The method to hash a string to 64 bits, the same way in every process.
+
+    Parameters:
+        value (str): The string to hash.
+
+    Returns:
+        int: The 64-bit hash of the string.
+    """
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """
+    The HyperLogLog class estimates the number of distinct strings added to it, in a fixed amount of memory.
+
+    The sketch holds 2 ** precision one-byte registers, whatever the number of strings added. Its estimates have a
+    relative standard error of about 1.04 / sqrt(2 ** precision), 3.3% with the default precision of 10, so about 95%
+    of the estimates are within twice that of the exact count. Small counts are estimated by linear counting and are
+    usually exact.
+
+    Attributes:
+        precision (int): The number of hash bits used to pick a register, between 4 and 16.
+        registers (bytearray): The largest rank seen by each register.
+    """
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision=10):
+        """
+        The constructor for the HyperLogLog class.
+
+        Parameters:
+            precision (int): The number of hash bits used to pick a register, between 4 and 16.
+
+        Raises:
+            ValueError: If the precision is out of range.
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError(SKETCH_PRECISION_VALIDATION_MSG)
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    @property
+    def error(self):
+        """
+        The method to get the relative standard error of the estimates.
+
+        Returns:
+            float: The relative standard error.
+        """
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, value):
+        """
+        The method to add a string to the sketch.
+
+        Parameters:
+            value (str): The string to add.
+        """
+        # The first bits of the hash pick the register, which keeps the longest run of leading zeros of the others
+        hashed = _hash64(value)
+        bits = 64 - self.precision
+        index = hashed >> bits
+        rank = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, other):
+        """
+        The method to merge another sketch into this one, which then estimates the distinct strings added to either.
+
+        Parameters:
+            other (HyperLogLog): The sketch to merge, with the same precision.
+
+        Raises:
+            ValueError: If the sketches have different precisions.
+        """
+        if other.precision != self.precision:
+            raise ValueError(SKETCH_MERGE_VALIDATION_MSG)
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self):
+        """
+        The method to estimate the number of distinct strings added to the sketch.
+
+        Returns:
+            int: The estimated number of distinct strings.
+        """
+        size = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(size, 0.7213 / (1 + 1.079 / size))
+        estimate = alpha * size * size / sum(2.0 ** -rank for rank in self.registers)
+        # Use linear counting for small cardinalities, where the raw estimate is biased
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+
+class SpaceSaving:
+    """
+    The SpaceSaving class keeps the most frequent items of a stream, and their approximate counts, in a fixed number of
+    counters.
+
+    When every counter is taken, a new item replaces an item with the smallest count and inherits that count as its
+    error. After n items, every count is an overestimate by at most its error, which is never more than n / capacity,
+    and every item seen more than n / capacity times is guaranteed to be kept. The items are grouped in buckets by
+    count, so adding an item takes constant time even when it replaces another.
+
+    Attributes:
+        capacity (int): The number of counters.
+        counts (dict): A dictionary mapping the kept items to their approximate counts.
+        errors (dict): A dictionary mapping the kept items to the maximum overestimation of their counts.
+        total (int): The number of items added.
+    """
+
+    __slots__ = ("capacity", "counts", "errors", "total", "_buckets", "_min_count")
+
+    def __init__(self, capacity=100):
+        """
+        The constructor for the SpaceSaving class.
+
+        Parameters:
+            capacity (int): The number of counters.
+
+        Raises:
+            ValueError: If the capacity is less than 1.
+        """
+        if capacity < 1:
+            raise ValueError(SKETCH_CAPACITY_VALIDATION_MSG)
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self.total = 0
+        # The kept items of each count, as dictionaries used as ordered sets, and the smallest count
+        self._buckets = {}
+        self._min_count = 0
+
+    def add(self, item):
+        """
+        The method to add an item of the stream.
+
+        Parameters:
+            item (hashable): The item to add.
+        """
+        self.total += 1
+        count = self.counts.get(item)
+        if count is None:
+            if len(self.counts) < self.capacity:
+                count = 0
+                self.errors[item] = 0
+                self._min_count = 0
+            else:
+                # Replace the oldest item with the smallest count, whose count becomes the error of the new item
+                count = self._min_count
+                bucket = self._buckets[count]
+                evicted = next(iter(bucket))
+                del bucket[evicted], self.counts[evicted], self.errors[evicted]
+                if not bucket:
+                    del self._buckets[count]
+                self.errors[item] = count
+        else:
+            # Move the item out of the bucket of its current count
+            bucket = self._buckets[count]
+            del bucket[item]
+            if not bucket:
+                del self._buckets[count]
+        self.counts[item] = count + 1
+        self._buckets.setdefault(count + 1, {})[item] = None
+        # The smallest count only grows when its bucket is emptied, and the item moved to the next count
+        if count == self._min_count and count not in self._buckets:
+            self._min_count = count + 1
+
+    def get_top(self, limit=10):
+        """
+        The method to get the most frequent items.
+
+        Parameters:
+            limit (int): The maximum number of items to get.
+
+        Returns:
+            list: The (item, count, error) tuples of the most frequent items, most frequent first, where the exact
+                count of each item is between count - error and count.
+        """
+        items = sorted(self.counts, key=self.counts.get, reverse=True)[:limit]
+        return [(item, self.counts[item], self.errors[item]) for item in items]
+
+
+class PackageSketches:
+    """
+    The PackageSketches class holds the sketches an airline updates with each package, so that the distinct clients and
+    busiest routes are reported in bounded memory, without scanning the packages.
+
+    Attributes:
+        precision (int): The precision of the HyperLogLog sketch of the clients of each date.
+        client_error (float): The relative standard error of the distinct client estimates.
+        clients_by_date (dict): A dictionary mapping date ordinals to the HyperLogLog sketch of their clients.
+        routes (SpaceSaving): The sketch of the busiest (origin, destination) routes.
+    """
+
+    def __init__(self, precision=10, routes=100):
+        """
+        The constructor for the PackageSketches class.
+
+        Parameters:
+            precision (int): The precision of the HyperLogLog sketch of the clients of each date, using 2 ** precision
+                bytes per date.
+            routes (int): The number of routes counted by the busiest routes sketch.
+        """
+        # Validate the precision before any sketch is needed
+        self.client_error = HyperLogLog(precision).error
+        self.precision = precision
+        self.clients_by_date = {}
+        self.routes = SpaceSaving(routes)
+
+    def add(self, package):
+        """
+        The method to update the sketches with a package.
+
+        Parameters:
+            package (Package): The package to add.
+        """
+        sketch = self.clients_by_date.get(package.day)
+        if sketch is None:
+            sketch = self.clients_by_date[package.day] = HyperLogLog(self.precision)
+        sketch.add(package.client.name)
+        self.routes.add((package.origin, package.destination))
+
+    def get_distinct_clients(self, start_ordinal, end_ordinal):
+        """
+        The method to estimate the number of distinct clients with packages between two dates, both included.
+
+        Parameters:
+            start_ordinal (int): The ordinal of the first date.
+            end_ordinal (int): The ordinal of the last date.
+
+        Returns:
+            int: The estimated number of distinct clients.
+        """
+        # Merge the sketches of the dates in the interval
+        merged = HyperLogLog(self.precision)
+        for ordinal, sketch in list(self.clients_by_date.items()):
+            if start_ordinal <= ordinal <= end_ordinal:
+                merged.update(sketch)
+        return merged.estimate()
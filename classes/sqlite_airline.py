@@ -0,0 +1,578 @@
+import sqlite3
+import time
+
+from classes.client import Client
+from classes.fee_schedule import FeeSchedule
+from classes.package import Package
+from utils import date_min_validation, date_format_validation, date_range_validation, DATE_MIN_ORDINAL, \
+    AIRLINE_NAME_VALIDATION_MSG, int_fee_validation, CLIENT_NOT_EXIST_VALIDATION_MSG, ordinal_to_date, \
+    TRANSPORTATION_REPORT_FORMAT, DATE_RANGE_VALIDATION_MSG, dates_to_ordinals, today_ordinal, date_to_ordinal, \
+    date_interval_range_validation, iter_json_records, JSON_RECORD_VALIDATION_MSG
+
+
+class SQLiteAirline:
+    """
+    The SQLiteAirline class represents an airline whose clients, packages, and transportation fees are kept in SQLite.
+
+    It has the same API as the in-memory Airline class, but packages live in an SQLite file indexed by date and client,
+    so datasets larger than the available memory can be used. Reports count the packages of each date with GROUP BY
+    queries over the date, client, and route indexes. Writes are batched in transactions that are committed
+    every batch_size writes, when commit is called, and when the airline is closed.
+
+    Attributes:
+        name (str): The name of the airline.
+        path (str): The path of the SQLite database.
+        batch_size (int): The number of writes per transaction.
+        connection (sqlite3.Connection): The connection to the SQLite database.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS clients (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        );
+        CREATE TABLE IF NOT EXISTS packages (
+            id INTEGER PRIMARY KEY,
+            origin TEXT NOT NULL,
+            destination TEXT NOT NULL,
+            client_id INTEGER NOT NULL REFERENCES clients (id),
+            day INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_packages_day ON packages (day);
+        CREATE INDEX IF NOT EXISTS idx_packages_client ON packages (client_id, day);
+        CREATE INDEX IF NOT EXISTS idx_packages_route ON packages (origin, destination, day);
+        CREATE TABLE IF NOT EXISTS fees (
+            day INTEGER PRIMARY KEY,
+            fee INTEGER NOT NULL
+        );
+    """
+
+    def __init__(self, name, path=":memory:", batch_size=10000):
+        """
+        The constructor for the SQLiteAirline class.
+
+        Parameters:
+            name (str): The name of the airline.
+            path (str): The path of the SQLite database, in memory if not given.
+            batch_size (int): The number of writes per transaction.
+        """
+        # Validate that the airline name is at least 3 characters long
+        if len(name) < 3:
+            raise ValueError(AIRLINE_NAME_VALIDATION_MSG)
+        self.name = name
+        self.path = path
+        self.batch_size = batch_size
+        # Open the database, create the schema, and add the default fee if the database is new
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(self.SCHEMA)
+        self.connection.execute("INSERT OR IGNORE INTO fees (day, fee) VALUES (?, ?)", (DATE_MIN_ORDINAL, 10))
+        self.connection.commit()
+        self._pending_writes = 0
+        # Cache the clients, which are few compared to the packages
+        self._clients = {}
+        self._client_ids = {}
+        for client_id, client_name in self.connection.execute("SELECT id, name FROM clients"):
+            self._clients[client_name] = Client(client_name)
+            self._client_ids[client_name] = client_id
+
+    def __str__(self):
+        """
+        The method to get the string representation of the airline.
+
+        Returns:
+            str: The string representation of the airline.
+        """
+        # Return the name of the airline
+        return f"{self.name}"
+
+    def __repr__(self):
+        """
+        The method to get the string representation of the airline for debugging.
+
+        Returns:
+            str: The string representation of the airline for debugging.
+        """
+        # Return the name of the airline
+        return f"{self.name}"
+
+    def __enter__(self):
+        """
+        The method to use the airline as a context manager.
+
+        Returns:
+            SQLiteAirline: The airline itself.
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        The method to leave the context manager, committing the pending packages and closing the connection.
+
+        Parameters:
+            exc_type (type): The type of the exception raised in the context, or None.
+            exc_value (BaseException): The exception raised in the context, or None.
+            traceback (traceback): The traceback of the exception, or None.
+        """
+        self.close()
+
+    @property
+    def clients(self):
+        """
+        The method to get the clients of the airline.
+
+        Returns:
+            list: The clients of the airline.
+        """
+        return list(self._clients.values())
+
+    @property
+    def packages(self):
+        """
+        The method to get the packages handled by the airline, loading them all from the database.
+
+        Returns:
+            list: The packages handled by the airline.
+        """
+        rows = self.connection.execute("SELECT origin, destination, name, day FROM packages "
+                                       "JOIN clients ON clients.id = client_id ORDER BY packages.id")
+        return [Package(origin, destination, self._clients[name], ordinal_to_date(day))
+                for origin, destination, name, day in rows]
+
+    def _write(self, sql, parameters):
+        """
+        The method to run a write statement, committing the transaction every batch_size writes.
+
+        Parameters:
+            sql (str): The statement.
+            parameters (tuple): The parameters of the statement.
+
+        Returns:
+            sqlite3.Cursor: The cursor of the statement.
+        """
+        cursor = self.connection.execute(sql, parameters)
+        self._pending_writes += 1
+        if self._pending_writes >= self.batch_size:
+            self.commit()
+        return cursor
+
+    def commit(self):
+        """
+        The method to commit the pending writes.
+        """
+        self.connection.commit()
+        self._pending_writes = 0
+
+    def close(self):
+        """
+        The method to commit the pending writes and close the database.
+        """
+        if self.connection is not None:
+            self.commit()
+            self.connection.close()
+            self.connection = None
+
+    def get_client(self, name):
+        """
+        The method to get a client by name.
+
+        Parameters:
+            name (str): The name of the client.
+
+        Returns:
+            Client: The client with the given name.
+
+        Raises:
+            ValueError: If no client with the given name exists.
+        """
+        client = self._clients.get(name)
+        if client is None:
+            raise ValueError(CLIENT_NOT_EXIST_VALIDATION_MSG)
+        return client
+
+    def add_client(self, name):
+        """
+        The method to add a client.
+
+        Parameters:
+            name (str): The name of the client.
+
+        Returns:
+            Client: The added client.
+        """
+        # Return the client if it exists, otherwise create it and insert it
+        client = self._clients.get(name)
+        if client is None:
+            client = Client(name)
+            self._client_ids[name] = self._write("INSERT INTO clients (name) VALUES (?)", (name,)).lastrowid
+            self._clients[name] = client
+        return client
+
+    def add_package(self, origin, destination, client, date):
+        """
+        The method to add a package.
+
+        Parameters:
+            origin (str): The origin of the package.
+            destination (str): The destination of the package.
+            client (Client): The client who owns the package.
+            date (str): The date when the package is added.
+
+        Returns:
+            Package: The added package.
+        """
+        # Validate the package and its date, registering its client if needed
+        package = Package(origin, destination, client, date)
+        day = package.day
+        client_id = self._client_ids.get(client.name)
+        if client_id is None:
+            self.add_client(client.name)
+            client_id = self._client_ids[client.name]
+        # Insert the package
+        self._write("INSERT INTO packages (origin, destination, client_id, day) VALUES (?, ?, ?, ?)",
+                    (package.origin, package.destination, client_id, day))
+        return package
+
+    def add_packages(self, rows):
+        """
+        The method to add a batch of packages with a single multi-row insert.
+
+        The whole batch is validated first, and only the valid packages are added; every invalid row is reported
+        instead of stopping at the first one.
+
+        Parameters:
+            rows (iterable): The (origin, destination, client, date) rows of the packages, where the client is a Client
+                or the name of an existing client and the date is a DD/MM/YYYY string, an ordinal, or None for today.
+
+        Returns:
+            dict: The added packages and the list of (row number, error message) pairs of the rows that failed
+                validation, numbered from 1.
+        """
+        errors = []
+        packages = Package.from_rows(rows, self._clients, errors)
+        self._insert_packages(packages)
+        return {
+            "packages": packages,
+            "errors": errors,
+        }
+
+    def _insert_packages(self, packages):
+        """
+        The method to insert already validated packages with a single multi-row insert and commit them.
+
+        Parameters:
+            packages (list): The packages to insert.
+        """
+        # Register the clients given as new Client objects, then insert the packages
+        for package in packages:
+            if package.client.name not in self._client_ids:
+                self.add_client(package.client.name)
+        self.connection.executemany(
+            "INSERT INTO packages (origin, destination, client_id, day) VALUES (?, ?, ?, ?)",
+            ((package.origin, package.destination, self._client_ids[package.client.name], package.day)
+             for package in packages))
+        self.commit()
+
+    def load_packages(self, path, key=None, batch_size=10000):
+        """
+        The method to bulk load packages from a JSON array or newline-delimited JSON file.
+
+        The file is streamed and each batch is inserted with a single multi-row insert, with the same records and error
+        reporting as the in-memory Airline class.
+
+        Parameters:
+            path (str): The path of the file to load.
+            key (str): An optional key under which the records are nested, as in the fixtures file.
+            batch_size (int): The number of records to validate and insert at a time.
+
+        Returns:
+            dict: The load statistics, with the number of packages loaded, the list of (record number, error message)
+                pairs for the records that failed validation, the elapsed seconds and the packages loaded per second.
+        """
+        started = time.perf_counter()
+        loaded = 0
+        errors = []
+        batch = []
+        # Stream the records and load them in batches
+        with open(path, "r", encoding="utf-8") as f:
+            for record in iter_json_records(f, key):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    loaded += self._load_package_batch(batch, loaded + len(errors), errors)
+                    batch = []
+        if batch:
+            loaded += self._load_package_batch(batch, loaded + len(errors), errors)
+        # Return the load statistics
+        seconds = time.perf_counter() - started
+        return {
+            "packages": loaded,
+            "errors": errors,
+            "seconds": seconds,
+            "packages_per_second": loaded / seconds if seconds else 0.0,
+        }
+
+    def _load_package_batch(self, batch, offset, errors):
+        """
+        The method to validate a batch of package records and insert the valid ones.
+
+        Parameters:
+            batch (list): The package records.
+            offset (int): The number of records read before the batch.
+            errors (list): The list where the (record number, error message) pairs of invalid records are appended.
+
+        Returns:
+            int: The number of packages inserted.
+        """
+        # Read the fields of each record, creating the new clients without inserting them yet
+        rows = []
+        new_clients = {}
+        first_error = len(errors)
+        for number, record in enumerate(batch, offset + 1):
+            # A line that isn't valid JSON is read as its decoding error
+            if isinstance(record, ValueError):
+                errors.append((number, f"{JSON_RECORD_VALIDATION_MSG}: {record}"))
+                rows.append(None)
+                continue
+            try:
+                name = record["client_str"]
+                client = self._clients.get(name) or new_clients.get(name)
+                if client is None:
+                    client = new_clients[name] = Client(name)
+                rows.append((record["origin"], record["destination"], client, record.get("date")))
+            except KeyError as e:
+                errors.append((number, f"Missing field {e}"))
+                rows.append(None)
+            except (TypeError, AttributeError, ValueError) as e:
+                errors.append((number, str(e)))
+                rows.append(None)
+        # Validate the whole batch, keeping the errors of the batch in record order, then insert the valid packages
+        packages = Package.from_rows(rows, self._clients, errors, offset)
+        errors[first_error:] = sorted(errors[first_error:])
+        self._insert_packages(packages)
+        return len(packages)
+
+    def get_packages(self, date):
+        """
+        The method to get the packages handled on a given date.
+
+        Parameters:
+            date (str): The date for which to get the packages.
+
+        Returns:
+            list: The packages handled on the given date.
+        """
+        # A date that can't be parsed has no packages
+        try:
+            day = date_to_ordinal(date)
+        except ValueError:
+            return []
+        rows = self.connection.execute(
+            "SELECT origin, destination, name FROM packages JOIN clients ON clients.id = client_id WHERE day = ? "
+            "ORDER BY packages.id", (day,))
+        return [Package(origin, destination, self._clients[name], day) for origin, destination, name in rows]
+
+    def add_transportation_fee(self, date, fee):
+        """
+        The method to add a transportation fee.
+
+        Parameters:
+            date (str): The date when the fee is added.
+            fee (int): The fee to be added.
+        """
+        # Validate the date and the fee
+        date_format_validation(date)
+        day = date_min_validation(date)
+        int_fee_validation(fee)
+        # Insert or replace the fee of the date
+        self._write("INSERT OR REPLACE INTO fees (day, fee) VALUES (?, ?)", (day, int(fee)))
+
+    def get_transportation_fee(self, date):
+        """
+        The method to get the transportation fee for a given date.
+
+        Parameters:
+            date (str): The date for which to get the fee.
+
+        Returns:
+            int: The fee for the given date.
+        """
+        # Validate the date
+        date_format_validation(date)
+        day = date_range_validation(date)
+        # Return the fee for the latest date that is not later than the given date
+        return self.connection.execute("SELECT fee FROM fees WHERE day <= ? ORDER BY day DESC LIMIT 1",
+                                       (day,)).fetchone()[0]
+
+    def get_transportation_fees(self, dates):
+        """
+        The method to get the transportation fee for each of many dates at once, as when re-pricing packages.
+
+        The fee table is read once, in order, and the dates are looked up in it in a single pass.
+
+        Parameters:
+            dates (iterable): The dates for which to get the fees.
+
+        Returns:
+            array: The fees for the given dates, in the same order, as an array of 64-bit integers.
+
+        Raises:
+            ValueError: If a date is not in DD/MM/YYYY format or is out of range.
+        """
+        # Validate the dates, checking the range of the batch only once
+        ordinals = dates_to_ordinals(dates)
+        if ordinals and (min(ordinals) < DATE_MIN_ORDINAL or max(ordinals) > today_ordinal()):
+            raise ValueError(DATE_RANGE_VALIDATION_MSG)
+        # Look every date up in the fee schedule
+        return self._get_fee_schedule().get_fees_by_ordinal(ordinals)
+
+    def _get_fee_schedule(self, start_ordinal=DATE_MIN_ORDINAL, end_ordinal=None):
+        """
+        The method to load the fee changes into a schedule, reading the fee table once, in order.
+
+        Parameters:
+            start_ordinal (int): The ordinal of the first date the schedule must cover.
+            end_ordinal (int): The ordinal of the last date the schedule must cover, or None for every later date.
+
+        Returns:
+            FeeSchedule: The fee schedule, holding the fee in effect on the first date and the later changes.
+        """
+        # Only read the fee in effect on the first date and the changes after it, through the primary key
+        schedule = FeeSchedule()
+        for day, fee in self.connection.execute(
+                "SELECT day, fee FROM fees WHERE day >= (SELECT MAX(day) FROM fees WHERE day <= :start) "
+                "AND (:end IS NULL OR day <= :end) ORDER BY day", {"start": start_ordinal, "end": end_ordinal}):
+            schedule.set_fee_by_ordinal(day, fee)
+        return schedule
+
+    def get_total_transportation_report(self, date):
+        """
+        The method to get the total transportation report for a given date.
+
+        Parameters:
+            date (str): The date for which to get the report.
+
+        Returns:
+            str: The report for the given date.
+        """
+        # Validate the date
+        date_format_validation(date)
+        day = date_range_validation(date)
+        # Count the packages of the date through its index, along with the fee in effect
+        total, transportation_fee = self.connection.execute(
+            "SELECT COUNT(*), (SELECT fee FROM fees WHERE day <= :day ORDER BY day DESC LIMIT 1) "
+            "FROM packages WHERE day = :day", {"day": day}).fetchone()
+        # Return the report
+        return TRANSPORTATION_REPORT_FORMAT.format(date=ordinal_to_date(day), fee=transportation_fee, total=total,
+                                                   charged=total * transportation_fee)
+
+    def get_transportation_report_range(self, start, end):
+        """
+        The method to get the transportation report for every date between two dates, both included.
+
+        The packages of the interval are counted per date with a single GROUP BY query over the date index.
+
+        Parameters:
+            start (str): The first date of the report.
+            end (str): The last date of the report.
+
+        Returns:
+            dict: The report, with the total number of packages transported and the total fee charged in the interval,
+                and a "days" list holding the date, fee, number of packages and fee charged for each date.
+        """
+        # Validate the dates and the interval
+        start_ordinal, end_ordinal = date_interval_range_validation(start, end)
+        # Count the packages of each date of the interval through the date index
+        counts = dict(self.connection.execute(
+            "SELECT day, COUNT(*) FROM packages WHERE day BETWEEN ? AND ? GROUP BY day", (start_ordinal, end_ordinal)))
+        # Build the breakdown of each date in the interval, charging each date with its fee
+        schedule = self._get_fee_schedule(start_ordinal, end_ordinal)
+        days = []
+        packages = revenue = 0
+        for ordinal in range(start_ordinal, end_ordinal + 1):
+            total = counts.get(ordinal, 0)
+            transportation_fee = schedule.get_fee_by_ordinal(ordinal)
+            days.append({
+                "date": ordinal_to_date(ordinal),
+                "fee": transportation_fee,
+                "packages": total,
+                "revenue": total * transportation_fee,
+            })
+            packages += total
+            revenue += total * transportation_fee
+        # Return the report
+        return {
+            "start": start,
+            "end": end,
+            "packages": packages,
+            "revenue": revenue,
+            "days": days,
+        }
+
+    def _get_aggregate_report(self, condition, parameters, start, end):
+        """
+        The method to total the packages and fees charged of the packages matching a condition over a date interval.
+
+        Parameters:
+            condition (str): The SQL condition the packages must match, which an index on its columns and the date
+                should cover.
+            parameters (tuple): The parameters of the condition.
+            start (str): The first date of the interval.
+            end (str): The last date of the interval.
+
+        Returns:
+            dict: The report, with the interval, the total number of packages and the total fee charged.
+        """
+        # Validate the dates and the interval
+        start_ordinal, end_ordinal = date_interval_range_validation(start, end)
+        # Count the matching packages of each date of the interval, charging each date with its fee
+        schedule = self._get_fee_schedule(start_ordinal, end_ordinal)
+        total = revenue = 0
+        for day, count in self.connection.execute(
+                f"SELECT day, COUNT(*) FROM packages WHERE {condition} AND day BETWEEN ? AND ? GROUP BY day",
+                (*parameters, start_ordinal, end_ordinal)):
+            total += count
+            revenue += count * schedule.get_fee_by_ordinal(day)
+        return {
+            "start": start,
+            "end": end,
+            "packages": total,
+            "revenue": revenue,
+        }
+
+    def get_client_report(self, name, start, end):
+        """
+        The method to get the packages and fees charged of a client between two dates, both included.
+
+        Only the dates the client has packages on are read, through the client index.
+
+        Parameters:
+            name (str): The name of the client.
+            start (str): The first date of the report.
+            end (str): The last date of the report.
+
+        Returns:
+            dict: The report, with the client, the interval, the total number of packages and the total fee charged.
+
+        Raises:
+            ValueError: If no client with the given name exists.
+        """
+        client = self.get_client(name)
+        report = self._get_aggregate_report("client_id = ?", (self._client_ids[client.name],), start, end)
+        return {"client": client.name, **report}
+
+    def get_route_report(self, origin, destination, start, end):
+        """
+        The method to get the packages and fees charged on a route between two dates, both included.
+
+        Only the dates with packages on the route are read, through the route index.
+
+        Parameters:
+            origin (str): The origin of the route.
+            destination (str): The destination of the route.
+            start (str): The first date of the report.
+            end (str): The last date of the report.
+
+        Returns:
+            dict: The report, with the route, the interval, the total number of packages and the total fee charged.
+        """
+        report = self._get_aggregate_report("origin = ? AND destination = ?", (origin, destination), start, end)
+        return {"origin": origin, "destination": destination, **report}
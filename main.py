@@ -1,7 +1,7 @@
-import json
-import unittest
+import sys
 
 from classes import Airline
+from utils import date_to_ordinal, ordinal_to_date, date_interval_validation
 
 
 def populate_system(airline):
@@ -10,16 +10,12 @@ def populate_system(airline):
 
     Parameters:
         airline (Airline): The airline system to populate.
-    """
-    # Open and read the JSON file
-    with open("tests/fixtures/packages.json", "r") as f:
-        packages_data = json.load(f)[0]["demo_packages"]
 
-    # Loop through the data and add each package to the system
-    for package_data in packages_data:
-        client = airline.add_client(package_data["client_str"])
-        airline.add_package(package_data["origin"], package_data["destination"], client,
-                            package_data["date"] if "date" in package_data else None)
+    Returns:
+        dict: The load statistics.
+    """
+    # Stream the demo packages from the JSON file into the system
+    return airline.load_packages("tests/fixtures/packages.json", key="demo_packages")
 
 
 def add_transportation_fee(airline):
@@ -64,10 +60,134 @@ def add_package(airline):
         f"Package from {package.origin} to {package.destination} for client {package.client.name} on date {package.date} added.")
 
 
-def main():
+def load_fees(airline, path):
+    """
+    Add the transportation fees of a file to the airline system.
+
+    CSV files must have "date" and "fee" columns; any other file is read as a JSON object mapping dates to fees.
+
+    Parameters:
+        airline (Airline): The airline system to add the fees to.
+        path (str): The path of the fees file.
+
+    Returns:
+        int: The number of fees added.
+    """
+    # The csv and json modules are imported on first use, so the interactive menu starts without them
+    import csv
+    import json
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            fees = [(row["date"], row["fee"]) for row in csv.DictReader(f)]
+        else:
+            fees = list(json.load(f).items())
+    for date, fee in fees:
+        airline.add_transportation_fee(date, fee)
+    return len(fees)
+
+
+def get_report_dates(args):
+    """
+    Get the dates to report on from the command line arguments.
+
+    Parameters:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        list: The dates to report on.
+    """
+    dates = list(args.dates or [])
+    if args.dates_file:
+        with open(args.dates_file, "r", encoding="utf-8") as f:
+            dates.extend(line.strip() for line in f if line.strip())
+    if args.start or args.end:
+        date_interval_validation(args.start, args.end)
+        dates.extend(ordinal_to_date(ordinal) for ordinal in
+                     range(date_to_ordinal(args.start), date_to_ordinal(args.end) + 1))
+    return dates
+
+
+def run_report(args):
+    """
+    Load data files and fee files into a new airline system and write its reports for many dates at once.
+
+    Parameters:
+        args (argparse.Namespace): The parsed arguments.
+    """
+    import csv
+    import json
+
+    airline = Airline(args.airline)
+    for path in args.packages:
+        stats = airline.load_packages(path, key=args.key)
+        for number, message in stats["errors"]:
+            print(f"{path}: record {number}: {message}", file=sys.stderr)
+    for path in args.fees:
+        load_fees(airline, path)
+    # Reuse the range report of each date, which shares the indexes of the loaded airline
+    rows = [airline.get_transportation_report_range(date, date)["days"][0] for date in get_report_dates(args)]
+    output = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(rows, output, ensure_ascii=False, indent=2)
+            output.write("\n")
+        else:
+            writer = csv.DictWriter(output, fieldnames=["date", "fee", "packages", "revenue"])
+            writer.writeheader()
+            writer.writerows(rows)
+    finally:
+        if args.output:
+            output.close()
+
+
+def parse_args(argv):
+    """
+    Parse the command line arguments.
+
+    Parameters:
+        argv (list): The command line arguments, without the program name.
+
+    Returns:
+        argparse.Namespace: The parsed arguments; its command is None when the interactive menu should run.
+    """
+    # argparse is imported here, as it makes up half of the import time of this module
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Airline KiuSys-Challenge. Without a command, runs the interactive menu.")
+    subparsers = parser.add_subparsers(dest="command")
+    report = subparsers.add_parser("report", help="load data and fee files and write reports for many dates")
+    report.add_argument("--airline", default="Airline KiuSys-Challenge", help="name of the airline")
+    report.add_argument("--packages", nargs="*", default=[], help="JSON array or newline-delimited JSON package files")
+    report.add_argument("--key", help="key under which the package records are nested, e.g. demo_packages")
+    report.add_argument("--fees", nargs="*", default=[], help="CSV (date,fee) or JSON ({date: fee}) fee files")
+    report.add_argument("--dates", nargs="*", help="dates to report on (dd/mm/yyyy)")
+    report.add_argument("--dates-file", help="file with one date to report on per line")
+    report.add_argument("--from", dest="start", help="first date of a range to report on (dd/mm/yyyy)")
+    report.add_argument("--to", dest="end", help="last date of a range to report on (dd/mm/yyyy)")
+    report.add_argument("--format", choices=["csv", "json"], default="csv", help="output format")
+    report.add_argument("--output", help="output file, standard output if not given")
+    args = parser.parse_args(argv)
+    if args.command == "report" and bool(args.start) != bool(args.end):
+        report.error("--from and --to must be given together")
+    return args
+
+
+def main(argv=None):
     """
     Main function to run the airline system.
+
+    Parameters:
+        argv (list): The command line arguments, without the program name; sys.argv is used if not given.
     """
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    if args.command == "report":
+        try:
+            run_report(args)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Error: {e}")
+        return
+
     airline = Airline("Airline KiuSys-Challenge")
 
     # Loop to keep the system running until the user chooses to exit
@@ -87,8 +207,9 @@ def main():
             print("Thank you for using our system! Bye.")
             break
         elif option == "1":
-            populate_system(airline)
-            print("System populated with default data.")
+            stats = populate_system(airline)
+            print(f"System populated with default data ({stats['packages']} packages, "
+                  f"{stats['packages_per_second']:.0f} packages/sec).")
         elif option == "2":
             try:
                 add_transportation_fee(airline)
@@ -122,7 +243,9 @@ def main():
                     print("Invalid input. Exiting system.")
                     break
         elif option == "6":
-            # Discover and run the tests
+            # Discover and run the tests, importing unittest only when they are asked for
+            import unittest
+
             loader = unittest.TestLoader()
             start_dir = 'tests'
             suite = loader.discover(start_dir)
@@ -0,0 +1,2 @@
+from .client import AirlineServiceClient
+from .server import AirlineService
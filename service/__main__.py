@@ -0,0 +1,36 @@
+import argparse
+import asyncio
+
+from classes import Airline, AirlineMetrics
+from service import AirlineService
+
+
+def main():
+    """
+    Main function to run the airline service.
+    """
+    parser = argparse.ArgumentParser(description="Serve an in-memory airline over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="host to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--packages", nargs="*", default=[], help="package files to load before serving")
+    parser.add_argument("--key", help="key under which the package records are nested, e.g. demo_packages")
+    parser.add_argument("--metrics", action="store_true", help="record operation metrics and serve them on /metrics")
+    args = parser.parse_args()
+
+    airline = Airline("Airline KiuSys-Challenge")
+    metrics = None
+    if args.metrics:
+        metrics = AirlineMetrics()
+        metrics.instrument(airline)
+    for path in args.packages:
+        airline.load_packages(path, key=args.key)
+    service = AirlineService(airline, args.host, args.port, metrics)
+    print(f"Serving {airline} on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import asyncio
+import json
+from urllib.parse import urlencode
+
+
+class AirlineServiceClient:
+    """
+    The AirlineServiceClient class represents a client of the AirlineService that keeps its connection alive.
+
+    Requests of the same client are sent one at a time; open several clients to send requests concurrently.
+
+    Attributes:
+        host (str): The host of the service.
+        port (int): The port of the service.
+    """
+
+    def __init__(self, host, port):
+        """
+        The constructor for the AirlineServiceClient class.
+
+        Parameters:
+            host (str): The host of the service.
+            port (int): The port of the service.
+        """
+        self.host = host
+        self.port = port
+        self._reader = None
+        self._writer = None
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        """
+        The method to use the client as an asynchronous context manager.
+
+        Returns:
+            AirlineServiceClient: The client itself.
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        The method to leave the asynchronous context manager, closing the connection.
+
+        Parameters:
+            exc_type (type): The type of the exception raised in the context, or None.
+            exc_value (BaseException): The exception raised in the context, or None.
+            traceback (traceback): The traceback of the exception, or None.
+        """
+        await self.close()
+
+    async def request(self, method, path, payload=None):
+        """
+        The method to send a request and read its response.
+
+        Parameters:
+            method (str): The HTTP method.
+            path (str): The path of the route.
+            payload (dict): The query arguments of a GET request or the JSON body of any other request.
+
+        Returns:
+            tuple: The HTTP status code and the JSON payload of the response, or its text if it is not JSON.
+        """
+        async with self._lock:
+            if self._writer is None:
+                self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            body = b""
+            if method == "GET" and payload:
+                path = f"{path}?{urlencode(payload)}"
+            elif payload is not None:
+                body = json.dumps(payload).encode("utf-8")
+            self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                               f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+            await self._writer.drain()
+            # Read the status line, the headers and the body of the response
+            status = int((await self._reader.readline()).split()[1])
+            headers = {}
+            while True:
+                line = await self._reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            data = await self._reader.readexactly(int(headers.get("content-length", 0)))
+            if headers.get("connection", "").lower() == "close":
+                await self.close()
+            if headers.get("content-type", "application/json").startswith("application/json"):
+                return status, json.loads(data)
+            return status, data.decode("utf-8")
+
+    async def get(self, path, **arguments):
+        """
+        The method to send a GET request.
+
+        Returns:
+            tuple: The HTTP status code and the JSON payload of the response.
+        """
+        return await self.request("GET", path, arguments)
+
+    async def post(self, path, **payload):
+        """
+        The method to send a POST request with a JSON body.
+
+        Returns:
+            tuple: The HTTP status code and the JSON payload of the response.
+        """
+        return await self.request("POST", path, payload)
+
+    async def close(self):
+        """
+        The method to close the connection.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._writer = None
+            self._reader = None
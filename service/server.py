@@ -0,0 +1,314 @@
+import asyncio
+import json
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+from utils import date_to_ordinal, ordinal_to_date
+
+
+class AirlineService:
+    """
+    The AirlineService class represents a local HTTP/JSON service sharing one in-memory airline between many clients.
+
+    Every request is handled on the event loop. Reads run synchronously as soon as they arrive, between the requests of
+    other connections, so a slow read, such as a report over a long interval, holds up every other request until it
+    is done. Writes are put in a queue consumed by a single writer task, so the airline is only ever changed by one
+    write at a time and reads never see a write half done.
+
+    Routes:
+        POST /clients {"name"}: Adds a client.
+        POST /packages {"origin", "destination", "client", "date"}: Adds a package for an existing client.
+        POST /fees {"date", "fee"}: Adds a transportation fee.
+        GET /fees?date=: Gets the transportation fee in effect on a date.
+        GET /reports?date=: Gets the transportation report of a date, with its text.
+        GET /reports?start=&end=: Gets the transportation report of every date of an interval.
+        GET /metrics?format=json|prometheus: Gets the operation metrics, if the service has any.
+
+    Attributes:
+        airline (Airline): The airline served.
+        host (str): The host to listen on.
+        port (int): The port to listen on; 0 picks a free port, which is set once the service starts.
+        metrics (AirlineMetrics): The metrics served, or None.
+        max_body_size (int): The largest request body accepted, in bytes.
+    """
+
+    def __init__(self, airline, host="127.0.0.1", port=0, metrics=None, max_body_size=1 << 20):
+        """
+        The constructor for the AirlineService class.
+
+        Parameters:
+            airline (Airline): The airline to serve.
+            host (str): The host to listen on.
+            port (int): The port to listen on; 0 picks a free port.
+            metrics (AirlineMetrics): Optional metrics to serve, usually recorded from the airline.
+            max_body_size (int): The largest request body accepted, in bytes.
+        """
+        self.airline = airline
+        self.host = host
+        self.port = port
+        self.metrics = metrics
+        self.max_body_size = max_body_size
+        self._server = None
+        self._writes = None
+        self._writer_task = None
+        self._routes = {
+            ("POST", "/clients"): self._add_client,
+            ("POST", "/packages"): self._add_package,
+            ("POST", "/fees"): self._add_transportation_fee,
+            ("GET", "/fees"): self._get_transportation_fee,
+            ("GET", "/reports"): self._get_report,
+        }
+        if metrics is not None:
+            self._routes[("GET", "/metrics")] = self._get_metrics
+
+    async def start(self):
+        """
+        The method to start listening and the writer task.
+        """
+        self._writes = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._run_writer())
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """
+        The method to stop listening and the writer task.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+
+    async def serve_forever(self):
+        """
+        The method to start the service and serve until it is cancelled.
+        """
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _run_writer(self):
+        """
+        The method to apply the queued writes one at a time, handing each result or error back to its request.
+        """
+        while True:
+            function, arguments, future = await self._writes.get()
+            try:
+                result = function(*arguments)
+            except Exception as e:
+                if not future.cancelled():
+                    future.set_exception(e)
+            else:
+                if not future.cancelled():
+                    future.set_result(result)
+
+    async def _write(self, function, *arguments):
+        """
+        The method to queue a write for the writer task and wait for its result.
+
+        Parameters:
+            function (callable): The airline method that writes.
+            arguments (tuple): The arguments of the method.
+
+        Returns:
+            object: The result of the method.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((function, arguments, future))
+        return await future
+
+    async def _handle_connection(self, reader, writer):
+        """
+        The method to serve the requests of a connection until the client closes it or asks not to keep it alive.
+
+        A malformed request, such as one with an invalid or oversized Content-Length, gets an error response and
+        closes the connection, whose framing is then unknown.
+
+        Parameters:
+            reader (asyncio.StreamReader): The reader of the connection.
+            writer (asyncio.StreamWriter): The writer of the connection.
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # Answer a malformed request with an error and close the connection, whose framing is now unknown
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                    length = int(headers.get("content-length", 0))
+                    # A negative length can't be read and an oversized one would be buffered whole in memory
+                    if not 0 <= length <= self.max_body_size:
+                        raise ValueError(length)
+                except ValueError:
+                    await self._send(writer, HTTPStatus.BAD_REQUEST, {"error": "Malformed request"}, False)
+                    break
+                body = await reader.readexactly(length)
+                status, payload = await self._dispatch(method, target, body)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer, status, payload, keep_alive):
+        """
+        The method to send a response.
+
+        Parameters:
+            writer (asyncio.StreamWriter): The writer of the connection.
+            status (HTTPStatus): The HTTP status.
+            payload (object): The JSON payload, or the text, of the response.
+            keep_alive (bool): Whether the connection is kept open after the response.
+        """
+        # Text payloads, as the Prometheus metrics, are sent as they are
+        if isinstance(payload, str):
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+            data = payload.encode("utf-8")
+        else:
+            content_type = "application/json"
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+        await writer.drain()
+
+    async def _dispatch(self, method, target, body):
+        """
+        The method to route a request to its handler.
+
+        Parameters:
+            method (str): The HTTP method.
+            target (str): The request target, with its query string.
+            body (bytes): The request body.
+
+        Returns:
+            tuple: The HTTP status and the JSON payload, or the text, of the response.
+        """
+        url = urlsplit(target)
+        handler = self._routes.get((method, url.path))
+        if handler is None:
+            return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {url.path}"}
+        try:
+            if method == "GET":
+                arguments = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            else:
+                arguments = json.loads(body or b"{}")
+            return HTTPStatus.OK, await handler(arguments)
+        except json.JSONDecodeError:
+            return HTTPStatus.BAD_REQUEST, {"error": "Body must be a JSON object"}
+        except KeyError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"Missing field {e}"}
+        except (TypeError, ValueError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+
+    async def _add_client(self, arguments):
+        """
+        The method to add a client.
+
+        Parameters:
+            arguments (dict): The request arguments, with the name of the client.
+
+        Returns:
+            dict: The name of the added client.
+        """
+        client = await self._write(self.airline.add_client, arguments["name"])
+        return {"name": client.name}
+
+    async def _add_package(self, arguments):
+        """
+        The method to add a package for an existing client.
+
+        Parameters:
+            arguments (dict): The request arguments, with the origin, destination, client name, and optional date of the
+                package.
+
+        Returns:
+            dict: The origin, destination, client name, and date of the added package.
+        """
+        # Look the client up in the writer task, so a client added by an earlier queued write is found
+        def add_package(origin, destination, client_name, date):
+            return self.airline.add_package(origin, destination, self.airline.get_client(client_name), date)
+
+        package = await self._write(add_package, arguments["origin"], arguments["destination"], arguments["client"],
+                                    arguments.get("date"))
+        return {"origin": package.origin, "destination": package.destination, "client": package.client.name,
+                "date": package.date}
+
+    async def _add_transportation_fee(self, arguments):
+        """
+        The method to add a transportation fee.
+
+        Parameters:
+            arguments (dict): The request arguments, with the date and the fee.
+
+        Returns:
+            dict: The date and the fee added.
+        """
+        await self._write(self.airline.add_transportation_fee, arguments["date"], arguments["fee"])
+        return {"date": arguments["date"], "fee": int(arguments["fee"])}
+
+    async def _get_transportation_fee(self, arguments):
+        """
+        The method to get the transportation fee in effect on a date.
+
+        Parameters:
+            arguments (dict): The request arguments, with the date.
+
+        Returns:
+            dict: The date and its fee.
+        """
+        return {"date": arguments["date"], "fee": self.airline.get_transportation_fee(arguments["date"])}
+
+    async def _get_report(self, arguments):
+        """
+        The method to get the transportation report of a date or of every date of an interval.
+
+        Parameters:
+            arguments (dict): The request arguments, with either the date or the start and end dates.
+
+        Returns:
+            dict: The fee, packages, revenue, and text of the daily report, or the range report.
+        """
+        if "date" in arguments:
+            # The daily report validates the date and is served from the report cache, while the figures come from
+            # the per-date counter, so neither needs the prefix-sum index of range reports
+            report = self.airline.get_total_transportation_report(arguments["date"])
+            ordinal = date_to_ordinal(arguments["date"])
+            packages = self.airline.package_count_by_date.get(ordinal, 0)
+            fee = self.airline.transportation_fee.get_fee_by_ordinal(ordinal)
+            return {"date": ordinal_to_date(ordinal), "fee": fee, "packages": packages, "revenue": packages * fee,
+                    "report": report}
+        return self.airline.get_transportation_report_range(arguments["start"], arguments["end"])
+
+    async def _get_metrics(self, arguments):
+        """
+        The method to get the operation metrics.
+
+        Parameters:
+            arguments (dict): The request arguments, with the optional format, json or prometheus.
+
+        Returns:
+            object: The metrics as a dictionary, or as Prometheus text.
+        """
+        if arguments.get("format") == "prometheus":
+            return self.metrics.to_prometheus()
+        return self.metrics.to_dict()
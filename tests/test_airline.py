@@ -1,9 +1,13 @@
 import json
+import os
+import tempfile
 import unittest
 from datetime import datetime
 
-from classes import Airline
-from utils import AIRLINE_NAME_VALIDATION_MSG, DATE_FORMAT, PACKAGE_CLIENT_VALIDATION_MSG
+from classes import Airline, PackageSketches
+from utils import AIRLINE_NAME_VALIDATION_MSG, DATE_FORMAT, PACKAGE_CLIENT_VALIDATION_MSG, CLIENT_NOT_EXIST_VALIDATION_MSG, \
+    DATE_INTERVAL_VALIDATION_MSG, PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG, date_to_ordinal, ordinal_to_date, \
+    DATE_RANGE_VALIDATION_MSG, DATE_FORMAT_VALIDATION_MSG, SKETCHES_DISABLED_VALIDATION_MSG, JSON_RECORD_VALIDATION_MSG
 
 
 class TestAirline(unittest.TestCase):
@@ -15,10 +19,28 @@ class TestAirline(unittest.TestCase):
         test_init: Tests the initialization of the Airline class.
         test_init_with_short_name: Tests the initialization of the Airline class with a short name.
         test_add_client: Tests the addition of a client to the Airline class.
+        test_add_existing_client: Tests the addition of an existing client to the Airline class.
+        test_get_client: Tests the retrieval of a client by name in the Airline class.
         test_add_package: Tests the addition of a package to the Airline class.
+        test_add_packages: Tests the addition of a batch of packages with invalid rows to the Airline class.
         test_add_get_transportation_fee: Tests the addition and retrieval of a transportation fee in the Airline class.
+        test_get_transportation_fee_is_chronological: Tests that fee lookups compare dates chronologically in the Airline class.
+        test_get_transportation_fees: Tests the retrieval of the transportation fees of many dates at once in the Airline class.
         test_get_total_transportation_report: Tests the retrieval of the total transportation report in the Airline class.
+        test_report_cache: Tests that daily reports are cached and evicted in the Airline class.
+        test_report_cache_invalidation: Tests that package and fee changes only invalidate the reports they affect.
+        test_transportation_fee_is_read_only: Tests that the fee schedule can't be changed around the report caches.
+        test_get_transportation_report_range: Tests the retrieval of the transportation report over a date interval in the Airline class.
+        test_get_transportation_report_range_with_invalid_interval: Tests the retrieval of a range report whose start is later than its end.
+        test_get_client_report: Tests the retrieval of the report of a client over a date interval.
+        test_get_route_report: Tests the retrieval of the report of a route over a date interval.
+        test_get_distinct_clients_estimate: Tests the estimate of the distinct clients over a date interval.
+        test_get_top_routes: Tests the retrieval of the busiest routes.
+        test_sketches_disabled: Tests the approximate reports of an airline without sketches.
         test_add_package_with_invalid_client: Tests the addition of a package with an invalid client to the Airline class.
+        test_load_packages: Tests the bulk load of packages from the fixtures file in the Airline class.
+        test_load_packages_with_invalid_records: Tests the bulk load of a newline-delimited file with invalid records.
+        test_get_packages: Tests the retrieval of the packages handled on a given date in the Airline class.
     """
 
     def setUp(self):
@@ -64,6 +86,27 @@ class TestAirline(unittest.TestCase):
         self.assertEqual(client.name, client_name)
         self.assertIn(client, self.airline.clients)
 
+    def test_add_existing_client(self):
+        """
+        The method to test the addition of an existing client to the Airline class.
+        """
+        # Add an existing client again and assert that the same client is returned and not duplicated
+        client = self.airline.clients[0]
+        self.assertIs(self.airline.add_client(client.name), client)
+        self.assertEqual(len(self.airline.clients), 3)
+        self.assertEqual(len(self.airline.clients_by_name), 3)
+
+    def test_get_client(self):
+        """
+        The method to test the retrieval of a client by name in the Airline class.
+        """
+        # Assert that an existing client is found and that a missing one raises a ValueError
+        client = self.airline.clients[1]
+        self.assertIs(self.airline.get_client(client.name), client)
+        with self.assertRaises(ValueError) as context:
+            self.airline.get_client("Missing Client")
+        self.assertTrue(CLIENT_NOT_EXIST_VALIDATION_MSG in str(context.exception))
+
     def test_add_package(self):
         """
         The method to test the addition of a package to the Airline class.
@@ -78,6 +121,34 @@ class TestAirline(unittest.TestCase):
         self.assertEqual(package.client, client)
         self.assertIn(package, self.airline.packages)
 
+    def test_add_packages(self):
+        """
+        The method to test the addition of a batch of packages with invalid rows to the Airline class.
+        """
+        # Add a batch mixing valid rows with every kind of invalid row
+        client = self.airline.clients[0]
+        rows = [
+            ("Origin", "Destination", client, "01/01/2024"),
+            ("Origin", "Origin", client, "01/01/2024"),
+            ("Origin", "Destination", client.name, None),
+            ("Origin", "Destination", "Missing Client", "01/01/2024"),
+            ("Origin", "Destination", client, "2024-01-01"),
+            ("Origin", "Destination", client, date_to_ordinal("02/01/2024")),
+            ("Origin", "Destination"),
+            ("Origin", "Destination", client, "2024-01-01"),
+        ]
+        result = self.airline.add_packages(rows)
+        # Assert that the valid rows were added as with add_package and that every invalid row was reported
+        self.assertEqual([(package.client, package.date) for package in result["packages"]],
+                         [(client, "01/01/2024"), (client, datetime.now().strftime(DATE_FORMAT)),
+                          (client, "02/01/2024")])
+        self.assertEqual(self.airline.packages[-3:], result["packages"])
+        self.assertEqual(self.airline.package_count_by_date[date_to_ordinal("01/01/2024")], 1)
+        self.assertEqual([number for number, message in result["errors"]], [2, 4, 5, 7, 8])
+        self.assertEqual([message for number, message in result["errors"]][:3],
+                         [PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG, CLIENT_NOT_EXIST_VALIDATION_MSG,
+                          DATE_FORMAT_VALIDATION_MSG])
+
     def test_add_get_transportation_fee(self):
         """
         The method to test the addition and retrieval of a transportation fee in the Airline class.
@@ -89,6 +160,35 @@ class TestAirline(unittest.TestCase):
         returned_fee = self.airline.get_transportation_fee(date)
         self.assertEqual(returned_fee, fee)
 
+    def test_get_transportation_fee_is_chronological(self):
+        """
+        The method to test that fee lookups compare dates chronologically in the Airline class.
+        """
+        # Add fees whose DD/MM/YYYY strings sort differently than their dates and assert that the latest one applies
+        self.airline.add_transportation_fee("31/12/2023", 20)
+        self.airline.add_transportation_fee("01/01/2024", 30)
+        self.assertEqual(self.airline.get_transportation_fee("31/12/2023"), 20)
+        self.assertEqual(self.airline.get_transportation_fee("02/01/2024"), 30)
+        self.assertEqual(self.airline.get_transportation_fee("15/05/2023"), 10)
+
+    def test_get_transportation_fees(self):
+        """
+        The method to test the retrieval of the transportation fees of many dates at once in the Airline class.
+        """
+        # Add fees and assert that each date gets the same fee as a single lookup
+        self.airline.add_transportation_fee("31/12/2023", 20)
+        self.airline.add_transportation_fee("01/01/2024", 30)
+        dates = ["31/12/2023", "15/05/2023", "02/01/2024", "31/12/2023"]
+        self.assertEqual(list(self.airline.get_transportation_fees(dates)),
+                         [self.airline.get_transportation_fee(date) for date in dates])
+        # Assert that an invalid date anywhere in the batch raises a ValueError
+        with self.assertRaises(ValueError) as context:
+            self.airline.get_transportation_fees(["01/01/2024", "01/01/1969"])
+        self.assertTrue(DATE_RANGE_VALIDATION_MSG in str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            self.airline.get_transportation_fees(["01/01/2024", "2024-01-01"])
+        self.assertTrue(DATE_FORMAT_VALIDATION_MSG in str(context.exception))
+
     def test_get_total_transportation_report(self):
         """
         The method to test the retrieval of the total transportation report in the Airline class.
@@ -104,6 +204,186 @@ class TestAirline(unittest.TestCase):
         expected_report = f"[DATE: {default_date} | FEE: 20]\nTotal packages transported: 3\nTotal transportation fee charged: 60"
         self.assertEqual(report, expected_report)
 
+    def test_report_cache(self):
+        """
+        The method to test that daily reports are cached and evicted in the Airline class.
+        """
+        # Get reports from an airline with a small cache and assert that only the most recently used ones are kept
+        airline = Airline("Airline Name", report_cache_size=2)
+        report = airline.get_total_transportation_report("01/01/2024")
+        self.assertIs(airline.get_total_transportation_report("01/01/2024"), report)
+        airline.get_total_transportation_report("02/01/2024")
+        airline.get_total_transportation_report("01/01/2024")
+        airline.get_total_transportation_report("03/01/2024")
+        self.assertEqual(list(map(ordinal_to_date, airline._report_cache)), ["01/01/2024", "03/01/2024"])
+        # Assert that a cache size of 0 disables the cache
+        airline = Airline("Airline Name", report_cache_size=0)
+        airline.get_total_transportation_report("01/01/2024")
+        self.assertEqual(len(airline._report_cache), 0)
+
+    def test_report_cache_invalidation(self):
+        """
+        The method to test that package and fee changes only invalidate the reports they affect.
+        """
+        # Cache the reports of a few dates around two fee changes
+        dates = ["30/12/2023", "31/12/2023", "01/01/2024", "02/01/2024", "03/01/2024"]
+        self.airline.add_transportation_fee("03/01/2024", 30)
+        for date in dates:
+            self.airline.get_total_transportation_report(date)
+        # Assert that a package only invalidates the report of its date
+        self.airline.add_package("Origin", "Destination", self.airline.clients[0], "01/01/2024")
+        self.assertEqual(list(map(ordinal_to_date, self.airline._report_cache)), ["30/12/2023", "31/12/2023", "02/01/2024", "03/01/2024"])
+        self.assertIn("Total packages transported: 1\n", self.airline.get_total_transportation_report("01/01/2024"))
+        # Assert that a fee only invalidates the reports from its date up to the next fee change
+        self.airline.add_transportation_fee("31/12/2023", 20)
+        self.assertEqual(list(map(ordinal_to_date, self.airline._report_cache)), ["30/12/2023", "03/01/2024"])
+        self.assertEqual(self.airline.get_total_transportation_report("02/01/2024"),
+                         "[DATE: 02/01/2024 | FEE: 20]\nTotal packages transported: 0\nTotal transportation fee charged: 0")
+
+    def test_transportation_fee_is_read_only(self):
+        """
+        The method to test that the fee schedule can't be changed around the report caches.
+        """
+        # Cache a daily report and the range report index
+        report = self.airline.get_total_transportation_report("01/01/2024")
+        range_report = self.airline.get_transportation_report_range("31/12/2023", "02/01/2024")
+        # Assert that the schedule can't be written or replaced directly, and that its lists are copies
+        schedule = self.airline.transportation_fee
+        with self.assertRaises(TypeError):
+            schedule["01/01/2024"] = 5
+        with self.assertRaises(AttributeError):
+            schedule.set_fee_by_ordinal(date_to_ordinal("01/01/2024"), 5)
+        with self.assertRaises(AttributeError):
+            self.airline.transportation_fee = {"01/01/2024": 5}
+        schedule.fees.append(5)
+        schedule.ordinals.append(date_to_ordinal("01/01/2024"))
+        # Assert that no report went stale, and that the view reflects the fees added through the airline
+        self.assertEqual(self.airline.get_total_transportation_report("01/01/2024"), report)
+        self.assertEqual(self.airline.get_transportation_report_range("31/12/2023", "02/01/2024"), range_report)
+        self.airline.add_transportation_fee("01/01/2024", 5)
+        self.assertEqual(schedule["01/01/2024"], 5)
+        self.assertIn("FEE: 5]", self.airline.get_total_transportation_report("01/01/2024"))
+
+    def test_get_transportation_report_range(self):
+        """
+        The method to test the retrieval of the transportation report over a date interval in the Airline class.
+        """
+        # Add packages and fees over a few days and assert that the totals and the breakdown are as expected
+        client = self.airline.clients[0]
+        for date in ("30/12/2023", "31/12/2023", "31/12/2023", "02/01/2024", "05/01/2024"):
+            self.airline.add_package("Origin", "Destination", client, date)
+        self.airline.add_transportation_fee("31/12/2023", 20)
+        self.airline.add_transportation_fee("02/01/2024", 30)
+        report = self.airline.get_transportation_report_range("30/12/2023", "02/01/2024")
+        self.assertEqual(report["packages"], 4)
+        self.assertEqual(report["revenue"], 10 + 2 * 20 + 30)
+        self.assertEqual(report["days"], [
+            {"date": "30/12/2023", "fee": 10, "packages": 1, "revenue": 10},
+            {"date": "31/12/2023", "fee": 20, "packages": 2, "revenue": 40},
+            {"date": "01/01/2024", "fee": 20, "packages": 0, "revenue": 0},
+            {"date": "02/01/2024", "fee": 30, "packages": 1, "revenue": 30},
+        ])
+        # Assert that the totals follow new packages and fees
+        self.airline.add_package("Origin", "Destination", client, "01/01/2024")
+        self.airline.add_transportation_fee("30/12/2023", 15)
+        report = self.airline.get_transportation_report_range("30/12/2023", "02/01/2024")
+        self.assertEqual(report["packages"], 5)
+        self.assertEqual(report["revenue"], 15 + 3 * 20 + 30)
+
+    def test_get_transportation_report_range_with_invalid_interval(self):
+        """
+        The method to test the retrieval of a range report whose start is later than its end.
+        """
+        # Assert that a range report whose start is later than its end raises a ValueError
+        with self.assertRaises(ValueError) as context:
+            self.airline.get_transportation_report_range("02/01/2024", "01/01/2024")
+        self.assertTrue(DATE_INTERVAL_VALIDATION_MSG in str(context.exception))
+
+    def test_get_client_report(self):
+        """
+        The method to test the retrieval of the report of a client over a date interval.
+        """
+        # Add packages of two clients around a fee change and assert that each client only counts its own
+        client, other_client = self.airline.clients[:2]
+        for date in ("30/12/2023", "31/12/2023", "01/01/2024", "05/01/2024"):
+            self.airline.add_package("Origin", "Destination", client, date)
+        self.airline.add_package("Origin", "Destination", other_client, "31/12/2023")
+        self.airline.add_transportation_fee("01/01/2024", 20)
+        self.assertEqual(self.airline.get_client_report(client.name, "31/12/2023", "02/01/2024"),
+                         {"client": client.name, "start": "31/12/2023", "end": "02/01/2024", "packages": 2,
+                          "revenue": 30})
+        self.assertEqual(self.airline.get_client_report(other_client.name, "31/12/2023", "02/01/2024")["packages"], 1)
+        with self.assertRaises(ValueError) as context:
+            self.airline.get_client_report("Missing Client", "31/12/2023", "02/01/2024")
+        self.assertTrue(CLIENT_NOT_EXIST_VALIDATION_MSG in str(context.exception))
+
+    def test_get_route_report(self):
+        """
+        The method to test the retrieval of the report of a route over a date interval.
+        """
+        # Add packages on a route and its way back and assert that each direction is reported on its own
+        client = self.airline.clients[0]
+        for date in ("31/12/2023", "01/01/2024", "01/01/2024"):
+            self.airline.add_package("Origin", "Destination", client, date)
+        self.airline.add_package("Destination", "Origin", client, "01/01/2024")
+        self.airline.add_transportation_fee("01/01/2024", 20)
+        self.assertEqual(self.airline.get_route_report("Origin", "Destination", "01/01/2024", "01/01/2024"),
+                         {"origin": "Origin", "destination": "Destination", "start": "01/01/2024",
+                          "end": "01/01/2024", "packages": 2, "revenue": 40})
+        self.assertEqual(self.airline.get_route_report("Destination", "Origin", "31/12/2023", "01/01/2024")["packages"], 1)
+        self.assertEqual(self.airline.get_route_report("Origin", "Nowhere", "31/12/2023", "01/01/2024")["packages"], 0)
+
+    def test_get_distinct_clients_estimate(self):
+        """
+        The method to test the estimate of the distinct clients over a date interval.
+        """
+        # Add packages of a few clients, some of them on both dates, to an airline with sketches
+        airline = Airline("Airline Name", sketches=PackageSketches())
+        clients = [airline.add_client(f"Client {index}") for index in range(6)]
+        for index, client in enumerate(clients):
+            airline.add_package("Origin", "Destination", client, "31/12/2023")
+            if index % 2:
+                airline.add_package("Origin", "Destination", client, "01/01/2024")
+        # Assert that the small counts are estimated exactly, merging the clients of both dates
+        report = airline.get_distinct_clients_estimate("31/12/2023", "01/01/2024")
+        self.assertEqual(report["clients"], 6)
+        self.assertAlmostEqual(report["error"], 1.04 / 32)
+        self.assertEqual(airline.get_distinct_clients_estimate("01/01/2024", "01/01/2024")["clients"], 3)
+        self.assertEqual(airline.get_distinct_clients_estimate("01/01/2023", "30/12/2023")["clients"], 0)
+        # Assert that an invalid interval raises a ValueError
+        with self.assertRaises(ValueError) as context:
+            airline.get_distinct_clients_estimate("01/01/2024", "31/12/2023")
+        self.assertTrue(DATE_INTERVAL_VALIDATION_MSG in str(context.exception))
+
+    def test_get_top_routes(self):
+        """
+        The method to test the retrieval of the busiest routes.
+        """
+        # Add packages on routes of different traffic to an airline with sketches of two routes
+        airline = Airline("Airline Name", sketches=PackageSketches(routes=2))
+        client = airline.add_client("Juan Pérez")
+        for origin, destination, count in (("Origin", "Destination", 5), ("Destination", "Origin", 3),
+                                           ("Origin", "Elsewhere", 1)):
+            for _ in range(count):
+                airline.add_package(origin, destination, client, "01/01/2024")
+        # Assert that the busiest route is exact and that the route that replaced another carries its count as error
+        self.assertEqual(airline.get_top_routes(), [
+            {"origin": "Origin", "destination": "Destination", "packages": 5, "error": 0},
+            {"origin": "Origin", "destination": "Elsewhere", "packages": 4, "error": 3},
+        ])
+        self.assertEqual(len(airline.get_top_routes(limit=1)), 1)
+
+    def test_sketches_disabled(self):
+        """
+        The method to test the approximate reports of an airline without sketches.
+        """
+        # Assert that both approximate reports raise a ValueError
+        with self.assertRaises(ValueError) as context:
+            self.airline.get_distinct_clients_estimate("01/01/2024", "01/01/2024")
+        self.assertTrue(SKETCHES_DISABLED_VALIDATION_MSG in str(context.exception))
+        with self.assertRaises(ValueError):
+            self.airline.get_top_routes()
+
     def test_add_package_with_invalid_client(self):
         """
         The method to test the addition of a package with an invalid client to the Airline class.
@@ -113,6 +393,61 @@ class TestAirline(unittest.TestCase):
             self.airline.add_package("Origin", "Destination", "Invalid Client", datetime.now().strftime(DATE_FORMAT))
         self.assertTrue(PACKAGE_CLIENT_VALIDATION_MSG in str(context.exception))
 
+    def test_get_packages(self):
+        """
+        The method to test the retrieval of the packages handled on a given date in the Airline class.
+        """
+        # Add a package on another date and assert that each date bucket and counter only holds its own packages
+        today = datetime.now().strftime(DATE_FORMAT)
+        package = self.airline.add_package("Origin", "Destination", self.airline.clients[0], "31/12/2023")
+        self.assertEqual(len(self.airline.get_packages(today)), 3)
+        self.assertEqual(self.airline.get_packages("31/12/2023"), [package])
+        self.assertEqual(self.airline.get_packages("30/12/2023"), [])
+        self.assertEqual(self.airline.package_count_by_date,
+                         {date_to_ordinal(today): 3, date_to_ordinal("31/12/2023"): 1})
+
+    def test_load_packages(self):
+        """
+        The method to test the bulk load of packages from the fixtures file in the Airline class.
+        """
+        # Load the demo packages in small batches and assert that every package and new client was added
+        with open("tests/fixtures/packages.json", "r", encoding="utf-8") as f:
+            demo_packages = json.load(f)[0]["demo_packages"]
+        stats = self.airline.load_packages("tests/fixtures/packages.json", key="demo_packages", batch_size=2)
+        self.assertEqual(stats["packages"], len(demo_packages))
+        self.assertEqual(stats["errors"], [])
+        self.assertEqual(len(self.airline.packages), 3 + len(demo_packages))
+        self.assertEqual(len(self.airline.clients),
+                         len({package["client_str"] for package in demo_packages} | {"Juan Pérez", "María García",
+                                                                                    "Carlos Rodríguez"}))
+        self.assertEqual(self.airline.package_count_by_date.get(date_to_ordinal("01/01/2024"), 0),
+                         sum(package.get("date") == "01/01/2024" for package in demo_packages))
+
+    def test_load_packages_with_invalid_records(self):
+        """
+        The method to test the bulk load of a newline-delimited file with invalid records.
+        """
+        # Load a file with invalid records and a malformed line and assert that they are reported while the valid ones are added
+        records = [
+            {"origin": "Origin", "destination": "Destination", "client_str": "Valid Client", "date": "01/01/2024"},
+            {"origin": "Origin", "destination": "Origin", "client_str": "Same City Client"},
+            {"origin": "Origin", "client_str": "Missing Destination Client"},
+            {"origin": "Origin", "destination": "Destination", "client_str": "Valid Client", "date": "01/01/2024"},
+        ]
+        lines = [json.dumps(record) for record in records]
+        lines.insert(3, '{"origin": "Origin", "destination"')
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "packages.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines))
+            stats = self.airline.load_packages(path, batch_size=3)
+        self.assertEqual(stats["packages"], 2)
+        self.assertEqual([number for number, message in stats["errors"]], [2, 3, 4])
+        self.assertTrue(PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG in stats["errors"][0][1])
+        self.assertTrue(JSON_RECORD_VALIDATION_MSG in stats["errors"][2][1])
+        self.assertEqual(len(self.airline.clients), 4)
+        self.assertEqual(self.airline.package_count_by_date[date_to_ordinal("01/01/2024")], 2)
+
 
 if __name__ == "__main__":
     unittest.main()
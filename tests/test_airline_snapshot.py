@@ -0,0 +1,218 @@
+import gc
+import os
+import tempfile
+import unittest
+import warnings
+from types import SimpleNamespace
+
+from classes import Airline, AirlineSnapshot, Client, PersistentAirline
+from utils import PACKAGE_DATE_VALIDATION_MSG, SNAPSHOT_FORMAT_VALIDATION_MSG, date_to_ordinal
+
+
+class TestAirlineSnapshot(unittest.TestCase):
+    """
+    The TestAirlineSnapshot class represents a set of unit tests for the AirlineSnapshot class.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        tearDown: Cleans up the test environment after each test method.
+        test_write_and_open: Tests that a written snapshot maps back the same strings and columns.
+        test_to_airline: Tests the loading of a snapshot into a new airline.
+        test_to_package_store: Tests the loading of a snapshot into a columnar store.
+        test_iter_packages: Tests the iteration over the packages of a snapshot with shared clients.
+        test_write_unregistered_client: Tests the writing of packages whose client is not registered.
+        test_write_replaces_atomically: Tests that writing a snapshot replaces the previous one without leftovers.
+        test_out_of_range_day: Tests that the packages of a snapshot with an out of range date are rejected.
+        test_open_invalid_file: Tests the opening of a file that is not a snapshot.
+        test_open_truncated_file: Tests the opening of a snapshot cut short at every size.
+        test_open_empty_file: Tests the opening of an empty file.
+        test_write_compressed: Tests that a compressed snapshot is smaller and reads back the same columns.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize an airline from the fixtures and write it to a snapshot
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temporary_directory.name, "airline.snapshot")
+        self.airline = Airline("Airline Name")
+        self.airline.load_packages("tests/fixtures/packages.json", key="demo_packages")
+        self.airline.add_client("Client Without Packages")
+        self.airline.add_transportation_fee("01/01/2024", 20)
+        AirlineSnapshot.write(self.airline, self.path)
+
+    def tearDown(self):
+        """
+        The method to clean up the test environment after each test method.
+        """
+        self.temporary_directory.cleanup()
+
+    def test_write_and_open(self):
+        """
+        The method to test that a written snapshot maps back the same strings and columns.
+        """
+        # Open the snapshot and assert that each string is stored once and each package has a value per column
+        with AirlineSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.name, "Airline Name")
+            self.assertEqual(len(snapshot), len(self.airline.packages))
+            self.assertEqual(snapshot.sequence, 0)
+            self.assertEqual(snapshot.client_names, [client.name for client in self.airline.clients])
+            self.assertEqual(len(snapshot.cities), len(set(snapshot.cities)))
+            self.assertEqual(set(snapshot.cities), {city for package in self.airline.packages
+                                                    for city in (package.origin, package.destination)})
+            self.assertEqual(list(snapshot.columns["fees"]), self.airline.transportation_fee.fees)
+            self.assertEqual(snapshot.get_daily_counts(), self.airline.package_count_by_date)
+
+    def test_to_airline(self):
+        """
+        The method to test the loading of a snapshot into a new airline.
+        """
+        # Load the snapshot into an in-memory and a persistent airline and assert that they match the original
+        with AirlineSnapshot(self.path) as snapshot:
+            airline = snapshot.to_airline()
+            with tempfile.TemporaryDirectory() as directory:
+                persistent_airline = snapshot.to_airline(PersistentAirline, directory=directory)
+                persistent_airline.close()
+        for loaded in (airline, persistent_airline):
+            self.assertEqual([client.name for client in loaded.clients],
+                             [client.name for client in self.airline.clients])
+            self.assertEqual([(package.origin, package.destination, package.client.name, package.date)
+                              for package in loaded.packages],
+                             [(package.origin, package.destination, package.client.name, package.date)
+                              for package in self.airline.packages])
+            self.assertEqual(loaded.transportation_fee.items(), self.airline.transportation_fee.items())
+
+    def test_to_package_store(self):
+        """
+        The method to test the loading of a snapshot into a columnar store.
+        """
+        # Load the snapshot into a store and assert that its packages match the original
+        with AirlineSnapshot(self.path) as snapshot:
+            store = snapshot.to_package_store()
+        self.assertEqual([(package.origin, package.destination, package.client.name, package.date)
+                          for package in store],
+                         [(package.origin, package.destination, package.client.name, package.date)
+                          for package in self.airline.packages])
+
+    def test_iter_packages(self):
+        """
+        The method to test the iteration over the packages of a snapshot with shared clients.
+        """
+        # Iterate over the packages with the original clients and assert that they are shared, not copied
+        clients_by_name = {client.name: client for client in self.airline.clients}
+        with AirlineSnapshot(self.path) as snapshot:
+            packages = list(snapshot.iter_packages(clients_by_name))
+            self.assertEqual(list(snapshot.iter_fees()),
+                             list(zip(self.airline.transportation_fee.ordinals, self.airline.transportation_fee.fees)))
+        self.assertEqual([(package.origin, package.destination, package.client, package.day) for package in packages],
+                         [(package.origin, package.destination, package.client, package.day)
+                          for package in self.airline.packages])
+
+    def test_write_unregistered_client(self):
+        """
+        The method to test the writing of packages whose client is not registered.
+        """
+        # Add a package for a client that was never registered and assert that it is written with its client
+        airline = Airline("Airline Name")
+        airline.add_package("Buenos Aires", "Rosario", Client("Unregistered Client"), "01/01/2024")
+        AirlineSnapshot.write(airline, self.path, sequence=3)
+        with AirlineSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.sequence, 3)
+            self.assertEqual(snapshot.client_names, ["Unregistered Client"])
+            self.assertEqual([package.client.name for package in snapshot.iter_packages()], ["Unregistered Client"])
+
+    def test_write_replaces_atomically(self):
+        """
+        The method to test that writing a snapshot replaces the previous one without leftovers.
+        """
+        # Overwrite the snapshot while it is open and assert that the open mapping still reads the previous version
+        with AirlineSnapshot(self.path) as snapshot:
+            AirlineSnapshot.write(Airline("Other Airline"), self.path)
+            self.assertEqual(snapshot.name, "Airline Name")
+            self.assertEqual(len(snapshot), len(self.airline.packages))
+        with AirlineSnapshot(self.path) as snapshot:
+            self.assertEqual(snapshot.name, "Other Airline")
+            self.assertEqual(len(snapshot), 0)
+        self.assertEqual(os.listdir(self.temporary_directory.name), ["airline.snapshot"])
+
+    def test_out_of_range_day(self):
+        """
+        The method to test that the packages of a snapshot with an out of range date are rejected.
+        """
+        # Write a package whose date ordinal is out of range, bypassing Package, and assert that loading it raises
+        package = SimpleNamespace(origin="Buenos Aires", destination="Rosario", client=Client("Juan Pérez"), day=0)
+        AirlineSnapshot.write_packages(self.path, "Airline Name", [package])
+        with AirlineSnapshot(self.path) as snapshot:
+            for load in (lambda: list(snapshot.iter_packages()), snapshot.to_package_store, snapshot.to_airline):
+                with self.assertRaises(ValueError) as context:
+                    load()
+                self.assertTrue(PACKAGE_DATE_VALIDATION_MSG in str(context.exception))
+
+    def test_open_invalid_file(self):
+        """
+        The method to test the opening of a file that is not a snapshot.
+        """
+        # Assert that opening the fixtures file as a snapshot raises a ValueError
+        with self.assertRaises(ValueError) as context:
+            AirlineSnapshot("tests/fixtures/packages.json")
+        self.assertTrue(SNAPSHOT_FORMAT_VALIDATION_MSG in str(context.exception))
+
+    def test_open_truncated_file(self):
+        """
+        The method to test the opening of a snapshot cut short at every size.
+        """
+        # Cut the snapshot at every size short of its own and assert that each opening raises a ValueError
+        with open(self.path, "rb") as f:
+            data = f.read()
+        truncated_path = self.path + ".truncated"
+        for size in range(len(data)):
+            with open(truncated_path, "wb") as f:
+                f.write(data[:size])
+            with self.assertRaises(ValueError, msg=size) as context:
+                AirlineSnapshot(truncated_path)
+            self.assertTrue(SNAPSHOT_FORMAT_VALIDATION_MSG in str(context.exception))
+
+    def test_open_empty_file(self):
+        """
+        The method to test the opening of an empty file.
+        """
+        # Assert that opening an empty file raises a ValueError and leaves no file open behind
+        open(self.path, "wb").close()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always", ResourceWarning)
+            with self.assertRaises(ValueError) as context:
+                AirlineSnapshot(self.path)
+            gc.collect()
+        self.assertTrue(SNAPSHOT_FORMAT_VALIDATION_MSG in str(context.exception))
+        self.assertEqual([warning for warning in caught if issubclass(warning.category, ResourceWarning)], [])
+
+
+    def test_write_compressed(self):
+        """
+        The method to test that a compressed snapshot is smaller and reads back the same columns.
+        """
+        # Write the airline with many packages both ways and assert that the compressed file is smaller
+        client = self.airline.clients[0]
+        for day in range(1000):
+            self.airline.add_package("Buenos Aires", "Córdoba", client, date_to_ordinal("01/01/2024") - day)
+        compressed_path = self.path + ".compressed"
+        AirlineSnapshot.write(self.airline, self.path)
+        AirlineSnapshot.write(self.airline, compressed_path, compress=True)
+        self.assertLess(os.path.getsize(compressed_path), os.path.getsize(self.path) // 2)
+        # Assert that both snapshots hold the same strings and columns
+        with AirlineSnapshot(self.path) as snapshot, AirlineSnapshot(compressed_path) as compressed:
+            self.assertEqual((snapshot.compressed, compressed.compressed), (False, True))
+            self.assertEqual(compressed.strings, snapshot.strings)
+            self.assertEqual({column: list(data) for column, data in compressed.columns.items()},
+                             {column: list(data) for column, data in snapshot.columns.items()})
+        # Corrupt a compressed column and assert that opening the snapshot raises a ValueError
+        with open(compressed_path, "r+b") as f:
+            f.seek(AirlineSnapshot.HEADER.size + AirlineSnapshot.LENGTH.size)
+            f.write(b"\xff\xff")
+        with self.assertRaises(ValueError) as context:
+            AirlineSnapshot(compressed_path)
+        self.assertTrue(SNAPSHOT_FORMAT_VALIDATION_MSG in str(context.exception))
+
+if __name__ == "__main__":
+    unittest.main()
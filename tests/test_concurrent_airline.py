@@ -0,0 +1,116 @@
+import sys
+import threading
+import unittest
+from datetime import date, timedelta
+
+from classes import ConcurrentAirline
+from utils import DATE_FORMAT
+
+
+class TestConcurrentAirline(unittest.TestCase):
+    """
+    The TestConcurrentAirline class represents a set of stress tests for the ConcurrentAirline class.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        tearDown: Cleans up the test environment after each test method.
+        test_concurrent_add_client: Tests that threads adding the same clients don't create duplicates.
+        test_concurrent_ingestion_and_reports: Tests that concurrent ingestion and reporting lose no packages.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Switch threads as often as possible so that races show up
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.airline = ConcurrentAirline("Airline Name", shards=4)
+        self.dates = [(date.today() - timedelta(days=day)).strftime(DATE_FORMAT) for day in range(10)]
+
+    def tearDown(self):
+        """
+        The method to clean up the test environment after each test method.
+        """
+        sys.setswitchinterval(self.switch_interval)
+
+    def run_threads(self, targets):
+        """
+        The method to run functions in threads at once and re-raise the first error of any of them.
+
+        Parameters:
+            targets (list): The functions to run.
+        """
+        errors = []
+        barrier = threading.Barrier(len(targets))
+
+        def run(target):
+            barrier.wait()
+            try:
+                target()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(target,)) for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    def test_concurrent_add_client(self):
+        """
+        The method to test that threads adding the same clients don't create duplicates.
+        """
+        # Add the same clients from several threads and assert that each one exists once
+        results = [[] for _ in range(8)]
+        self.run_threads([lambda result=result: result.extend(self.airline.add_client(f"Client {index}")
+                                                              for index in range(200))
+                          for result in results])
+        self.assertEqual(len(self.airline.clients), 200)
+        self.assertEqual(len(self.airline.clients_by_name), 200)
+        for result in results:
+            self.assertEqual([id(client) for client in result], [id(client) for client in results[0]])
+
+    def test_concurrent_ingestion_and_reports(self):
+        """
+        The method to test that concurrent ingestion and reporting lose no packages.
+        """
+        writers, packages_per_writer = 6, 1000
+        done = threading.Event()
+
+        def ingest(writer):
+            for index in range(packages_per_writer):
+                client = self.airline.add_client(f"Client {index % 50}")
+                self.airline.add_package(f"Origin {writer}", "Destination", client, self.dates[index % len(self.dates)])
+
+        def change_fees():
+            for fee in range(1, 200):
+                self.airline.add_transportation_fee(self.dates[fee % len(self.dates)], fee)
+
+        def report():
+            while not done.is_set():
+                report = self.airline.get_transportation_report_range(self.dates[-1], self.dates[0])
+                self.assertEqual(report["packages"], sum(day["packages"] for day in report["days"]))
+                self.assertEqual(report["revenue"], sum(day["revenue"] for day in report["days"]))
+                self.airline.get_total_transportation_report(self.dates[0])
+
+        def ingest_all():
+            try:
+                self.run_threads([lambda writer=writer: ingest(writer) for writer in range(writers)] + [change_fees])
+            finally:
+                done.set()
+
+        # Ingest from several threads while others report, then assert that every package was counted once
+        self.run_threads([ingest_all, report, report])
+        total = writers * packages_per_writer
+        self.assertEqual(len(self.airline.packages), total)
+        self.assertEqual(len(self.airline.clients), 50)
+        self.assertEqual(sum(self.airline.package_count_by_date.values()), total)
+        self.assertEqual(sum(len(packages) for packages in self.airline.packages_by_date.values()), total)
+        self.assertEqual(self.airline.get_transportation_report_range(self.dates[-1], self.dates[0])["packages"], total)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+from array import array
+from unittest import mock
+
+from classes import FeeSchedule
+from classes import fee_schedule
+from utils import DATE_MIN, date_to_ordinal, get_numpy
+
+
+class TestFeeSchedule(unittest.TestCase):
+    """
+    The TestFeeSchedule class represents a set of unit tests for the FeeSchedule class.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        test_init: Tests the initialization of the FeeSchedule class.
+        test_set_keeps_chronological_order: Tests that setting fees keeps the dates in chronological order.
+        test_set_replaces_existing_fee: Tests that setting a fee on an existing date replaces it.
+        test_get_fee: Tests the retrieval of the fee in effect on a given date.
+        test_get_fee_before_first_date: Tests the retrieval of a fee before the first fee change.
+        test_get_next_change_ordinal: Tests the retrieval of the next fee change after a date.
+        test_get_fees: Tests the retrieval of the fees in effect on many dates at once.
+        test_get_fees_without_numpy: Tests the retrieval of the fees of many dates at once without NumPy.
+        test_get_fees_with_numpy: Tests the vectorized retrieval of the fees of many dates at once with NumPy.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize a fee schedule with a default fee
+        self.schedule = FeeSchedule({DATE_MIN: 10})
+
+    def test_init(self):
+        """
+        The method to test the initialization of the FeeSchedule class.
+        """
+        # Assert that the schedule holds only the default fee
+        self.assertEqual(len(self.schedule), 1)
+        self.assertEqual(self.schedule[DATE_MIN], 10)
+        self.assertIn(DATE_MIN, self.schedule)
+        self.assertNotIn("02/01/1970", self.schedule)
+
+    def test_set_keeps_chronological_order(self):
+        """
+        The method to test that setting fees keeps the dates in chronological order.
+        """
+        # Add fees out of order and assert that they are iterated chronologically
+        self.schedule["01/01/2024"] = 30
+        self.schedule["31/12/2023"] = 20
+        self.schedule["15/06/2000"] = 15
+        self.assertEqual(list(self.schedule), [DATE_MIN, "15/06/2000", "31/12/2023", "01/01/2024"])
+        self.assertEqual(self.schedule.items(),
+                         [(DATE_MIN, 10), ("15/06/2000", 15), ("31/12/2023", 20), ("01/01/2024", 30)])
+
+    def test_set_replaces_existing_fee(self):
+        """
+        The method to test that setting a fee on an existing date replaces it.
+        """
+        # Set the fee of the default date again and assert that no new date was added
+        self.schedule[DATE_MIN] = 12
+        self.assertEqual(len(self.schedule), 1)
+        self.assertEqual(self.schedule[DATE_MIN], 12)
+
+    def test_get_fee(self):
+        """
+        The method to test the retrieval of the fee in effect on a given date.
+        """
+        # Add fees and assert that each date gets the latest fee that is not later than it
+        self.schedule["31/12/2023"] = 20
+        self.schedule["01/01/2024"] = 30
+        self.assertEqual(self.schedule.get_fee("30/12/2023"), 10)
+        self.assertEqual(self.schedule.get_fee("31/12/2023"), 20)
+        self.assertEqual(self.schedule.get_fee("01/01/2024"), 30)
+        self.assertEqual(self.schedule.get_fee("05/03/2030"), 30)
+
+    def test_get_fee_before_first_date(self):
+        """
+        The method to test the retrieval of a fee before the first fee change.
+        """
+        # Assert that there is no fee in effect before the first fee change
+        schedule = FeeSchedule({"01/01/2024": 30})
+        with self.assertRaises(KeyError):
+            schedule.get_fee("31/12/2023")
+
+    def test_get_next_change_ordinal(self):
+        """
+        The method to test the retrieval of the next fee change after a date.
+        """
+        # Add a fee and assert that it is the next change only for earlier dates
+        self.schedule["01/01/2024"] = 30
+        ordinal = date_to_ordinal("01/01/2024")
+        self.assertEqual(self.schedule.get_next_change_ordinal(date_to_ordinal(DATE_MIN)), ordinal)
+        self.assertEqual(self.schedule.get_next_change_ordinal(ordinal - 1), ordinal)
+        self.assertIsNone(self.schedule.get_next_change_ordinal(ordinal))
+
+    def test_get_fees(self):
+        """
+        The method to test the retrieval of the fees in effect on many dates at once.
+        """
+        # Add fees and assert that every date gets the same fee as a single lookup, in order
+        self.schedule["31/12/2023"] = 20
+        self.schedule["01/01/2024"] = 30
+        dates = ["01/01/2024", "30/12/2023", "31/12/2023", "05/03/2030", "30/12/2023"]
+        self.assertEqual(self.schedule.get_fees(dates), array("q", [30, 10, 20, 30, 10]))
+        self.assertEqual(self.schedule.get_fees_by_ordinal(array("i", map(date_to_ordinal, dates))),
+                         array("q", map(self.schedule.get_fee, dates)))
+        self.assertEqual(self.schedule.get_fees([]), array("q"))
+        # Assert that a fee change is seen by the next bulk lookup
+        self.schedule["05/03/2030"] = 40
+        self.assertEqual(self.schedule.get_fees(["05/03/2030"]), array("q", [40]))
+        # Assert that there is no fee in effect before the first fee change
+        with self.assertRaises(KeyError):
+            FeeSchedule({"01/01/2024": 30}).get_fees(["01/01/2024", "31/12/2023"])
+
+
+    def test_get_fees_without_numpy(self):
+        """
+        The method to test the retrieval of the fees of many dates at once without NumPy.
+        """
+        # Hide NumPy and assert that the fallback gets the same fees
+        with mock.patch.object(fee_schedule, "get_numpy", return_value=None):
+            self.test_get_fees()
+
+    @unittest.skipUnless(get_numpy(), "NumPy is not installed")
+    def test_get_fees_with_numpy(self):
+        """
+        The method to test the vectorized retrieval of the fees of many dates at once with NumPy.
+        """
+        # Assert that ordinals given as an array, a list, a NumPy array, or a generator get the same fees
+        numpy = get_numpy()
+        self.schedule["31/12/2023"] = 20
+        self.schedule["01/01/2024"] = 30
+        ordinals = [date_to_ordinal(date) for date in ["01/01/2024", "30/12/2023", "31/12/2023", "30/12/2023"]]
+        expected = array("q", [30, 10, 20, 10])
+        for given in (array("i", ordinals), ordinals, numpy.array(ordinals, dtype=numpy.int32), iter(ordinals)):
+            self.assertEqual(self.schedule.get_fees_by_ordinal(given), expected)
+        self.assertEqual(self.schedule.get_fees_by_ordinal([]), array("q"))
+        # Assert that the cached NumPy copies of the schedule are dropped when a fee changes
+        self.schedule["31/12/2023"] = 25
+        self.assertEqual(self.schedule.get_fees_by_ordinal(ordinals), array("q", [30, 10, 25, 10]))
+        with self.assertRaises(KeyError):
+            FeeSchedule({"01/01/2024": 30}).get_fees_by_ordinal(array("i", [ordinals[0], ordinals[2]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import contextlib
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import main
+
+
+class TestMain(unittest.TestCase):
+    """
+    The TestMain class represents a set of unit tests for the batch command line of the main module.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        tearDown: Cleans up the test environment after each test method.
+        test_report_range_csv: Tests the report command over a range of dates in CSV format.
+        test_report_dates_json: Tests the report command over a list of dates in JSON format.
+        test_report_with_missing_range_end: Tests the report command with a range without its end.
+        test_lazy_imports: Tests that starting the command line doesn't import the modules it only needs later.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize a temporary directory with a fees file and a dates file
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.directory = self.temporary_directory.name
+        self.fees_path = os.path.join(self.directory, "fees.csv")
+        with open(self.fees_path, "w", encoding="utf-8") as f:
+            f.write("date,fee\n02/01/2024,20\n")
+        self.dates_path = os.path.join(self.directory, "dates.txt")
+        with open(self.dates_path, "w", encoding="utf-8") as f:
+            f.write("02/01/2024\n\n31/12/2023\n")
+        self.output_path = os.path.join(self.directory, "report")
+
+    def tearDown(self):
+        """
+        The method to clean up the test environment after each test method.
+        """
+        self.temporary_directory.cleanup()
+
+    def test_report_range_csv(self):
+        """
+        The method to test the report command over a range of dates in CSV format.
+        """
+        # Run the report over a range and assert that every date of the range is reported
+        main.main(["report", "--packages", "tests/fixtures/packages.json", "--key", "demo_packages",
+                   "--fees", self.fees_path, "--from", "31/12/2023", "--to", "02/01/2024",
+                   "--output", self.output_path])
+        with open(self.output_path, "r", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(rows, [
+            {"date": "31/12/2023", "fee": "10", "packages": "0", "revenue": "0"},
+            {"date": "01/01/2024", "fee": "10", "packages": "1", "revenue": "10"},
+            {"date": "02/01/2024", "fee": "20", "packages": "1", "revenue": "20"},
+        ])
+
+    def test_report_dates_json(self):
+        """
+        The method to test the report command over a list of dates in JSON format.
+        """
+        # Run the report over dates from the command line and a file and assert that they are reported in order
+        main.main(["report", "--packages", "tests/fixtures/packages.json", "--key", "demo_packages",
+                   "--dates", "01/01/2024", "--dates-file", self.dates_path, "--format", "json",
+                   "--output", self.output_path])
+        with open(self.output_path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+        self.assertEqual([row["date"] for row in rows], ["01/01/2024", "02/01/2024", "31/12/2023"])
+        self.assertEqual([row["packages"] for row in rows], [1, 1, 0])
+
+    def test_report_with_missing_range_end(self):
+        """
+        The method to test the report command with a range without its end.
+        """
+        # Assert that giving only the start of a range exits with an error
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main.main(["report", "--from", "31/12/2023"])
+
+    def test_lazy_imports(self):
+        """
+        The method to test that starting the command line doesn't import the modules it only needs later.
+        """
+        # Import the main module in a fresh interpreter and list which of the deferred modules were imported
+        deferred = ["unittest", "csv", "json", "argparse", "numpy", "sqlite3", "mmap", "cProfile",
+                    "concurrent.futures", "classes.sqlite_airline"]
+        code = f"import sys, main; print([name for name in {deferred!r} if name in sys.modules])"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "[]")
+
+
+if __name__ == "__main__":
+    unittest.main()
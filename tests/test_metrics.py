@@ -0,0 +1,116 @@
+import json
+import unittest
+
+from classes import Airline, AirlineMetrics
+from utils import CLIENT_NOT_EXIST_VALIDATION_MSG
+
+
+class TestAirlineMetrics(unittest.TestCase):
+    """
+    The TestAirlineMetrics class represents a set of unit tests for the AirlineMetrics class.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        test_instrument: Tests that the calls of the operations of an instrumented airline are recorded.
+        test_uninstrument: Tests that an uninstrumented airline runs its methods unchanged again.
+        test_errors: Tests that the calls that raise an exception are recorded as errors.
+        test_histogram: Tests the latency histogram and its quantile estimates.
+        test_to_prometheus: Tests the Prometheus text dump of the metrics.
+        test_capture: Tests the profile and allocations captured while running a block.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize an instrumented airline with a client
+        self.airline = Airline("Airline Name")
+        self.metrics = AirlineMetrics()
+        self.metrics.instrument(self.airline)
+        self.client = self.airline.add_client("Juan Pérez")
+
+    def test_instrument(self):
+        """
+        The method to test that the calls of the operations of an instrumented airline are recorded.
+        """
+        # Call a few operations and assert that each call was counted and timed
+        self.airline.add_package("Buenos Aires", "Córdoba", self.client, "01/01/2024")
+        self.airline.add_package("Buenos Aires", "Córdoba", self.airline.get_client("Juan Pérez"), "01/01/2024")
+        self.airline.add_packages([("Buenos Aires", "Rosario", self.client, "02/01/2024")])
+        self.assertIn("Total packages transported: 2\n", self.airline.get_total_transportation_report("01/01/2024"))
+        self.airline.get_transportation_fees(["01/01/2024", "02/01/2024"])
+        metrics = self.metrics.to_dict()
+        self.assertEqual({operation: stats["count"] for operation, stats in metrics.items()},
+                         {"add_client": 1, "add_package": 2, "add_packages": 1, "get_client": 1,
+                          "get_total_transportation_report": 1, "get_transportation_fees": 1})
+        self.assertEqual(metrics["add_package"]["buckets"]["+Inf"], 2)
+        self.assertGreater(metrics["add_package"]["seconds"], 0)
+        self.assertEqual(json.loads(json.dumps(metrics)), metrics)
+
+    def test_uninstrument(self):
+        """
+        The method to test that an uninstrumented airline runs its methods unchanged again.
+        """
+        # Assert that the wrappers are removed and that later calls are not recorded
+        self.metrics.uninstrument(self.airline)
+        self.assertNotIn("add_package", vars(self.airline))
+        self.airline.add_package("Buenos Aires", "Córdoba", self.client, "01/01/2024")
+        self.assertEqual(list(self.metrics.to_dict()), ["add_client"])
+
+    def test_errors(self):
+        """
+        The method to test that the calls that raise an exception are recorded as errors.
+        """
+        # Assert that the exception still reaches the caller and that the call is counted as an error
+        with self.assertRaises(ValueError) as context:
+            self.airline.get_client("Invalid Client")
+        self.assertTrue(CLIENT_NOT_EXIST_VALIDATION_MSG in str(context.exception))
+        stats = self.metrics.to_dict()["get_client"]
+        self.assertEqual((stats["count"], stats["errors"]), (1, 1))
+
+    def test_histogram(self):
+        """
+        The method to test the latency histogram and its quantile estimates.
+        """
+        # Record known latencies and assert that they land in their buckets
+        metrics = AirlineMetrics(buckets=(0.001, 0.01, 0.1))
+        for seconds in (0.0005, 0.0005, 0.005, 0.05, 0.5):
+            metrics.observe("operation", seconds)
+        stats = metrics.to_dict()["operation"]
+        self.assertEqual(stats["buckets"], {"0.001": 2, "0.01": 3, "0.1": 4, "+Inf": 5})
+        self.assertEqual(stats["max_seconds"], 0.5)
+        # Assert that the quantiles are estimated by the upper bound of their bucket, or the slowest call
+        self.assertEqual(metrics.get_quantile("operation", 0.4), 0.001)
+        self.assertEqual(metrics.get_quantile("operation", 0.6), 0.01)
+        self.assertEqual(metrics.get_quantile("operation", 1.0), 0.5)
+        self.assertIsNone(metrics.get_quantile("other operation", 0.5))
+        # Assert that resetting forgets every call
+        metrics.reset()
+        self.assertEqual(metrics.to_dict(), {})
+
+    def test_to_prometheus(self):
+        """
+        The method to test the Prometheus text dump of the metrics.
+        """
+        # Assert that the histogram and the error counter of each operation are exposed
+        text = self.metrics.to_prometheus()
+        self.assertIn("# TYPE airline_operation_seconds histogram\n", text)
+        self.assertIn('airline_operation_seconds_bucket{operation="add_client",le="+Inf"} 1\n', text)
+        self.assertIn('airline_operation_seconds_count{operation="add_client"} 1\n', text)
+        self.assertIn('airline_operation_errors_total{operation="add_client"} 0\n', text)
+
+    def test_capture(self):
+        """
+        The method to test the profile and allocations captured while running a block.
+        """
+        # Add packages while capturing and assert that the profile and the memory were reported
+        with AirlineMetrics.capture(limit=5) as capture:
+            for _ in range(100):
+                self.airline.add_package("Buenos Aires", "Córdoba", self.client, "01/01/2024")
+        self.assertIn("add_package", capture["profile"])
+        self.assertLessEqual(len(capture["allocations"]), 5)
+        self.assertGreater(capture["peak_memory"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,8 @@ from datetime import datetime
 
 from classes import Client, Package
 from utils import PACKAGE_ORIGIN_VALIDATION_MSG, PACKAGE_DESTINATION_VALIDATION_MSG, \
-    PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG, PACKAGE_CLIENT_VALIDATION_MSG
+    PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG, PACKAGE_CLIENT_VALIDATION_MSG, PACKAGE_DATE_VALIDATION_MSG, \
+    DATE_FORMAT_VALIDATION_MSG, DATE_MAX_ORDINAL, DATE_MIN_ORDINAL, date_to_ordinal, today_ordinal
 
 
 class TestPackage(unittest.TestCase):
@@ -17,6 +18,10 @@ class TestPackage(unittest.TestCase):
         test_init_with_short_destination: Tests the initialization of the Package class with a short destination.
         test_init_with_same_origin_and_destination: Tests the initialization of the Package class with the same origin and destination.
         test_init_with_invalid_client: Tests the initialization of the Package class with an invalid client.
+        test_init_interns_strings: Tests that the initialization of the Package class interns its repeated strings.
+        test_init_normalizes_date: Tests that the initialization of the Package class stores the date as an ordinal.
+        test_init_with_invalid_date: Tests the initialization of the Package class with an invalid date.
+        test_init_with_out_of_range_day: Tests the initialization of the Package class with an out of range ordinal.
     """
 
     def setUp(self):
@@ -72,6 +77,52 @@ class TestPackage(unittest.TestCase):
             Package("New York", "Los Angeles", "John Doe", datetime.now().strftime("%d/%m/%Y"))
         self.assertTrue(PACKAGE_CLIENT_VALIDATION_MSG in str(context.exception))
 
+    def test_init_interns_strings(self):
+        """
+        The method to test that the initialization of the Package class interns its repeated strings.
+        """
+        # Build equal strings at runtime and assert that the packages share a single copy of each
+        origin = "".join(["New ", "York"])
+        package = Package(origin, "".join(["Los ", "Angeles"]), self.client, "01/01/2024")
+        other_package = Package("".join(["New ", "York"]), "Chicago", self.client, "01/01/2024")
+        self.assertIsNot(origin, "".join(["New ", "York"]))
+        self.assertIs(package.origin, other_package.origin)
+        self.assertFalse(hasattr(package, "__dict__"))
+
+    def test_init_normalizes_date(self):
+        """
+        The method to test that the initialization of the Package class stores the date as an ordinal.
+        """
+        # Assert that a date string, an ordinal, and no date all end up as ordinals formatted back for display
+        package = Package("New York", "Los Angeles", self.client, "1/1/2024")
+        self.assertEqual(package.day, date_to_ordinal("01/01/2024"))
+        self.assertEqual(package.date, "01/01/2024")
+        self.assertEqual(Package("New York", "Los Angeles", self.client, package.day).date, "01/01/2024")
+        self.assertEqual(Package("New York", "Los Angeles", self.client).day, today_ordinal())
+
+    def test_init_with_invalid_date(self):
+        """
+        The method to test the initialization of the Package class with an invalid date.
+        """
+        # Assert that initializing a package with a date that is not in DD/MM/YYYY format raises a ValueError
+        with self.assertRaises(ValueError) as context:
+            Package("New York", "Los Angeles", self.client, "2024-01-01")
+        self.assertTrue(DATE_FORMAT_VALIDATION_MSG in str(context.exception))
+
+    def test_init_with_out_of_range_day(self):
+        """
+        The method to test the initialization of the Package class with an out of range ordinal.
+        """
+        # Assert that booleans and ordinals outside of DATE_MIN and DATE_MAX raise a ValueError, as rows do
+        for day in (True, 0, -1, DATE_MIN_ORDINAL - 1, DATE_MAX_ORDINAL + 1, "31/12/1969"):
+            with self.assertRaises(ValueError) as context:
+                Package("New York", "Los Angeles", self.client, day)
+            self.assertTrue(PACKAGE_DATE_VALIDATION_MSG in str(context.exception))
+            errors = []
+            self.assertEqual(Package.from_rows([("New York", "Los Angeles", self.client, day)], {}, errors), [])
+            self.assertEqual(errors, [(1, PACKAGE_DATE_VALIDATION_MSG)])
+        self.assertEqual(Package("New York", "Los Angeles", self.client, DATE_MIN_ORDINAL).date, "01/01/1970")
+
 
 if __name__ == "__main__":
     unittest.main()
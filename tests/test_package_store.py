@@ -0,0 +1,150 @@
+import unittest
+
+from classes import Client, FeeSchedule, Package, PackageStore
+from utils import DATE_MIN, DATE_FORMAT_VALIDATION_MSG, PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG, \
+    DATE_RANGE_VALIDATION_MSG, PACKAGE_DATE_VALIDATION_MSG, DATE_MAX_ORDINAL, date_to_ordinal
+
+
+class TestPackageStore(unittest.TestCase):
+    """
+    The TestPackageStore class represents a set of unit tests for the PackageStore class.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        test_add: Tests the addition of packages to the PackageStore class.
+        test_add_with_invalid_package: Tests the addition of invalid packages to the PackageStore class.
+        test_add_with_out_of_range_date: Tests that out of range dates are rejected without misaligning the columns.
+        test_from_columns_with_out_of_range_day: Tests the building of the PackageStore class with out of range days.
+        test_getitem: Tests the retrieval of Package views from the PackageStore class.
+        test_from_packages: Tests the building of the PackageStore class from Package objects.
+        test_count_date: Tests the count of the packages handled on a given date.
+        test_get_daily_counts: Tests the count of the packages handled on each date.
+        test_get_total_transportation_report: Tests the retrieval of the total transportation report.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize a store with a few packages from two clients
+        self.client = Client("John Doe")
+        self.other_client = Client("Jane Doe")
+        self.store = PackageStore()
+        self.store.add("New York", "Los Angeles", self.client, "31/12/2023")
+        self.store.add("Los Angeles", "New York", self.other_client, "01/01/2024")
+        self.store.add("New York", "Chicago", self.client, "01/01/2024")
+
+    def test_add(self):
+        """
+        The method to test the addition of packages to the PackageStore class.
+        """
+        # Assert that the cities and clients are interned once and that every column has a value per package
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store.cities, ["New York", "Los Angeles", "Chicago"])
+        self.assertEqual(self.store.clients, [self.client, self.other_client])
+        self.assertEqual(list(self.store.origins), [0, 1, 0])
+        self.assertEqual(list(self.store.destinations), [1, 0, 2])
+        self.assertEqual(list(self.store.client_ids), [0, 1, 0])
+        self.assertEqual(self.store.nbytes, 4 * 3 * self.store.days.itemsize)
+
+    def test_add_with_invalid_package(self):
+        """
+        The method to test the addition of invalid packages to the PackageStore class.
+        """
+        # Assert that invalid packages and dates raise a ValueError and are not added
+        with self.assertRaises(ValueError) as context:
+            self.store.add("New York", "New York", self.client, "01/01/2024")
+        self.assertTrue(PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG in str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            self.store.add("New York", "Chicago", self.client, "2024-01-01")
+        self.assertTrue(DATE_FORMAT_VALIDATION_MSG in str(context.exception))
+        self.assertEqual(len(self.store), 3)
+
+    def test_add_with_out_of_range_date(self):
+        """
+        The method to test that out of range dates are rejected without misaligning the columns.
+        """
+        # Assert that each out of range date raises a ValueError and leaves every column as it was
+        for invalid_date in ("01/01/1900", True, 0, DATE_MAX_ORDINAL + 1, 10 ** 12):
+            with self.assertRaises(ValueError) as context:
+                self.store.add("New York", "Boston", self.client, invalid_date)
+            self.assertTrue(PACKAGE_DATE_VALIDATION_MSG in str(context.exception))
+        self.assertEqual([len(column) for column in (self.store.origins, self.store.destinations,
+                                                     self.store.client_ids, self.store.days)], [3, 3, 3, 3])
+        self.assertNotIn("Boston", self.store.cities)
+        self.assertEqual(len(list(self.store)), 3)
+
+    def test_from_columns_with_out_of_range_day(self):
+        """
+        The method to test the building of the PackageStore class with out of range days.
+        """
+        # Assert that a column with an out of range or oversized ordinal raises a ValueError
+        for invalid_day in (0, DATE_MAX_ORDINAL + 1, 10 ** 12):
+            with self.assertRaises(ValueError) as context:
+                PackageStore.from_columns(self.store.cities, self.store.clients, [0], [1], [0], [invalid_day])
+            self.assertTrue(PACKAGE_DATE_VALIDATION_MSG in str(context.exception))
+
+    def test_getitem(self):
+        """
+        The method to test the retrieval of Package views from the PackageStore class.
+        """
+        # Assert that the view holds the values of the stored package
+        package = self.store[1]
+        self.assertIsInstance(package, Package)
+        self.assertEqual(package.origin, "Los Angeles")
+        self.assertEqual(package.destination, "New York")
+        self.assertIs(package.client, self.other_client)
+        self.assertEqual(package.date, "01/01/2024")
+        self.assertEqual([package.destination for package in self.store], ["Los Angeles", "New York", "Chicago"])
+
+    def test_from_packages(self):
+        """
+        The method to test the building of the PackageStore class from Package objects.
+        """
+        # Assert that a store built from the views of another store holds the same columns
+        store = PackageStore.from_packages(self.store)
+        self.assertEqual(store.days, self.store.days)
+        self.assertEqual(store.origins, self.store.origins)
+        self.assertEqual(store.client_ids, self.store.client_ids)
+
+    def test_count_date(self):
+        """
+        The method to test the count of the packages handled on a given date.
+        """
+        # Assert that each date counts only its own packages
+        self.assertEqual(self.store.count_date("31/12/2023"), 1)
+        self.assertEqual(self.store.count_date("01/01/2024"), 2)
+        self.assertEqual(self.store.count_date("02/01/2024"), 0)
+        # Assert that packages added after the dates were counted are counted too, as are stores built from columns
+        self.store.add("Chicago", "Boston", self.other_client, "02/01/2024")
+        self.assertEqual(self.store.count_date("02/01/2024"), 1)
+        self.assertEqual(self.store.get_daily_counts()[date_to_ordinal("01/01/2024")], 2)
+        store = PackageStore.from_columns(self.store.cities, self.store.clients, self.store.origins,
+                                          self.store.destinations, self.store.client_ids, self.store.days)
+        self.assertEqual(store.count_date("01/01/2024"), 2)
+
+    def test_get_daily_counts(self):
+        """
+        The method to test the count of the packages handled on each date.
+        """
+        # Assert that every date with packages is counted
+        self.assertEqual(self.store.get_daily_counts(),
+                         {date_to_ordinal("31/12/2023"): 1, date_to_ordinal("01/01/2024"): 2})
+
+    def test_get_total_transportation_report(self):
+        """
+        The method to test the retrieval of the total transportation report.
+        """
+        # Assert that the report matches the format of the Airline report
+        schedule = FeeSchedule({DATE_MIN: 10, "01/01/2024": 20})
+        report = self.store.get_total_transportation_report("01/01/2024", schedule)
+        expected_report = "[DATE: 01/01/2024 | FEE: 20]\nTotal packages transported: 2\nTotal transportation fee charged: 40"
+        self.assertEqual(report, expected_report)
+        # Assert that a date out of range raises a ValueError
+        with self.assertRaises(ValueError) as context:
+            self.store.get_total_transportation_report("31/12/1969", schedule)
+        self.assertTrue(DATE_RANGE_VALIDATION_MSG in str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+from classes import Airline, PackageStore, ParallelReportEngine
+
+
+class TestParallelReportEngine(unittest.TestCase):
+    """
+    The TestParallelReportEngine class represents a set of unit tests for the ParallelReportEngine class.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        test_from_airline: Tests the building of the ParallelReportEngine class from an airline.
+        test_report_matches_airline: Tests that the parallel report matches the Airline range report.
+        test_report_from_package_store: Tests the report over the packages of a columnar store.
+        test_reuse_workers: Tests that the worker processes are reused across reports until the engine is closed.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize an airline with packages spread over a few days and a fee change in between
+        self.airline = Airline("Airline Name")
+        client = self.airline.add_client("Juan Pérez")
+        self.dates = ["29/12/2023", "30/12/2023", "31/12/2023", "01/01/2024", "02/01/2024"]
+        for index in range(100):
+            self.airline.add_package("Buenos Aires", "Córdoba", client, self.dates[index * index % len(self.dates)])
+        self.airline.add_transportation_fee("31/12/2023", 25)
+
+    def test_from_airline(self):
+        """
+        The method to test the building of the ParallelReportEngine class from an airline.
+        """
+        # Assert that the engine holds the per-date counts, not one date ordinal per package
+        engine = ParallelReportEngine.from_airline(self.airline)
+        self.assertEqual(list(engine.days), list(self.airline.package_count_by_date))
+        self.assertEqual(sum(engine.counts), 100)
+        self.assertEqual(engine.transportation_fee.items(), self.airline.transportation_fee.items())
+
+    def test_report_matches_airline(self):
+        """
+        The method to test that the parallel report matches the Airline range report.
+        """
+        # Split the dates across two worker processes and assert that the report matches the Airline one
+        with ParallelReportEngine.from_airline(self.airline, workers=2, min_partition_size=2) as engine:
+            for start, end in (("28/12/2023", "03/01/2024"), ("31/12/2023", "31/12/2023")):
+                self.assertEqual(engine.get_transportation_report_range(start, end),
+                                 self.airline.get_transportation_report_range(start, end))
+
+    def test_report_from_package_store(self):
+        """
+        The method to test the report over the packages of a columnar store.
+        """
+        # Build the engine over a store with the same packages and assert that the report matches
+        store = PackageStore.from_packages(self.airline.packages)
+        engine = ParallelReportEngine.from_package_store(store, self.airline.transportation_fee, workers=1)
+        self.assertEqual(engine.get_transportation_report_range("28/12/2023", "03/01/2024"),
+                         self.airline.get_transportation_report_range("28/12/2023", "03/01/2024"))
+
+    def test_reuse_workers(self):
+        """
+        The method to test that the worker processes are reused across reports until the engine is closed.
+        """
+        # Run two reports on the packages of a store split in two and assert that they share the same pool
+        store = PackageStore.from_packages(self.airline.packages)
+        engine = ParallelReportEngine.from_package_store(store, self.airline.transportation_fee, workers=2,
+                                                         min_partition_size=10)
+        first = engine.get_transportation_report_range("28/12/2023", "03/01/2024")
+        executor = engine._executor
+        self.assertIsNotNone(executor)
+        self.assertEqual(engine.get_transportation_report_range("28/12/2023", "03/01/2024"), first)
+        self.assertIs(engine._executor, executor)
+        # Assert that closing the engine stops the pool
+        engine.close()
+        self.assertIsNone(engine._executor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from classes import Airline, AirlineSnapshot, PackageSketches, PartitionedAirline
+from utils import date_to_ordinal
+
+
+class TestPartitionedAirline(unittest.TestCase):
+    """
+    The TestPartitionedAirline class represents a set of unit tests for the PartitionedAirline class.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        tearDown: Cleans up the test environment after each test method.
+        test_compact: Tests that compacting archives the cold months and keeps the hot ones in memory.
+        test_reports_after_compact: Tests that reports are unchanged by archiving.
+        test_get_packages_from_archive: Tests that the packages of an archived date are loaded lazily.
+        test_add_package_to_archived_month: Tests that adding a package to an archived month brings it back to memory.
+        test_reopen: Tests that reopening the airline restores the counts and clients of the archive.
+        test_reopen_after_add_package_to_archived_month: Tests that a late package doesn't lose its month's archive.
+        test_reopen_from_summaries: Tests that reopening the airline reads the summaries instead of the partitions.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize a partitioned and an in-memory airline with the same packages over four months
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.directory = self.temporary_directory.name
+        self.airline = PartitionedAirline("Airline Name", self.directory, hot_months=2)
+        self.memory_airline = Airline("Airline Name")
+        dates = ["15/01/2024", "31/01/2024", "01/02/2024", "29/02/2024", "10/03/2024", "20/04/2024", "21/04/2024"]
+        for airline in (self.airline, self.memory_airline):
+            client = airline.add_client("Juan Pérez")
+            for index, date in enumerate(dates):
+                airline.add_package("Buenos Aires", "Córdoba" if index % 2 else "Rosario", client, date)
+            airline.add_transportation_fee("01/02/2024", 20)
+        self.today = date_to_ordinal("30/04/2024")
+
+    def tearDown(self):
+        """
+        The method to clean up the test environment after each test method.
+        """
+        self.temporary_directory.cleanup()
+
+    def test_compact(self):
+        """
+        The method to test that compacting archives the cold months and keeps the hot ones in memory.
+        """
+        # Assert that January and February were archived to files and that only March and April stay in memory
+        self.assertEqual(self.airline.compact(self.today), 4)
+        self.assertEqual(sorted(self.airline.archived.values()), [2, 2])
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ["packages-2024-01.bin", "packages-2024-01.summary.json.gz", "packages-2024-02.bin",
+                          "packages-2024-02.summary.json.gz"])
+        with AirlineSnapshot(os.path.join(self.directory, "packages-2024-01.bin")) as snapshot:
+            self.assertTrue(snapshot.compressed)
+            self.assertEqual(len(snapshot), 2)
+        self.assertEqual([package.date for package in self.airline.packages], ["10/03/2024", "20/04/2024",
+                                                                               "21/04/2024"])
+        # Assert that compacting again has nothing left to archive, and that every package can still be iterated
+        self.assertEqual(self.airline.compact(self.today), 0)
+        self.assertEqual([package.date for package in self.airline.iter_packages()],
+                         [package.date for package in self.memory_airline.packages])
+
+    def test_reports_after_compact(self):
+        """
+        The method to test that reports are unchanged by archiving.
+        """
+        # Archive the cold months and assert that every report matches the in-memory airline
+        self.airline.compact(self.today)
+        self.assertEqual(self.airline.get_total_transportation_report("31/01/2024"),
+                         self.memory_airline.get_total_transportation_report("31/01/2024"))
+        self.assertEqual(self.airline.get_transportation_report_range("01/01/2024", "30/04/2024"),
+                         self.memory_airline.get_transportation_report_range("01/01/2024", "30/04/2024"))
+        self.assertEqual(self.airline.get_client_report("Juan Pérez", "01/01/2024", "29/02/2024"),
+                         self.memory_airline.get_client_report("Juan Pérez", "01/01/2024", "29/02/2024"))
+        self.assertEqual(self.airline.get_route_report("Buenos Aires", "Rosario", "01/01/2024", "30/04/2024"),
+                         self.memory_airline.get_route_report("Buenos Aires", "Rosario", "01/01/2024", "30/04/2024"))
+
+    def test_get_packages_from_archive(self):
+        """
+        The method to test that the packages of an archived date are loaded lazily.
+        """
+        # Archive the cold months and assert that their packages are loaded, and cached, when asked for
+        self.airline.compact(self.today)
+        packages = self.airline.get_packages("29/02/2024")
+        self.assertEqual([(package.origin, package.destination, package.date) for package in packages],
+                         [("Buenos Aires", "Córdoba", "29/02/2024")])
+        self.assertIs(packages[0].client, self.airline.get_client("Juan Pérez"))
+        self.assertEqual(list(self.airline._partition_cache),
+                         [PartitionedAirline.get_month(date_to_ordinal("29/02/2024"))])
+        self.assertEqual(self.airline.get_packages("28/02/2024"), [])
+        self.assertEqual(len(self.airline.get_packages("20/04/2024")), 1)
+
+    def test_add_package_to_archived_month(self):
+        """
+        The method to test that adding a package to an archived month brings it back to memory.
+        """
+        # Archive the cold months, then add a package to January
+        self.airline.compact(self.today)
+        client = self.airline.get_client("Juan Pérez")
+        self.airline.add_package("Buenos Aires", "Rosario", client, "16/01/2024")
+        # Assert that January is held in memory again, with its archived packages and the new one, and its file kept
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ["packages-2024-01.bin", "packages-2024-01.summary.json.gz", "packages-2024-02.bin",
+                          "packages-2024-02.summary.json.gz"])
+        self.assertEqual(len(self.airline.packages), 6)
+        self.assertEqual(len(self.airline.get_packages("15/01/2024")), 1)
+        self.assertIn("Total packages transported: 1\n", self.airline.get_total_transportation_report("16/01/2024"))
+
+    def test_reopen(self):
+        """
+        The method to test that reopening the airline restores the counts and clients of the archive.
+        """
+        # Archive every month and reopen the airline over the same directory
+        self.airline.compact(date_to_ordinal("01/01/2025"))
+        airline = PartitionedAirline("Airline Name", self.directory)
+        # Assert that the counts and clients of the archive were restored without loading the packages in memory
+        self.assertEqual(airline.packages, [])
+        self.assertEqual(airline.package_count_by_date, self.memory_airline.package_count_by_date)
+        self.assertEqual(airline.get_client_report("Juan Pérez", "01/01/2024", "30/04/2024")["packages"], 7)
+
+    def test_reopen_after_add_package_to_archived_month(self):
+        """
+        The method to test that a late package doesn't lose its month's archive.
+        """
+        # Archive every month, add a package to January, and reopen the airline over the same directory
+        self.airline.compact(date_to_ordinal("01/01/2025"))
+        client = self.airline.get_client("Juan Pérez")
+        self.airline.add_package("Buenos Aires", "Rosario", client, "16/01/2024")
+        airline = PartitionedAirline("Airline Name", self.directory)
+        # Assert that the archived January packages are still there
+        self.assertEqual(airline.get_transportation_report_range("01/01/2024", "31/01/2024")["packages"], 2)
+        # Archive January again and assert that its file is rewritten with the late package
+        self.assertEqual(self.airline.compact(date_to_ordinal("01/01/2025")), 3)
+        airline = PartitionedAirline("Airline Name", self.directory)
+        self.assertEqual(airline.get_transportation_report_range("01/01/2024", "31/01/2024")["packages"], 3)
+
+
+    def test_reopen_from_summaries(self):
+        """
+        The method to test that reopening the airline reads the summaries instead of the partitions.
+        """
+        # Archive every month and assert that reopening restores the same counts without reading any partition
+        self.airline.compact(date_to_ordinal("01/01/2025"))
+        with mock.patch.object(PartitionedAirline, "_read_partition", side_effect=AssertionError):
+            airline = PartitionedAirline("Airline Name", self.directory)
+        for attribute in ("package_count_by_date", "package_count_by_client", "package_count_by_route"):
+            self.assertEqual(getattr(airline, attribute), getattr(self.memory_airline, attribute))
+        self.assertEqual([client.name for client in airline.clients], ["Juan Pérez"])
+        self.assertEqual(airline.archived, self.airline.archived)
+        # Remove a summary and assert that its partition is read and its summary written again
+        summary_path = os.path.join(self.directory, "packages-2024-01.summary.json.gz")
+        os.remove(summary_path)
+        airline = PartitionedAirline("Airline Name", self.directory)
+        self.assertEqual(airline.package_count_by_route, self.memory_airline.package_count_by_route)
+        self.assertTrue(os.path.exists(summary_path))
+        # Assert that the partitions are still read to fill the sketches
+        airline = PartitionedAirline("Airline Name", self.directory, sketches=PackageSketches())
+        self.assertEqual(airline.get_distinct_clients_estimate("01/01/2024", "30/04/2024")["clients"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
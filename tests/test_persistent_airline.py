@@ -0,0 +1,172 @@
+import os
+import tempfile
+import unittest
+
+from classes import AirlineSnapshot, Client, PersistentAirline
+
+
+class TestPersistentAirline(unittest.TestCase):
+    """
+    The TestPersistentAirline class represents a set of unit tests for the PersistentAirline class.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        tearDown: Cleans up the test environment after each test method.
+        test_reopen_replays_wal: Tests that reopening the airline replays the write-ahead log.
+        test_snapshot: Tests that a snapshot holds the whole state and empties the write-ahead log.
+        test_snapshot_every: Tests that a snapshot is written once the write-ahead log is full.
+        test_torn_wal_record: Tests that a torn last record of the write-ahead log is dropped.
+        test_torn_wal_record_then_writes: Tests that records written after a torn record are replayed.
+        test_crash_after_snapshot_replace: Tests that a log already held by the snapshot is not replayed again.
+        test_snapshot_unregistered_client: Tests the snapshot of a package whose client is not registered.
+        test_load_packages_is_logged: Tests that bulk loaded packages are logged.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize a persistent airline in a temporary directory with a few clients, packages and fees
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.directory = self.temporary_directory.name
+        self.airline = PersistentAirline("Airline Name", self.directory)
+        client = self.airline.add_client("Juan Pérez")
+        self.airline.add_client("María García")
+        self.airline.add_package("Buenos Aires", "Córdoba", client, "31/12/2023")
+        self.airline.add_package("Rosario", "Mendoza", client, "01/01/2024")
+        self.airline.add_transportation_fee("01/01/2024", "20")
+
+    def tearDown(self):
+        """
+        The method to clean up the test environment after each test method.
+        """
+        self.airline.close()
+        self.temporary_directory.cleanup()
+
+    def assertSameState(self, airline):
+        """
+        The method to assert that an airline holds the same state as the airline of the test.
+
+        Parameters:
+            airline (Airline): The airline to compare.
+        """
+        self.assertEqual([client.name for client in airline.clients], [client.name for client in self.airline.clients])
+        self.assertEqual([(package.origin, package.destination, package.client.name, package.date)
+                          for package in airline.packages],
+                         [(package.origin, package.destination, package.client.name, package.date)
+                          for package in self.airline.packages])
+        self.assertEqual(airline.transportation_fee.items(), self.airline.transportation_fee.items())
+        self.assertEqual(airline.package_count_by_date, self.airline.package_count_by_date)
+
+    def test_reopen_replays_wal(self):
+        """
+        The method to test that reopening the airline replays the write-ahead log.
+        """
+        # Reopen the airline and assert that its state was restored from the log alone
+        self.airline.close()
+        self.assertFalse(os.path.exists(os.path.join(self.directory, PersistentAirline.SNAPSHOT_FILE)))
+        with PersistentAirline("Airline Name", self.directory) as airline:
+            self.assertSameState(airline)
+            self.assertEqual(airline.wal_records, 5)
+            self.assertIs(airline.packages[0].client, airline.get_client("Juan Pérez"))
+
+    def test_snapshot(self):
+        """
+        The method to test that a snapshot holds the whole state and empties the write-ahead log.
+        """
+        # Write a snapshot, add another package, and assert that reopening restores both
+        self.airline.snapshot()
+        self.assertEqual(self.airline.generation, 1)
+        with open(os.path.join(self.directory, PersistentAirline.WAL_FILE), encoding="utf-8") as f:
+            self.assertEqual(f.read(), '["generation", 1]\n')
+        self.airline.add_package("La Plata", "Salta", self.airline.get_client("María García"), "01/01/2024")
+        self.airline.close()
+        with PersistentAirline("Airline Name", self.directory) as airline:
+            self.assertSameState(airline)
+            self.assertEqual(airline.wal_records, 1)
+            self.assertEqual(airline.get_transportation_fee("01/01/2024"), 20)
+
+    def test_snapshot_every(self):
+        """
+        The method to test that a snapshot is written once the write-ahead log is full.
+        """
+        # Reopen the airline with a small log and assert that adding packages writes snapshots
+        self.airline.close()
+        self.airline = PersistentAirline("Airline Name", self.directory, snapshot_every=3)
+        client = self.airline.get_client("Juan Pérez")
+        for _ in range(4):
+            self.airline.add_package("Buenos Aires", "Córdoba", client, "02/01/2024")
+        self.assertTrue(os.path.exists(os.path.join(self.directory, PersistentAirline.SNAPSHOT_FILE)))
+        self.assertLess(self.airline.wal_records, 3)
+        self.airline.close()
+        with PersistentAirline("Airline Name", self.directory) as airline:
+            self.assertSameState(airline)
+
+    def test_torn_wal_record(self):
+        """
+        The method to test that a torn last record of the write-ahead log is dropped.
+        """
+        # Append half a record to the log and assert that reopening ignores it
+        self.airline.close()
+        with open(os.path.join(self.directory, PersistentAirline.WAL_FILE), "a", encoding="utf-8") as f:
+            f.write('["package", "La Plata", "Sal')
+        with PersistentAirline("Airline Name", self.directory) as airline:
+            self.assertSameState(airline)
+
+    def test_torn_wal_record_then_writes(self):
+        """
+        The method to test that records written after a torn record are replayed.
+        """
+        # Tear the last record, add two packages after reopening, and assert that both are restored
+        self.airline.close()
+        with open(os.path.join(self.directory, PersistentAirline.WAL_FILE), "a", encoding="utf-8") as f:
+            f.write('["package", "La Plata", "Sal')
+        self.airline = PersistentAirline("Airline Name", self.directory)
+        client = self.airline.get_client("María García")
+        self.airline.add_package("La Plata", "Salta", client, "01/01/2024")
+        self.airline.add_package("Salta", "La Plata", client, "02/01/2024")
+        self.airline.close()
+        with PersistentAirline("Airline Name", self.directory) as airline:
+            self.assertSameState(airline)
+            self.assertEqual(len(airline.packages), 4)
+
+    def test_crash_after_snapshot_replace(self):
+        """
+        The method to test that a log already held by the snapshot is not replayed again.
+        """
+        # Replace the snapshot as snapshot() does but keep the previous log, as a crash before emptying it would
+        self.airline.close()
+        AirlineSnapshot.write(self.airline, os.path.join(self.directory, PersistentAirline.SNAPSHOT_FILE),
+                              sequence=self.airline.generation + 1)
+        with PersistentAirline("Airline Name", self.directory) as airline:
+            self.assertSameState(airline)
+            self.assertEqual(airline.wal_records, 0)
+            self.assertEqual(airline.generation, 1)
+
+    def test_snapshot_unregistered_client(self):
+        """
+        The method to test the snapshot of a package whose client is not registered.
+        """
+        # Add a package for a client that was never registered with a snapshot after every record
+        self.airline.close()
+        self.airline = PersistentAirline("Airline Name", self.directory, snapshot_every=1)
+        package = self.airline.add_package("La Plata", "Salta", Client("Unregistered Client"), "01/01/2024")
+        self.assertEqual(self.airline.wal_records, 0)
+        self.airline.close()
+        with PersistentAirline("Airline Name", self.directory) as airline:
+            self.assertEqual(airline.packages[-1].client.name, package.client.name)
+            self.assertEqual(len(airline.packages), 3)
+
+    def test_load_packages_is_logged(self):
+        """
+        The method to test that bulk loaded packages are logged.
+        """
+        # Load the fixtures and assert that reopening restores their packages and clients
+        self.airline.load_packages("tests/fixtures/packages.json", key="demo_packages")
+        self.airline.close()
+        with PersistentAirline("Airline Name", self.directory) as airline:
+            self.assertSameState(airline)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,165 @@
+import asyncio
+import unittest
+from datetime import datetime
+
+from classes import Airline, AirlineMetrics
+from service import AirlineService, AirlineServiceClient
+from utils import DATE_FORMAT, CLIENT_NOT_EXIST_VALIDATION_MSG, DATE_FORMAT_VALIDATION_MSG
+
+
+class TestAirlineService(unittest.IsolatedAsyncioTestCase):
+    """
+    The TestAirlineService class represents a set of unit tests for the AirlineService class.
+
+    Methods:
+        asyncSetUp: Starts a service and opens a client for each test method.
+        asyncTearDown: Closes the client and stops the service after each test method.
+        test_add_client_and_package: Tests the addition of a client and a package through the service.
+        test_add_get_transportation_fee: Tests the addition and retrieval of a transportation fee through the service.
+        test_get_reports: Tests the retrieval of daily and range reports through the service.
+        test_errors: Tests the responses to invalid requests.
+        test_concurrent_requests: Tests that concurrent writes and reads keep the airline consistent.
+        test_get_metrics: Tests the retrieval of the operation metrics through the service.
+    """
+
+    async def asyncSetUp(self):
+        """
+        The method to start a service and open a client for each test method.
+        """
+        # The test loop runs in debug mode, whose traceback capture would dominate the timing of many requests
+        asyncio.get_running_loop().set_debug(False)
+        self.airline = Airline("Airline Name")
+        self.service = AirlineService(self.airline)
+        await self.service.start()
+        self.client = AirlineServiceClient(self.service.host, self.service.port)
+
+    async def asyncTearDown(self):
+        """
+        The method to close the client and stop the service after each test method.
+        """
+        await self.client.close()
+        await self.service.stop()
+
+    async def test_add_client_and_package(self):
+        """
+        The method to test the addition of a client and a package through the service.
+        """
+        # Add a client and a package and assert that both were added to the airline
+        self.assertEqual(await self.client.post("/clients", name="Juan Pérez"), (200, {"name": "Juan Pérez"}))
+        status, package = await self.client.post("/packages", origin="Buenos Aires", destination="Córdoba",
+                                                  client="Juan Pérez", date="01/01/2024")
+        self.assertEqual(status, 200)
+        self.assertEqual(package, {"origin": "Buenos Aires", "destination": "Córdoba", "client": "Juan Pérez",
+                                   "date": "01/01/2024"})
+        self.assertEqual(len(self.airline.packages), 1)
+        self.assertIs(self.airline.packages[0].client, self.airline.get_client("Juan Pérez"))
+
+    async def test_add_get_transportation_fee(self):
+        """
+        The method to test the addition and retrieval of a transportation fee through the service.
+        """
+        # Add a fee and assert that it is in effect from its date
+        self.assertEqual(await self.client.post("/fees", date="01/01/2024", fee="20"),
+                         (200, {"date": "01/01/2024", "fee": 20}))
+        self.assertEqual(await self.client.get("/fees", date="02/01/2024"), (200, {"date": "02/01/2024", "fee": 20}))
+        self.assertEqual(await self.client.get("/fees", date="31/12/2023"), (200, {"date": "31/12/2023", "fee": 10}))
+
+    async def test_get_reports(self):
+        """
+        The method to test the retrieval of daily and range reports through the service.
+        """
+        # Add packages on two dates and assert that the reports count them
+        client = self.airline.add_client("Juan Pérez")
+        self.airline.add_package("Buenos Aires", "Córdoba", client, "01/01/2024")
+        self.airline.add_package("Rosario", "Mendoza", client, "02/01/2024")
+        self.assertEqual(await self.client.get("/reports", date="01/01/2024"),
+                         (200, {"date": "01/01/2024", "fee": 10, "packages": 1, "revenue": 10,
+                                "report": self.airline.get_total_transportation_report("01/01/2024")}))
+        # Assert that the daily report didn't build the prefix-sum index of range reports
+        self.assertIsNone(self.airline._report_index)
+        status, report = await self.client.get("/reports", start="31/12/2023", end="02/01/2024")
+        self.assertEqual(status, 200)
+        self.assertEqual((report["packages"], report["revenue"], len(report["days"])), (2, 20, 3))
+
+    async def test_errors(self):
+        """
+        The method to test the responses to invalid requests.
+        """
+        # Assert that unknown routes, missing fields and invalid values get error responses
+        self.assertEqual((await self.client.get("/unknown"))[0], 404)
+        self.assertEqual(await self.client.post("/clients"), (400, {"error": "Missing field 'name'"}))
+        self.assertEqual(await self.client.post("/packages", origin="Buenos Aires", destination="Córdoba",
+                                                client="Missing Client"),
+                         (400, {"error": CLIENT_NOT_EXIST_VALIDATION_MSG}))
+        self.assertEqual(await self.client.get("/reports", date="2024-01-01"),
+                         (400, {"error": DATE_FORMAT_VALIDATION_MSG}))
+        # Assert that the connection is still usable after the errors
+        self.assertEqual((await self.client.get("/fees", date="01/01/2024"))[0], 200)
+        # Assert that a malformed request line gets an error response before the connection is closed
+        reader, writer = await asyncio.open_connection(self.service.host, self.service.port)
+        writer.write(b"GET /fees\r\n\r\n")
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        self.assertTrue(response.startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+        self.assertTrue(response.endswith(b'{"error": "Malformed request"}'))
+        # Assert that negative and oversized body lengths get the same error response
+        for length in (-5, self.service.max_body_size + 1):
+            reader, writer = await asyncio.open_connection(self.service.host, self.service.port)
+            writer.write(f"POST /clients HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            self.assertTrue(response.startswith(b"HTTP/1.1 400 Bad Request\r\n"))
+            self.assertTrue(response.endswith(b'{"error": "Malformed request"}'))
+
+    async def test_concurrent_requests(self):
+        """
+        The method to test that concurrent writes and reads keep the airline consistent.
+        """
+        # Send many writes and reads from several connections at once
+        today = datetime.now().strftime(DATE_FORMAT)
+        connections, requests = 20, 50
+        clients = [AirlineServiceClient(self.service.host, self.service.port) for _ in range(connections)]
+
+        async def run(index, client):
+            for request in range(requests):
+                status, _ = await client.post("/clients", name=f"Client {request % 5}")
+                self.assertEqual(status, 200)
+                status, _ = await client.post("/packages", origin=f"Origin {index}", destination="Destination",
+                                              client=f"Client {request % 5}", date=today)
+                self.assertEqual(status, 200)
+                status, report = await client.get("/reports", date=today)
+                self.assertEqual(status, 200)
+                self.assertEqual(report["revenue"], report["packages"] * report["fee"])
+            await client.close()
+
+        await asyncio.gather(*(run(index, client) for index, client in enumerate(clients)))
+        # Assert that no package was lost and no client was duplicated
+        self.assertEqual(len(self.airline.packages), connections * requests)
+        self.assertEqual(len(self.airline.clients), 5)
+        status, report = await self.client.get("/reports", date=today)
+        self.assertEqual(report["packages"], connections * requests)
+
+    async def test_get_metrics(self):
+        """
+        The method to test the retrieval of the operation metrics through the service.
+        """
+        # Assert that the route only exists when the service has metrics
+        self.assertEqual((await self.client.get("/metrics"))[0], 404)
+        # Serve an instrumented airline and assert that its requests are recorded, as JSON and as Prometheus text
+        metrics = AirlineMetrics()
+        service = AirlineService(metrics.instrument(Airline("Airline Name")), metrics=metrics)
+        await service.start()
+        async with AirlineServiceClient(service.host, service.port) as client:
+            await client.post("/clients", name="Juan Pérez")
+            status, payload = await client.get("/metrics")
+            self.assertEqual((status, payload["add_client"]["count"]), (200, 1))
+            status, text = await client.get("/metrics", format="prometheus")
+            self.assertEqual(status, 200)
+            self.assertIn('airline_operation_seconds_count{operation="add_client"} 1\n', text)
+        await service.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+from collections import Counter
+
+from classes import HyperLogLog, SpaceSaving, PackageSketches, Client, Package
+from utils import SKETCH_CAPACITY_VALIDATION_MSG, SKETCH_MERGE_VALIDATION_MSG, SKETCH_PRECISION_VALIDATION_MSG, \
+    date_to_ordinal
+
+
+class TestHyperLogLog(unittest.TestCase):
+    """
+    The TestHyperLogLog class represents a set of unit tests for the HyperLogLog class.
+
+    Methods:
+        test_estimate: Tests that the estimates stay within the documented error.
+        test_update: Tests the merge of two sketches.
+        test_invalid_precision: Tests the initialization with an invalid precision.
+    """
+
+    def test_estimate(self):
+        """
+        The method to test that the estimates stay within the documented error.
+        """
+        # Add distinct strings, each of them twice, and assert that the estimates are within three standard errors
+        for count in (0, 10, 1000, 50000):
+            sketch = HyperLogLog()
+            for index in range(count):
+                sketch.add(f"Client {index}")
+                sketch.add(f"Client {index}")
+            self.assertLessEqual(abs(sketch.estimate() - count), 3 * sketch.error * count)
+        self.assertEqual(len(sketch.registers), 1024)
+
+    def test_update(self):
+        """
+        The method to test the merge of two sketches.
+        """
+        # Add overlapping strings to two sketches and assert that the merge estimates their union
+        first, second = HyperLogLog(), HyperLogLog()
+        for index in range(300):
+            first.add(f"Client {index}")
+            second.add(f"Client {index + 200}")
+        first.update(second)
+        self.assertLessEqual(abs(first.estimate() - 500), 3 * first.error * 500)
+        # Assert that sketches of different precisions can't be merged
+        with self.assertRaises(ValueError) as context:
+            first.update(HyperLogLog(precision=12))
+        self.assertTrue(SKETCH_MERGE_VALIDATION_MSG in str(context.exception))
+
+    def test_invalid_precision(self):
+        """
+        The method to test the initialization with an invalid precision.
+        """
+        # Assert that a precision out of range raises a ValueError
+        with self.assertRaises(ValueError) as context:
+            HyperLogLog(precision=20)
+        self.assertTrue(SKETCH_PRECISION_VALIDATION_MSG in str(context.exception))
+
+
+class TestSpaceSaving(unittest.TestCase):
+    """
+    The TestSpaceSaving class represents a set of unit tests for the SpaceSaving class.
+
+    Methods:
+        test_get_top: Tests that the most frequent items are kept with their counts.
+        test_error_bounds: Tests the documented error bounds on a skewed stream.
+        test_invalid_capacity: Tests the initialization with an invalid capacity.
+    """
+
+    def test_get_top(self):
+        """
+        The method to test that the most frequent items are kept with their counts.
+        """
+        # Add items that fit in the counters and assert that their counts are exact
+        sketch = SpaceSaving(capacity=3)
+        for item in "abacab":
+            sketch.add(item)
+        self.assertEqual(sketch.get_top(), [("a", 3, 0), ("b", 2, 0), ("c", 1, 0)])
+        # Assert that a new item replaces the least frequent one and inherits its count as error
+        sketch.add("d")
+        self.assertEqual(sketch.get_top(2), [("a", 3, 0), ("b", 2, 0)])
+        self.assertEqual(sketch.get_top()[2], ("d", 2, 1))
+        self.assertEqual(sketch.total, 7)
+
+    def test_error_bounds(self):
+        """
+        The method to test the documented error bounds on a skewed stream.
+        """
+        # Add a skewed stream of items to a sketch with fewer counters than items
+        stream = [index % (index % 17 + 1) for index in range(5000)]
+        sketch = SpaceSaving(capacity=5)
+        for item in stream:
+            sketch.add(item)
+        counts = Counter(stream)
+        # Assert that every count bounds the exact one and that every frequent item is kept
+        for item, count, error in sketch.get_top(5):
+            self.assertLessEqual(error, len(stream) / 5)
+            self.assertTrue(count - error <= counts[item] <= count)
+        kept = {item for item, _, _ in sketch.get_top(5)}
+        self.assertTrue(all(item in kept for item, count in counts.items() if count > len(stream) / 5))
+
+    def test_invalid_capacity(self):
+        """
+        The method to test the initialization with an invalid capacity.
+        """
+        # Assert that a capacity lower than 1 raises a ValueError
+        with self.assertRaises(ValueError) as context:
+            SpaceSaving(capacity=0)
+        self.assertTrue(SKETCH_CAPACITY_VALIDATION_MSG in str(context.exception))
+
+
+class TestPackageSketches(unittest.TestCase):
+    """
+    The TestPackageSketches class represents a set of unit tests for the PackageSketches class.
+
+    Methods:
+        test_add: Tests that packages update the client sketch of their date and the route sketch.
+    """
+
+    def test_add(self):
+        """
+        The method to test that packages update the client sketch of their date and the route sketch.
+        """
+        # Add packages of two clients on two dates
+        sketches = PackageSketches(precision=8, routes=10)
+        first, second = Client("Juan Pérez"), Client("María López")
+        for client, date in ((first, "01/01/2024"), (second, "01/01/2024"), (first, "02/01/2024")):
+            sketches.add(Package("Buenos Aires", "Córdoba", client, date))
+        # Assert that each date has its own client sketch and that the route was counted once per package
+        self.assertEqual(sorted(sketches.clients_by_date),
+                         [date_to_ordinal("01/01/2024"), date_to_ordinal("02/01/2024")])
+        self.assertEqual(sketches.get_distinct_clients(date_to_ordinal("01/01/2024"), date_to_ordinal("01/01/2024")), 2)
+        self.assertEqual(sketches.get_distinct_clients(date_to_ordinal("02/01/2024"), date_to_ordinal("02/01/2024")), 1)
+        self.assertEqual(sketches.routes.get_top(), [(("Buenos Aires", "Córdoba"), 3, 0)])
+        self.assertEqual(sketches.client_error, 1.04 / 16)
+
+
+if __name__ == "__main__":
+    unittest.main()
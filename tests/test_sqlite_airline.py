@@ -0,0 +1,273 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from classes import Airline, Client, SQLiteAirline
+from utils import DATE_FORMAT, CLIENT_NOT_EXIST_VALIDATION_MSG, PACKAGE_CLIENT_VALIDATION_MSG, \
+    DATE_INTERVAL_VALIDATION_MSG, DATE_FORMAT_VALIDATION_MSG
+
+
+class TestSQLiteAirline(unittest.TestCase):
+    """
+    The TestSQLiteAirline class represents a set of unit tests for the SQLiteAirline class.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        tearDown: Cleans up the test environment after each test method.
+        test_init: Tests the initialization of the SQLiteAirline class.
+        test_add_client: Tests the addition of clients to the SQLiteAirline class.
+        test_add_package: Tests the addition of a package to the SQLiteAirline class.
+        test_add_package_with_invalid_client: Tests the addition of a package with an invalid client.
+        test_add_packages: Tests the addition of a batch of packages with invalid rows.
+        test_add_get_transportation_fee: Tests the addition and retrieval of transportation fees.
+        test_get_transportation_fees: Tests the retrieval of the transportation fees of many dates at once.
+        test_get_total_transportation_report: Tests that the report matches the in-memory Airline report.
+        test_report_uses_date_index: Tests that the report counts packages through the date index.
+        test_reopen: Tests that the state is kept in the database file after closing it.
+        test_get_packages_with_invalid_date: Tests that an invalid date has no packages, as in the Airline class.
+        test_load_packages: Tests that a bulk load matches the one of the in-memory Airline class.
+        test_get_transportation_report_range: Tests that the range report matches the in-memory Airline report.
+        test_get_client_and_route_reports: Tests that the client and route reports match the in-memory Airline ones.
+        test_reports_use_indexes: Tests that the range, client and route reports count packages through indexes.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize an in-memory and an SQLite airline with the same packages from a fixtures file
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temporary_directory.name, "airline.db")
+        self.airline = SQLiteAirline("Airline Name", self.path, batch_size=2)
+        self.memory_airline = Airline("Airline Name")
+
+        with open("tests/fixtures/packages.json", "r", encoding="utf-8") as f:
+            packages_data = json.load(f)[0]["demo_packages"]
+
+        for airline in (self.airline, self.memory_airline):
+            for package_data in packages_data:
+                client = airline.add_client(package_data["client_str"])
+                airline.add_package(package_data["origin"], package_data["destination"], client,
+                                    package_data.get("date") or datetime.now().strftime(DATE_FORMAT))
+
+    def tearDown(self):
+        """
+        The method to clean up the test environment after each test method.
+        """
+        self.airline.close()
+        self.temporary_directory.cleanup()
+
+    def test_init(self):
+        """
+        The method to test the initialization of the SQLiteAirline class.
+        """
+        # Assert that the airline holds the same clients and packages as the in-memory airline
+        self.assertEqual(self.airline.name, "Airline Name")
+        self.assertEqual([client.name for client in self.airline.clients],
+                         [client.name for client in self.memory_airline.clients])
+        self.assertEqual([(package.origin, package.destination, package.client.name, package.date)
+                          for package in self.airline.packages],
+                         [(package.origin, package.destination, package.client.name, package.date)
+                          for package in self.memory_airline.packages])
+
+    def test_add_client(self):
+        """
+        The method to test the addition of clients to the SQLiteAirline class.
+        """
+        # Add a new and an existing client and assert that only the new one was added
+        client = self.airline.add_client("New Client")
+        self.assertIs(self.airline.add_client("New Client"), client)
+        self.assertIs(self.airline.get_client("New Client"), client)
+        self.assertEqual(len(self.airline.clients), len(self.memory_airline.clients) + 1)
+        with self.assertRaises(ValueError) as context:
+            self.airline.get_client("Missing Client")
+        self.assertTrue(CLIENT_NOT_EXIST_VALIDATION_MSG in str(context.exception))
+
+    def test_add_package(self):
+        """
+        The method to test the addition of a package to the SQLiteAirline class.
+        """
+        # Add a package for an unregistered client and assert that both are stored
+        client = Client("Unregistered Client")
+        package = self.airline.add_package("Origin", "Destination", client, "02/02/2024")
+        self.assertEqual(package.client, client)
+        self.assertEqual([(package.origin, package.destination, package.client.name)
+                          for package in self.airline.get_packages("02/02/2024")],
+                         [("Origin", "Destination", "Unregistered Client")])
+
+    def test_add_package_with_invalid_client(self):
+        """
+        The method to test the addition of a package with an invalid client.
+        """
+        # Assert that adding a package with an invalid client raises a ValueError
+        with self.assertRaises(ValueError) as context:
+            self.airline.add_package("Origin", "Destination", "Invalid Client", "01/01/2024")
+        self.assertTrue(PACKAGE_CLIENT_VALIDATION_MSG in str(context.exception))
+
+    def test_add_packages(self):
+        """
+        The method to test the addition of a batch of packages with invalid rows.
+        """
+        # Add a batch with an unregistered client, a client given by name, and invalid rows
+        name = self.airline.clients[0].name
+        result = self.airline.add_packages([
+            ("Origin", "Destination", Client("Unregistered Client"), "02/02/2024"),
+            ("Origin", "Origin", Client("Unregistered Client"), "02/02/2024"),
+            ("Destination", "Origin", name, "02/02/2024"),
+            ("Origin", "Destination", "Missing Client", "02/02/2024"),
+        ])
+        # Assert that only the valid packages were stored and that the invalid rows were reported
+        self.assertEqual(len(result["packages"]), 2)
+        self.assertEqual([number for number, message in result["errors"]], [2, 4])
+        self.assertEqual([(package.origin, package.destination, package.client.name)
+                          for package in self.airline.get_packages("02/02/2024")],
+                         [("Origin", "Destination", "Unregistered Client"), ("Destination", "Origin", name)])
+        self.assertIn("Unregistered Client", [client.name for client in self.airline.clients])
+
+    def test_add_get_transportation_fee(self):
+        """
+        The method to test the addition and retrieval of transportation fees.
+        """
+        # Add fees and assert that each date gets the latest fee that is not later than it
+        self.airline.add_transportation_fee("31/12/2023", 20)
+        self.airline.add_transportation_fee("01/01/2024", "30")
+        self.assertEqual(self.airline.get_transportation_fee("30/12/2023"), 10)
+        self.assertEqual(self.airline.get_transportation_fee("31/12/2023"), 20)
+        self.assertEqual(self.airline.get_transportation_fee("02/01/2024"), 30)
+
+    def test_get_transportation_fees(self):
+        """
+        The method to test the retrieval of the transportation fees of many dates at once.
+        """
+        # Add fees and assert that each date gets the same fee as a single lookup
+        self.airline.add_transportation_fee("31/12/2023", 20)
+        self.airline.add_transportation_fee("01/01/2024", 30)
+        dates = ["02/01/2024", "30/12/2023", "31/12/2023"]
+        self.assertEqual(list(self.airline.get_transportation_fees(dates)), [30, 10, 20])
+
+    def test_get_total_transportation_report(self):
+        """
+        The method to test that the report matches the in-memory Airline report.
+        """
+        # Add the same fees to both airlines and assert that their reports match
+        for airline in (self.airline, self.memory_airline):
+            airline.add_transportation_fee("01/01/2024", 20)
+        for date in ("31/12/2023", "01/01/2024", "1/1/2024", "02/01/2024", datetime.now().strftime(DATE_FORMAT)):
+            self.assertEqual(self.airline.get_total_transportation_report(date),
+                             self.memory_airline.get_total_transportation_report(date))
+
+    def test_report_uses_date_index(self):
+        """
+        The method to test that the report counts packages through the date index.
+        """
+        # Assert that the query plan of the report count searches the date index
+        plan = self.airline.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM packages WHERE day = ?", (0,)).fetchall()
+        self.assertTrue(any("idx_packages_day" in row[-1] for row in plan))
+
+    def test_reopen(self):
+        """
+        The method to test that the state is kept in the database file after closing it.
+        """
+        # Add a fee, reopen the database, and assert that the clients, packages and fee are still there
+        self.airline.add_transportation_fee("01/01/2024", 20)
+        report = self.airline.get_total_transportation_report("01/01/2024")
+        self.airline.close()
+        self.airline = SQLiteAirline("Airline Name", self.path)
+        self.assertEqual(len(self.airline.clients), len(self.memory_airline.clients))
+        self.assertEqual(self.airline.get_total_transportation_report("01/01/2024"), report)
+
+    def test_get_packages_with_invalid_date(self):
+        """
+        The method to test that an invalid date has no packages, as in the Airline class.
+        """
+        # Assert that dates that can't be parsed have no packages in either airline
+        for date in ("2024-01-01", "31/02/2024", ""):
+            self.assertEqual(self.airline.get_packages(date), [])
+            self.assertEqual(self.memory_airline.get_packages(date), [])
+
+    def test_load_packages(self):
+        """
+        The method to test that a bulk load matches the one of the in-memory Airline class.
+        """
+        # Load a file with invalid records and a malformed line into both airlines and assert that they match
+        lines = [
+            json.dumps({"origin": "Origin", "destination": "Destination", "client_str": "New Client",
+                        "date": "01/01/2024"}),
+            json.dumps({"origin": "Origin", "destination": "Origin", "client_str": "Same City Client"}),
+            '{"origin": "Origin", "destination"',
+            json.dumps({"origin": "Origin", "client_str": "Missing Destination Client"}),
+            json.dumps({"origin": "Destination", "destination": "Origin", "client_str": "New Client",
+                        "date": "02/01/2024"}),
+        ]
+        path = os.path.join(self.temporary_directory.name, "packages.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+        stats = self.airline.load_packages(path, batch_size=2)
+        memory_stats = self.memory_airline.load_packages(path, batch_size=2)
+        self.assertEqual((stats["packages"], stats["errors"]), (memory_stats["packages"], memory_stats["errors"]))
+        self.assertEqual([number for number, message in stats["errors"]], [2, 3, 4])
+        self.assertEqual([client.name for client in self.airline.clients],
+                         [client.name for client in self.memory_airline.clients])
+        self.assertEqual([(package.origin, package.destination, package.client.name, package.date)
+                          for package in self.airline.packages],
+                         [(package.origin, package.destination, package.client.name, package.date)
+                          for package in self.memory_airline.packages])
+
+    def test_get_transportation_report_range(self):
+        """
+        The method to test that the range report matches the in-memory Airline report.
+        """
+        # Add the same fees to both airlines and assert that their range reports match
+        for airline in (self.airline, self.memory_airline):
+            airline.add_transportation_fee("01/01/2024", 20)
+        for start, end in (("29/12/2023", "03/01/2024"), ("01/01/2024", "01/01/2024"),
+                           ("01/01/2024", datetime.now().strftime(DATE_FORMAT))):
+            self.assertEqual(self.airline.get_transportation_report_range(start, end),
+                             self.memory_airline.get_transportation_report_range(start, end))
+        # Assert that invalid intervals raise the same errors
+        for start, end, message in (("02/01/2024", "01/01/2024", DATE_INTERVAL_VALIDATION_MSG),
+                                    ("2024-01-01", "02/01/2024", DATE_FORMAT_VALIDATION_MSG)):
+            for airline in (self.airline, self.memory_airline):
+                with self.assertRaises(ValueError) as context:
+                    airline.get_transportation_report_range(start, end)
+                self.assertTrue(message in str(context.exception))
+
+    def test_get_client_and_route_reports(self):
+        """
+        The method to test that the client and route reports match the in-memory Airline ones.
+        """
+        # Add the same fees to both airlines and assert that the report of every client and route matches
+        for airline in (self.airline, self.memory_airline):
+            airline.add_transportation_fee("01/01/2024", 20)
+        start, end = "01/12/2023", datetime.now().strftime(DATE_FORMAT)
+        for client in self.memory_airline.clients:
+            self.assertEqual(self.airline.get_client_report(client.name, start, end),
+                             self.memory_airline.get_client_report(client.name, start, end))
+        for origin, destination in {(package.origin, package.destination) for package in self.memory_airline.packages}:
+            self.assertEqual(self.airline.get_route_report(origin, destination, start, end),
+                             self.memory_airline.get_route_report(origin, destination, start, end))
+        self.assertEqual(self.airline.get_route_report("Nowhere", "Origin", start, end),
+                         self.memory_airline.get_route_report("Nowhere", "Origin", start, end))
+        # Assert that an unknown client raises the same error
+        with self.assertRaises(ValueError) as context:
+            self.airline.get_client_report("Missing Client", start, end)
+        self.assertTrue(CLIENT_NOT_EXIST_VALIDATION_MSG in str(context.exception))
+
+    def test_reports_use_indexes(self):
+        """
+        The method to test that the range, client and route reports count packages through indexes.
+        """
+        # Assert that the query plan of each GROUP BY count searches its index instead of scanning the packages
+        for condition, parameters, index in (("1", (), "idx_packages_day"),
+                                             ("client_id = ?", (1,), "idx_packages_client"),
+                                             ("origin = ? AND destination = ?", ("A", "B"), "idx_packages_route")):
+            plan = self.airline.connection.execute(
+                f"EXPLAIN QUERY PLAN SELECT day, COUNT(*) FROM packages WHERE {condition} AND day BETWEEN ? AND ? "
+                "GROUP BY day", (*parameters, 0, 1)).fetchall()
+            self.assertTrue(any(index in row[-1] for row in plan), plan)
+
+if __name__ == "__main__":
+    unittest.main()
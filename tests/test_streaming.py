@@ -0,0 +1,94 @@
+import io
+import json
+import unittest
+
+from utils import iter_json_records
+
+
+class TestStreaming(unittest.TestCase):
+    """
+    The TestStreaming class represents a set of unit tests for the streaming JSON reader.
+
+    Methods:
+        setUp: Sets up the test environment for each test method.
+        test_iter_json_array: Tests the iteration over the records of a JSON array.
+        test_iter_json_lines: Tests the iteration over the records of a newline-delimited JSON file.
+        test_iter_nested_records: Tests the iteration over records nested under a key.
+        test_iter_empty_file: Tests the iteration over an empty file.
+        test_iter_truncated_array: Tests the iteration over a truncated JSON array.
+        test_iter_malformed_lines: Tests the iteration over a newline-delimited JSON file with malformed lines.
+        test_iter_lines_with_unicode_separators: Tests that only newlines separate the records of a JSON lines file.
+    """
+
+    def setUp(self):
+        """
+        The method to set up the test environment for each test method.
+        """
+        # Initialize a list of records spanning several reads of a small chunk size
+        self.records = [{"origin": f"Origin {i}", "destination": "Destination", "client_str": "Juan Pérez"}
+                        for i in range(50)]
+
+    def test_iter_json_array(self):
+        """
+        The method to test the iteration over the records of a JSON array.
+        """
+        # Assert that the records are read back whole with a chunk size smaller than a record
+        file = io.StringIO(" \n" + json.dumps(self.records, indent=2))
+        self.assertEqual(list(iter_json_records(file, chunk_size=7)), self.records)
+
+    def test_iter_json_lines(self):
+        """
+        The method to test the iteration over the records of a newline-delimited JSON file.
+        """
+        # Assert that the records are read back whole, skipping blank lines
+        file = io.StringIO("\n".join(json.dumps(record) for record in self.records) + "\n\n")
+        self.assertEqual(list(iter_json_records(file, chunk_size=7)), self.records)
+
+    def test_iter_nested_records(self):
+        """
+        The method to test the iteration over records nested under a key.
+        """
+        # Assert that only the records under the key are yielded, in order
+        file = io.StringIO(json.dumps([{"demo_packages": self.records[:3]}, {"demo_packages": self.records[3:]}]))
+        self.assertEqual(list(iter_json_records(file, key="demo_packages", chunk_size=16)), self.records)
+
+    def test_iter_empty_file(self):
+        """
+        The method to test the iteration over an empty file.
+        """
+        # Assert that empty files and arrays yield no records
+        self.assertEqual(list(iter_json_records(io.StringIO("  \n"))), [])
+        self.assertEqual(list(iter_json_records(io.StringIO("[ ]"))), [])
+
+    def test_iter_truncated_array(self):
+        """
+        The method to test the iteration over a truncated JSON array.
+        """
+        # Assert that a truncated array raises a JSONDecodeError
+        file = io.StringIO(json.dumps(self.records)[:-20])
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_records(file, chunk_size=7))
+
+    def test_iter_malformed_lines(self):
+        """
+        The method to test the iteration over a newline-delimited JSON file with malformed lines.
+        """
+        # Assert that each malformed line yields its decoding error and that the following lines are still read
+        lines = [json.dumps(self.records[0]), '{"origin": "Origin",', json.dumps(self.records[1])]
+        records = list(iter_json_records(io.StringIO("\n".join(lines)), chunk_size=7))
+        self.assertEqual([records[0], records[2]], self.records[:2])
+        self.assertIsInstance(records[1], json.JSONDecodeError)
+
+    def test_iter_lines_with_unicode_separators(self):
+        """
+        The method to test that only newlines separate the records of a JSON lines file.
+        """
+        # Assert that records holding unescaped line separators decode whole, in the first chunk and after it
+        record = {"origin": "x\u2028y\u2029z\x85w\x0cv", "destination": "Destination"}
+        text = "\n".join([json.dumps(record, ensure_ascii=False)] * 3)
+        self.assertEqual(list(iter_json_records(io.StringIO(text))), [record] * 3)
+        self.assertEqual(list(iter_json_records(io.StringIO(text), chunk_size=1)), [record] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
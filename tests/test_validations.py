@@ -0,0 +1,134 @@
+import unittest
+from datetime import date, timedelta
+
+from array import array
+
+from utils import date_format_validation, date_range_validation, date_min_validation, date_interval_validation, \
+    date_interval_range_validation, package_date_validation, package_days_validation, date_to_ordinal, \
+    ordinal_to_date, today_ordinal, DATE_FORMAT, DATE_FORMAT_VALIDATION_MSG, DATE_RANGE_VALIDATION_MSG, \
+    DATE_MIN_VALIDATION_MSG, DATE_INTERVAL_VALIDATION_MSG, PACKAGE_DATE_VALIDATION_MSG, DATE_MAX_ORDINAL, \
+    DATE_MIN_ORDINAL
+
+
+class TestValidations(unittest.TestCase):
+    """
+    The TestValidations class represents a set of unit tests for the date parsing and validation functions.
+
+    Methods:
+        test_date_to_ordinal: Tests the conversion between dates and ordinals.
+        test_date_to_ordinal_is_cached: Tests that date parsing is served from the cache after the first call.
+        test_date_format_validation: Tests the validation of the date format.
+        test_date_range_validation: Tests the validation of the date range.
+        test_date_min_validation: Tests the validation of the minimum date.
+        test_date_interval_validation: Tests the validation of a date interval.
+        test_date_interval_range_validation: Tests the validation of the dates and the interval of a report.
+        test_package_date_validation: Tests the validation of a package date given as a string or an ordinal.
+        test_package_days_validation: Tests the validation of a column of package date ordinals.
+    """
+
+    def test_date_to_ordinal(self):
+        """
+        The method to test the conversion between dates and ordinals.
+        """
+        # Assert that a date converts to its ordinal and back
+        self.assertEqual(date_to_ordinal("31/12/2023"), date(2023, 12, 31).toordinal())
+        self.assertEqual(ordinal_to_date(date(2023, 12, 31).toordinal()), "31/12/2023")
+
+    def test_date_to_ordinal_is_cached(self):
+        """
+        The method to test that date parsing is served from the cache after the first call.
+        """
+        # Parse the same date twice and assert that the second call is a cache hit
+        date_to_ordinal("15/08/1999")
+        hits = date_to_ordinal.cache_info().hits
+        date_to_ordinal("15/08/1999")
+        self.assertEqual(date_to_ordinal.cache_info().hits, hits + 1)
+
+    def test_date_format_validation(self):
+        """
+        The method to test the validation of the date format.
+        """
+        # Assert that a valid date returns its ordinal and that invalid ones raise a ValueError
+        self.assertEqual(date_format_validation("01/01/2024"), date(2024, 1, 1).toordinal())
+        for invalid_date in ("2024-01-01", "31/02/2024", ""):
+            with self.assertRaises(ValueError) as context:
+                date_format_validation(invalid_date)
+            self.assertTrue(DATE_FORMAT_VALIDATION_MSG in str(context.exception))
+
+    def test_date_range_validation(self):
+        """
+        The method to test the validation of the date range.
+        """
+        # Assert that today is in range and that tomorrow and dates before the minimum are not
+        today = date.today()
+        self.assertEqual(date_range_validation(today.strftime(DATE_FORMAT)), today.toordinal())
+        for invalid_date in ((today + timedelta(days=1)).strftime(DATE_FORMAT), "31/12/1969"):
+            with self.assertRaises(ValueError) as context:
+                date_range_validation(invalid_date)
+            self.assertTrue(DATE_RANGE_VALIDATION_MSG in str(context.exception))
+
+    def test_date_min_validation(self):
+        """
+        The method to test the validation of the minimum date.
+        """
+        # Assert that the minimum date is valid and that the day before is not
+        self.assertEqual(date_min_validation("01/01/1970"), date(1970, 1, 1).toordinal())
+        with self.assertRaises(ValueError) as context:
+            date_min_validation("31/12/1969")
+        self.assertTrue(DATE_MIN_VALIDATION_MSG in str(context.exception))
+
+    def test_date_interval_validation(self):
+        """
+        The method to test the validation of a date interval.
+        """
+        # Assert that intervals compare dates chronologically
+        date_interval_validation("31/12/2023", "01/01/2024")
+        date_interval_validation("01/01/2024", "01/01/2024")
+        with self.assertRaises(ValueError) as context:
+            date_interval_validation("01/01/2024", "31/12/2023")
+        self.assertTrue(DATE_INTERVAL_VALIDATION_MSG in str(context.exception))
+
+    def test_date_interval_range_validation(self):
+        """
+        The method to test the validation of the dates and the interval of a report.
+        """
+        # Assert that a valid interval returns its ordinals, and that the format is checked before the range
+        self.assertEqual(date_interval_range_validation("31/12/2023", "1/1/2024"),
+                         (date_to_ordinal("31/12/2023"), date_to_ordinal("01/01/2024")))
+        for start, end, message in (("31/12/1969", "2024-01-01", DATE_FORMAT_VALIDATION_MSG),
+                                    ("31/12/1969", "01/01/2024", DATE_RANGE_VALIDATION_MSG),
+                                    ("01/01/2024", "31/12/2023", DATE_INTERVAL_VALIDATION_MSG)):
+            with self.assertRaises(ValueError) as context:
+                date_interval_range_validation(start, end)
+            self.assertTrue(message in str(context.exception))
+
+
+    def test_package_date_validation(self):
+        """
+        The method to test the validation of a package date given as a string or an ordinal.
+        """
+        # Assert that strings, ordinals and empty dates give ordinals, and that the rest raise a ValueError
+        self.assertEqual(package_date_validation("1/1/2024"), date_to_ordinal("01/01/2024"))
+        self.assertEqual(package_date_validation(DATE_MAX_ORDINAL), DATE_MAX_ORDINAL)
+        self.assertEqual(package_date_validation(None), today_ordinal())
+        for invalid_date in (True, 0, -1, DATE_MIN_ORDINAL - 1, DATE_MAX_ORDINAL + 1, 10 ** 12, "31/12/1969"):
+            with self.assertRaises(ValueError) as context:
+                package_date_validation(invalid_date)
+            self.assertTrue(PACKAGE_DATE_VALIDATION_MSG in str(context.exception))
+
+    def test_package_days_validation(self):
+        """
+        The method to test the validation of a column of package date ordinals.
+        """
+        # Assert that a valid column is returned as an array and that any invalid ordinal raises a ValueError
+        self.assertEqual(package_days_validation([DATE_MIN_ORDINAL, DATE_MAX_ORDINAL]),
+                         array("i", [DATE_MIN_ORDINAL, DATE_MAX_ORDINAL]))
+        self.assertEqual(package_days_validation([]), array("i"))
+        for invalid_days in ([DATE_MIN_ORDINAL, 0], [DATE_MAX_ORDINAL + 1], [10 ** 12], [True], ["01/01/2024"]):
+            with self.assertRaises(ValueError) as context:
+                package_days_validation(invalid_days)
+            self.assertTrue(PACKAGE_DATE_VALIDATION_MSG in str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
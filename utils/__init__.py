@@ -1,17 +1,75 @@
-from .constants import AIRLINE_NAME_VALIDATION_MSG
-from .constants import CLIENT_NAME_VALIDATION_MSG
-from .constants import CLIENT_NOT_EXIST_VALIDATION_MSG
-from .constants import DATE_FORMAT
-from .constants import DATE_FORMAT_VALIDATION_MSG
-from .constants import DATE_MIN
-from .constants import DATE_MIN_VALIDATION_MSG
-from .constants import DATE_RANGE_VALIDATION_MSG
-from .constants import FEE_INT_VALIDATION_MSG
-from .constants import PACKAGE_CLIENT_VALIDATION_MSG
-from .constants import PACKAGE_DESTINATION_VALIDATION_MSG
-from .constants import PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG
-from .constants import PACKAGE_ORIGIN_VALIDATION_MSG
-from .validations import date_format_validation
-from .validations import date_min_validation
-from .validations import date_range_validation
-from .validations import int_fee_validation
+import importlib
+
+# The names exported by the package, mapped to the submodule defining them. Submodules are imported on first access
+# (PEP 562), so the constants don't pull in the date parsing and JSON streaming modules.
+_EXPORTS = {
+    "AIRLINE_NAME_VALIDATION_MSG": "constants",
+    "CLIENT_NAME_VALIDATION_MSG": "constants",
+    "CLIENT_NOT_EXIST_VALIDATION_MSG": "constants",
+    "DATE_CACHE_SIZE": "constants",
+    "DATE_FORMAT": "constants",
+    "DATE_FORMAT_VALIDATION_MSG": "constants",
+    "DATE_INTERVAL_VALIDATION_MSG": "constants",
+    "DATE_MAX": "constants",
+    "DATE_MIN": "constants",
+    "DATE_MIN_VALIDATION_MSG": "constants",
+    "DATE_RANGE_VALIDATION_MSG": "constants",
+    "FEE_INT_VALIDATION_MSG": "constants",
+    "JSON_RECORD_VALIDATION_MSG": "constants",
+    "PACKAGE_CLIENT_VALIDATION_MSG": "constants",
+    "PACKAGE_DATE_VALIDATION_MSG": "constants",
+    "PACKAGE_DESTINATION_VALIDATION_MSG": "constants",
+    "PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG": "constants",
+    "PACKAGE_ORIGIN_VALIDATION_MSG": "constants",
+    "REPORT_CACHE_SIZE": "constants",
+    "SKETCHES_DISABLED_VALIDATION_MSG": "constants",
+    "SKETCH_CAPACITY_VALIDATION_MSG": "constants",
+    "SKETCH_MERGE_VALIDATION_MSG": "constants",
+    "SKETCH_PRECISION_VALIDATION_MSG": "constants",
+    "SNAPSHOT_FORMAT_VALIDATION_MSG": "constants",
+    "SNAPSHOT_VERSION_VALIDATION_MSG": "constants",
+    "TRANSPORTATION_REPORT_FORMAT": "constants",
+    "DATE_MAX_ORDINAL": "dates",
+    "DATE_MIN_ORDINAL": "dates",
+    "date_to_ordinal": "dates",
+    "dates_to_ordinals": "dates",
+    "ordinal_to_date": "dates",
+    "today_ordinal": "dates",
+    "date_format_validation": "validations",
+    "date_interval_range_validation": "validations",
+    "date_interval_validation": "validations",
+    "date_min_validation": "validations",
+    "date_range_validation": "validations",
+    "int_fee_validation": "validations",
+    "package_date_validation": "validations",
+    "package_days_validation": "validations",
+    "iter_json_records": "streaming",
+    "get_numpy": "optional",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """
+    The method to import the submodule defining an exported name the first time the name is accessed.
+
+    Parameters:
+        name (str): The name of the attribute.
+
+    Returns:
+        object: The exported constant or function, which is cached in the package globals.
+
+    Raises:
+        AttributeError: If the package doesn't export the name.
+    """
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -5,9 +5,22 @@ PACKAGE_ORIGIN_VALIDATION_MSG = "Package origin must be at least 3 characters lo
 PACKAGE_DESTINATION_VALIDATION_MSG = "Package destination must be at least 3 characters long"
 PACKAGE_ORIGIN_DESTINATION_SAME_VALIDATION_MSG = "Package origin and destination cannot be the same"
 PACKAGE_CLIENT_VALIDATION_MSG = "Package client must be an instance of Client class"
+PACKAGE_DATE_VALIDATION_MSG = "Package date must be between 01/01/1970 and 31/12/9999"
 DATE_FORMAT_VALIDATION_MSG = "Date must be in format DD/MM/YYYY"
 DATE_RANGE_VALIDATION_MSG = "Date must be between 01/01/1970 and today's date"
 DATE_MIN_VALIDATION_MSG = "Date must be at least 01/01/1970"
+DATE_INTERVAL_VALIDATION_MSG = "Start date cannot be later than end date"
 DATE_MIN = "01/01/1970"
+DATE_MAX = "31/12/9999"
 DATE_FORMAT = "%d/%m/%Y"
+DATE_CACHE_SIZE = 4096
+REPORT_CACHE_SIZE = 1024
 FEE_INT_VALIDATION_MSG = "Fee must be an integer"
+TRANSPORTATION_REPORT_FORMAT = "[DATE: {date} | FEE: {fee}]\nTotal packages transported: {total}\nTotal transportation fee charged: {charged}"
+JSON_RECORD_VALIDATION_MSG = "Record is not valid JSON"
+SNAPSHOT_FORMAT_VALIDATION_MSG = "File is not an airline snapshot"
+SNAPSHOT_VERSION_VALIDATION_MSG = "Snapshot version is not supported"
+SKETCHES_DISABLED_VALIDATION_MSG = "Sketches are not enabled for this airline"
+SKETCH_PRECISION_VALIDATION_MSG = "HyperLogLog precision must be between 4 and 16"
+SKETCH_MERGE_VALIDATION_MSG = "HyperLogLog sketches must have the same precision to be merged"
+SKETCH_CAPACITY_VALIDATION_MSG = "SpaceSaving capacity must be at least 1"
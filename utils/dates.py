@@ -0,0 +1,78 @@
+from array import array
+from datetime import datetime, date as date_cls
+from functools import lru_cache
+
+from utils import DATE_FORMAT, DATE_FORMAT_VALIDATION_MSG, DATE_MAX, DATE_MIN, DATE_CACHE_SIZE
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def date_to_ordinal(date):
+    """
+    Convert a DD/MM/YYYY date string into its proleptic Gregorian ordinal.
+
+    The few thousand distinct dates of a dataset are parsed with strptime once and then served from a bounded LRU
+    cache keyed by the date string.
+
+    Parameters:
+        date (str): The date to convert.
+
+    Returns:
+        int: The ordinal of the given date.
+
+    Raises:
+        ValueError: If the date is not in DD/MM/YYYY format.
+    """
+    try:
+        return datetime.strptime(date, DATE_FORMAT).toordinal()
+    except ValueError:
+        raise ValueError(DATE_FORMAT_VALIDATION_MSG)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def ordinal_to_date(ordinal):
+    """
+    Convert a proleptic Gregorian ordinal back into a DD/MM/YYYY date string.
+
+    Parameters:
+        ordinal (int): The ordinal to convert.
+
+    Returns:
+        str: The date for the given ordinal.
+    """
+    return date_cls.fromordinal(ordinal).strftime(DATE_FORMAT)
+
+
+def dates_to_ordinals(dates):
+    """
+    Convert many DD/MM/YYYY date strings into their proleptic Gregorian ordinals at once.
+
+    Each distinct date is parsed only once, however many distinct dates there are, so batches spanning more dates than
+    the date_to_ordinal cache holds don't parse every date again.
+
+    Parameters:
+        dates (iterable): The dates to convert.
+
+    Returns:
+        array: The ordinals of the given dates, in the same order, as an array of integers.
+
+    Raises:
+        ValueError: If a date is not in DD/MM/YYYY format.
+    """
+    dates = dates if isinstance(dates, (list, tuple)) else list(dates)
+    ordinals_by_date = {date: date_to_ordinal(date) for date in set(dates)}
+    return array("i", map(ordinals_by_date.__getitem__, dates))
+
+
+def today_ordinal():
+    """
+    Get the ordinal of today's date.
+
+    Returns:
+        int: The ordinal of today's date.
+    """
+    return date_cls.today().toordinal()
+
+
+# The bounds of every date, parsed once
+DATE_MIN_ORDINAL = date_to_ordinal(DATE_MIN)
+DATE_MAX_ORDINAL = date_to_ordinal(DATE_MAX)
@@ -0,0 +1,16 @@
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_numpy():
+    """
+    Import NumPy the first time it is needed, so that importing the package doesn't pay for it.
+
+    Returns:
+        module: The numpy module, or None if it is not installed.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
@@ -0,0 +1,153 @@
+# json is imported on first use, so that importing the utils doesn't import it
+_WHITESPACE = " \t\n\r"
+
+
+class _JSONStream:
+    """
+    A buffered reader decoding JSON values one at a time from a text file.
+    """
+
+    def __init__(self, file, chunk_size):
+        import json
+
+        self.decoder = json.JSONDecoder()
+        self.error = json.JSONDecodeError
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self, size):
+        # Read at least size more characters, dropping the consumed part of the buffer first
+        if self.position > self.chunk_size:
+            self.buffer = self.buffer[self.position:]
+            self.position = 0
+        chunk = self.file.read(max(size, self.chunk_size))
+        if chunk:
+            self.buffer += chunk
+        else:
+            self.eof = True
+
+    def peek(self):
+        # Return the next non-whitespace character without consuming it, or "" at the end of the file
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer) or self.eof:
+                return self.buffer[self.position:self.position + 1]
+            self.fill(self.chunk_size)
+
+    def expect(self, characters):
+        # Consume the next non-whitespace character, which must be one of the given ones
+        character = self.peek()
+        if not character or character not in characters:
+            raise self.error(f"Expecting one of {characters!r}", self.buffer, self.position)
+        self.position += 1
+        return character
+
+    def decode(self):
+        # Decode the next value, which must be followed by something unless the file is over
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.position)
+                if end < len(self.buffer) or self.eof:
+                    self.position = end
+                    return value
+            except self.error:
+                if self.eof:
+                    raise
+            # Grow the buffer geometrically so that large values are not decoded again for every chunk
+            self.fill(len(self.buffer) - self.position)
+
+    def iter_array(self, key):
+        # Yield the elements of the array starting at the current position
+        self.expect("[")
+        if self.peek() == "]":
+            self.position += 1
+            return
+        while True:
+            if key is not None and self.peek() == "{":
+                yield from self.iter_object(key)
+            else:
+                yield self.decode()
+            if self.expect(",]") == "]":
+                return
+
+    def iter_object(self, key):
+        # Yield the elements of the arrays under the key of the object starting at the current position, skipping
+        # the other members
+        self.expect("{")
+        if self.peek() == "}":
+            self.position += 1
+            return
+        while True:
+            name = self.decode()
+            self.expect(":")
+            if name == key and self.peek() == "[":
+                yield from self.iter_array(None)
+            else:
+                value = self.decode()
+                if name == key:
+                    yield value
+            if self.expect(",}") == "}":
+                return
+
+
+def iter_json_records(file, key=None, chunk_size=65536):
+    """
+    Iterate over the records of a JSON array or of a newline-delimited JSON file without loading it whole.
+
+    JSON arrays are decoded one element at a time from a buffer that is refilled in chunks, so memory use depends on
+    the size of a record and not on the size of the file. Anything that doesn't start with "[" is read as one JSON
+    record per line; a line that isn't valid JSON yields its json.JSONDecodeError in place of a record, so that one bad
+    line doesn't stop the iteration. A malformed JSON array still raises, as its next element can't be found.
+
+    Parameters:
+        file (file): The text file to read from.
+        key (str): An optional key; records that are objects yield the items of the list under this key instead, as
+            in the fixtures file, and nothing if they don't have it. Lists in JSON arrays are streamed too.
+        chunk_size (int): The number of characters to read at a time.
+
+    Returns:
+        iterator: An iterator over the records.
+    """
+    stream = _JSONStream(file, chunk_size)
+    first = stream.peek()
+    if not first:
+        return
+    if first == "[":
+        yield from stream.iter_array(key)
+        return
+    for record in _iter_json_lines(file, stream.buffer[stream.position:]):
+        if key is None or not isinstance(record, dict):
+            yield record
+        elif isinstance(record.get(key), list):
+            yield from record[key]
+        elif key in record:
+            yield record[key]
+
+
+def _iter_json_lines(file, head):
+    # The head holds what was read while looking for the first character, which may end mid-line
+    lines = iter(file)
+    first = head + next(lines, "") if not head.endswith("\n") else head
+    # Split on "\n" only, as iterating over the file does, since splitlines also splits on characters such as
+    # U+2028 that JSON strings may hold unescaped
+    for line in first.split("\n"):
+        if line.strip():
+            yield _decode_line(line)
+    for line in lines:
+        if line.strip():
+            yield _decode_line(line)
+
+
+def _decode_line(line):
+    # Decode a line, returning the error instead of raising it so that the following lines are still read
+    import json
+
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        return e
@@ -1,26 +1,64 @@
-from datetime import datetime
+from array import array
 
-from utils import DATE_FORMAT, DATE_FORMAT_VALIDATION_MSG, DATE_MIN, DATE_RANGE_VALIDATION_MSG, DATE_MIN_VALIDATION_MSG, \
-    FEE_INT_VALIDATION_MSG
+from utils import DATE_RANGE_VALIDATION_MSG, DATE_MIN_VALIDATION_MSG, FEE_INT_VALIDATION_MSG, \
+    DATE_INTERVAL_VALIDATION_MSG, PACKAGE_DATE_VALIDATION_MSG
+from utils.dates import date_to_ordinal, today_ordinal, DATE_MAX_ORDINAL, DATE_MIN_ORDINAL
 
 
 def date_format_validation(date):
-    try:
-        datetime.strptime(date, DATE_FORMAT)
-    except ValueError:
-        raise ValueError(DATE_FORMAT_VALIDATION_MSG)
+    return date_to_ordinal(date)
 
 
 def date_range_validation(date):
-    date_obj = datetime.strptime(date, DATE_FORMAT)
-    if date_obj < datetime.strptime(DATE_MIN, DATE_FORMAT) or date_obj > datetime.now():
+    ordinal = date_to_ordinal(date)
+    if ordinal < DATE_MIN_ORDINAL or ordinal > today_ordinal():
         raise ValueError(DATE_RANGE_VALIDATION_MSG)
+    return ordinal
 
 
 def date_min_validation(date):
-    date_obj = datetime.strptime(date, DATE_FORMAT)
-    if date_obj < datetime.strptime(DATE_MIN, DATE_FORMAT):
+    ordinal = date_to_ordinal(date)
+    if ordinal < DATE_MIN_ORDINAL:
         raise ValueError(DATE_MIN_VALIDATION_MSG)
+    return ordinal
+
+
+def date_interval_validation(start, end):
+    if date_to_ordinal(start) > date_to_ordinal(end):
+        raise ValueError(DATE_INTERVAL_VALIDATION_MSG)
+
+
+def date_interval_range_validation(start, end):
+    # Validate the format of both dates, then their range, then the interval, and return their ordinals
+    date_format_validation(start)
+    date_format_validation(end)
+    start_ordinal = date_range_validation(start)
+    end_ordinal = date_range_validation(end)
+    if start_ordinal > end_ordinal:
+        raise ValueError(DATE_INTERVAL_VALIDATION_MSG)
+    return start_ordinal, end_ordinal
+
+
+def package_date_validation(date):
+    # Return the ordinal of a package date, given as a DD/MM/YYYY string, an ordinal, or empty for today, which must
+    # be between DATE_MIN and DATE_MAX so that it can be formatted back and stored in the integer columns
+    if isinstance(date, bool):
+        raise ValueError(PACKAGE_DATE_VALIDATION_MSG)
+    ordinal = date if isinstance(date, int) else date_to_ordinal(date) if date else today_ordinal()
+    if not DATE_MIN_ORDINAL <= ordinal <= DATE_MAX_ORDINAL:
+        raise ValueError(PACKAGE_DATE_VALIDATION_MSG)
+    return ordinal
+
+
+def package_days_validation(days):
+    # Return a column of package date ordinals as an array, checking them all against DATE_MIN and DATE_MAX at once
+    try:
+        days = array("i", days)
+    except (OverflowError, TypeError):
+        raise ValueError(PACKAGE_DATE_VALIDATION_MSG)
+    if days and (min(days) < DATE_MIN_ORDINAL or max(days) > DATE_MAX_ORDINAL):
+        raise ValueError(PACKAGE_DATE_VALIDATION_MSG)
+    return days
 
 
 def int_fee_validation(fee):